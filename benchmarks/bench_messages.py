@@ -0,0 +1,157 @@
+"""Benchmark recording pylint messages and turning them into comments.
+
+Compares the per message dictionaries Reporter used to build (and the
+`isinstance` checks parse_comments needed to read them back) with
+LintMessage records. Reports time and peak memory allocated while
+recording messages, and time to build comments from them. Times are
+the best of a few runs.
+
+Run with `python benchmarks/bench_messages.py`.
+"""
+
+from __future__ import annotations
+
+import gc
+import os
+import time
+import tracemalloc
+from typing import TYPE_CHECKING, Any
+
+from pylint.interfaces import UNDEFINED
+from pylint.message import Message
+from pylint.typing import MessageLocationTuple
+
+from lintcheck import utils
+from lintcheck.extension import parse_comments
+from lintcheck.message import LintMessage
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+MESSAGES = 50_000
+# Times are the best of this many runs
+REPEAT = 5
+
+
+def make_pylint_messages() -> list[Message]:
+    """Return pylint message objects spread over a few files."""
+    return [
+        Message(
+            "W0612",
+            "unused-variable",
+            MessageLocationTuple(
+                f"/project/module{index % 50}.py",
+                f"module{index % 50}.py",
+                f"module{index % 50}",
+                "function",
+                index // 50 + 1,
+                4,
+                index // 50 + 1,
+                9,
+            ),
+            f"Unused variable 'value{index}'",
+            UNDEFINED,
+        )
+        for index in range(MESSAGES)
+    ]
+
+
+def record_dicts(messages: list[Message]) -> list[dict[str, str | int]]:
+    """Record messages the old way, one dictionary each."""
+    records = []
+    for msg in messages:
+        data: dict[str, str | int] = {}
+        for attr in ("abspath", "column", "line", "msg", "msg_id", "symbol"):
+            data[attr] = getattr(msg, attr)
+        records.append(data)
+    return records
+
+
+def record_tuples(messages: list[Message]) -> list[LintMessage]:
+    """Record messages as LintMessage records."""
+    return [LintMessage.from_pylint(msg) for msg in messages]
+
+
+def parse_dicts(
+    comments: list[dict[str, str | int]],
+) -> dict[str, list[utils.Comment]]:
+    """Old parse_comments, reading dictionaries back with checks."""
+    files: dict[str, list[utils.Comment]] = {}
+    for comment in comments:
+        path = comment["abspath"]
+        assert isinstance(path, str)
+        filename = os.path.abspath(path)
+        files.setdefault(filename, [])
+
+        head = f"{comment['symbol']} ({comment['msg_id']}): "
+        message_lines = comment["msg"]
+        assert isinstance(message_lines, str)
+        line = comment["line"]
+        assert isinstance(line, int)
+        column = comment["column"]
+        assert isinstance(column, int)
+        for idx, msg in enumerate(reversed(message_lines.splitlines())):
+            files[filename].append(
+                utils.Comment(
+                    file=filename,
+                    line=line,
+                    column=column,
+                    contents=msg if idx != 0 else f"{head}{msg}",
+                ),
+            )
+    return files
+
+
+def best_time(function: Callable[[], object]) -> float:
+    """Return fewest seconds function took over REPEAT runs."""
+    best = float("inf")
+    for _ in range(REPEAT):
+        gc.collect()
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def peak_memory(function: Callable[[], object]) -> int:
+    """Return peak bytes allocated while running function."""
+    gc.collect()
+    tracemalloc.start()
+    function()
+    _current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def run(
+    name: str,
+    messages: list[Message],
+    record: Callable[[list[Message]], list[Any]],
+    parse: Callable[[list[Any]], object],
+) -> None:
+    """Time and measure record and parse and print results."""
+    records = record(messages)
+    record_time = best_time(lambda: record(messages))
+    # Separate run, tracemalloc slows allocation down a lot
+    peak = peak_memory(lambda: record(messages))
+    parse_time = best_time(lambda: parse(records))
+    print(
+        f"{name:<12} record {record_time * 1000:>8.2f} ms "
+        f"{peak / 1024 / 1024:>7.2f} MiB   "
+        f"parse {parse_time * 1000:>8.2f} ms",
+    )
+
+
+def main() -> None:
+    """Run message benchmarks."""
+    messages = make_pylint_messages()
+    assert parse_dicts(record_dicts(messages)) == parse_comments(
+        record_tuples(messages),
+    )
+    print(f"Recording and parsing {MESSAGES} messages")
+    run("dict", messages, record_dicts, parse_dicts)
+    run("LintMessage", messages, record_tuples, parse_comments)
+
+
+if __name__ == "__main__":
+    main()
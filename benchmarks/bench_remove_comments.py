@@ -0,0 +1,104 @@
+"""Benchmark removing extension comments from large buffers.
+
+Compares deleting comment lines one at a time (how removal used to
+work) with removing runs of comment lines per call. Uses the fake text
+widget from the tests so it runs without a display. On a real Tk text
+widget every call also goes through IDLE's percolator, colorizer and
+undo delegator, so the edit call counts matter more than the times.
+
+Run with `python benchmarks/bench_remove_comments.py`.
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "tests"))
+
+from fakes import FakeEditorWindow
+
+from lintcheck import utils
+
+PREFIX = "# lintcheck: "
+COMMENTS = 10_000
+
+
+def make_interleaved() -> str:
+    """Return buffer with a comment above every code line."""
+    return "".join(
+        f"    {PREFIX}unused-variable\n    x{line} = {line}\n"
+        for line in range(COMMENTS)
+    )
+
+
+def make_clustered() -> str:
+    """Return buffer with blocks of five comments every ten code lines."""
+    chunks = []
+    for block in range(COMMENTS // 5):
+        chunks.extend(f"{PREFIX}message {index}\n" for index in range(5))
+        chunks.extend(f"x{block}_{index} = 1\n" for index in range(10))
+    return "".join(chunks)
+
+
+def make_sparse() -> str:
+    """Return buffer with a comment every fifty code lines."""
+    chunks = []
+    for block in range(COMMENTS):
+        chunks.append(f"{PREFIX}message\n")
+        chunks.extend(f"x{block}_{index} = 1\n" for index in range(50))
+    return "".join(chunks)
+
+
+def remove_one_at_a_time(extension: utils.BaseExtension) -> None:
+    """Remove comment lines with one delete call each, bottom up."""
+    lines = extension.text.get("1.0", "end-1c").split("\n")
+    with utils.undo_block(extension.undo):
+        for index, line_text in reversed(tuple(enumerate(lines))):
+            if line_text.lstrip().startswith(extension.comment_prefix):
+                extension.text.delete(*utils.get_line_selection(index + 1))
+
+
+def remove_runs(extension: utils.BaseExtension) -> None:
+    """Remove comment lines with remove_all_extension_comments."""
+    extension.remove_all_extension_comments()
+
+
+def run(name: str, chars: str) -> None:
+    """Time both removal methods on buffer and print results."""
+    expected: str | None = None
+    for method in (remove_one_at_a_time, remove_runs):
+        editwin = FakeEditorWindow("/bench.py", chars)
+        extension = utils.BaseExtension(
+            editwin,  # type: ignore[arg-type]
+            comment_prefix="lintcheck",
+        )
+        start = time.perf_counter()
+        method(extension)
+        elapsed = time.perf_counter() - start
+
+        result = editwin.text.get_chars()
+        assert PREFIX not in result
+        if expected is None:
+            expected = result
+        assert result == expected, "Methods removed different lines"
+
+        calls = editwin.text.calls
+        print(
+            f"{name:<12} {method.__name__:<22} "
+            f"{calls['delete'] + calls['insert']:>7} edits "
+            f"{elapsed * 1000:>10.2f} ms",
+        )
+
+
+def main() -> None:
+    """Run removal benchmarks."""
+    print(f"Removing {COMMENTS} comment lines")
+    run("interleaved", make_interleaved())
+    run("clustered", make_clustered())
+    run("sparse", make_sparse())
+
+
+if __name__ == "__main__":
+    main()
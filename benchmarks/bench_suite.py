@@ -0,0 +1,380 @@
+"""Benchmark suite covering startup and each phase of a lint check.
+
+Runs headless, using the fake text widget from the tests. Results are
+written as JSON and compared against a stored baseline, exiting with
+status 1 if any benchmark got slower than the tolerance allows.
+
+Run with `python benchmarks/bench_suite.py`. Useful options:
+
+    --quick            smaller inputs and fewer repeats
+    --only NAME        only run benchmarks whose name contains NAME
+    --output FILE      where to write results (default results.json)
+    --baseline FILE    baseline to compare with (default baseline.json)
+    --save-baseline    write results as the new baseline
+    --tolerance RATIO  allowed slowdown, 0.25 means 25% (default)
+
+Baselines are only comparable on the same machine, so none is
+committed. Save one with `--save-baseline` before making changes, then
+compare after.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, NamedTuple
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "tests"))
+
+from astroid import MANAGER
+from fakes import FakeEditorWindow
+
+from lintcheck import cache, utils
+from lintcheck.extension import parse_comments
+from lintcheck.message import LintMessage
+from lintcheck.runner import LintJob, Reporter
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+HERE = Path(__file__).parent
+PREFIX = "# lintcheck: "
+
+
+class Benchmark(NamedTuple):
+    """Benchmark function and how many times to run it."""
+
+    name: str
+    function: Callable[[bool], Callable[[], object]]
+    repeat: int
+
+
+BENCHMARKS: list[Benchmark] = []
+
+
+def benchmark(
+    name: str,
+    repeat: int = 5,
+) -> Callable[
+    [Callable[[bool], Callable[[], object]]],
+    Callable[[bool], Callable[[], object]],
+]:
+    """Register benchmark.
+
+    Decorated function is given if this is a quick run, does any
+    setup, and returns the function to time.
+    """
+
+    def register(
+        function: Callable[[bool], Callable[[], object]],
+    ) -> Callable[[bool], Callable[[], object]]:
+        BENCHMARKS.append(Benchmark(name, function, repeat))
+        return function
+
+    return register
+
+
+def make_module(lines: int) -> str:
+    """Return source of a module about lines long with some problems."""
+    chunks = ['"""Synthetic module."""\n\nimport os\n\n\n']
+    # Each function is eight lines
+    for index in range(lines // 8):
+        chunks.append(
+            f"def function_{index}(argument, unused):\n"
+            f'    """Function {index}."""\n'
+            f"    Value = argument * {index}\n"
+            "    if Value > 10:\n"
+            "        return Value\n"
+            "    return None\n\n\n",
+        )
+    return "".join(chunks)
+
+
+def make_messages(count: int) -> list[LintMessage]:
+    """Return count lint messages spread over a few files."""
+    return [
+        LintMessage(
+            f"/project/module{index % 20}.py",
+            index // 20 + 1,
+            4,
+            index // 20 + 1,
+            9,
+            "W0612",
+            "unused-variable",
+            f"Unused variable 'value{index}'",
+        )
+        for index in range(count)
+    ]
+
+
+def make_code(lines: int) -> str:
+    """Return buffer of indented code lines."""
+    return "".join(f"    value_{line} = {line}\n" for line in range(lines))
+
+
+def make_extension(chars: str) -> utils.BaseExtension:
+    """Return extension for a fake editor window containing chars."""
+    return utils.BaseExtension(
+        FakeEditorWindow("/bench.py", chars),  # type: ignore[arg-type]
+        comment_prefix="lintcheck",
+    )
+
+
+def measure_import() -> float:
+    """Return seconds `import lintcheck` takes in a new interpreter."""
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import lintcheck"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    for line in process.stderr.splitlines():
+        fields = line.split("|")
+        if len(fields) == 3 and fields[2].strip() == "lintcheck":
+            return int(fields[1]) / 1_000_000
+    raise RuntimeError("lintcheck missing from -X importtime output")
+
+
+@benchmark("import_lintcheck", repeat=5)
+def bench_import(_quick: bool) -> Callable[[], object]:
+    """Time cold import, see measure_import."""
+    return measure_import
+
+
+def lint_module(lines: int) -> Callable[[bool], Callable[[], object]]:
+    """Return benchmark setup running pylint on module of lines."""
+
+    def setup(quick: bool) -> Callable[[], object]:
+        directory = Path(tempfile.mkdtemp(prefix="lintcheck-bench-"))
+        module = directory / "synthetic.py"
+        module.write_text(
+            make_module(lines // 10 if quick else lines),
+            encoding="utf-8",
+        )
+
+        def run() -> None:
+            # Parse the module every time, like after an edit
+            MANAGER.astroid_cache.pop("synthetic", None)
+            job = LintJob([str(module), "--jobs=1"], Reporter())
+            job.run()
+            if job.exception is not None:
+                raise job.exception
+
+        # Untimed run to import pylint and infer builtins, those are
+        # what import_lintcheck and the first check of a session pay.
+        run()
+        return run
+
+    return setup
+
+
+benchmark("run_pylint_1k_lines", repeat=3)(lint_module(1_000))
+benchmark("run_pylint_10k_lines", repeat=1)(lint_module(10_000))
+
+
+def parse_messages(count: int) -> Callable[[bool], Callable[[], object]]:
+    """Return benchmark setup parsing count messages."""
+
+    def setup(quick: bool) -> Callable[[], object]:
+        messages = make_messages(count // 10 if quick else count)
+        return lambda: parse_comments(messages)
+
+    return setup
+
+
+benchmark("parse_comments_10k")(parse_messages(10_000))
+benchmark("parse_comments_100k")(parse_messages(100_000))
+
+
+@benchmark("add_comments_10k_lines")
+def bench_add_comments(quick: bool) -> Callable[[], object]:
+    """Time adding two comments per line to a large buffer."""
+    lines = 1_000 if quick else 10_000
+    chars = make_code(lines)
+    comments = [
+        utils.Comment("/bench.py", line, f"message {index}")
+        for line in range(1, lines + 1)
+        for index in range(2)
+    ]
+    # Fresh buffer each time, the second run would skip duplicates
+    return lambda: make_extension(chars).add_comments(comments)
+
+
+@benchmark("remove_all_comments_10k_lines")
+def bench_remove_all(quick: bool) -> Callable[[], object]:
+    """Time removing a comment from above every line of a large buffer."""
+    lines = 1_000 if quick else 10_000
+    chars = "".join(
+        f"    {PREFIX}message\n    value_{line} = {line}\n"
+        for line in range(lines)
+    )
+    return lambda: make_extension(chars).remove_all_extension_comments()
+
+
+@benchmark("get_pointers_10k_lines")
+def bench_get_pointers(quick: bool) -> Callable[[], object]:
+    """Time building pointers for every line of a large buffer."""
+    lines = 1_000 if quick else 10_000
+    extension = make_extension(make_code(lines))
+    line_comments = [
+        [
+            utils.Comment(
+                "/bench.py",
+                line,
+                "x",
+                column=column,
+                column_end=column + 8,
+            )
+            for column in (20, 24, 60)
+        ]
+        for line in range(1, lines)
+    ]
+    next_lines = [f"    value_{line} = {line}" for line in range(lines)]
+
+    def run() -> None:
+        for comments, next_line in zip(line_comments, next_lines):
+            extension.get_pointers(comments, next_line, ranges=True)
+
+    return run
+
+
+@benchmark("file_position_parse_100k")
+def bench_file_position_parse(quick: bool) -> Callable[[], object]:
+    """Time parsing file position strings."""
+    count = 10_000 if quick else 100_000
+    positions = [
+        f"/project/module.py:{index}:{index % 80}:{index + 2}:4"
+        if index % 2
+        else f"/project/module.py:{index}"
+        for index in range(count)
+    ]
+    parse = utils.FilePosition.parse
+
+    def run() -> None:
+        for position in positions:
+            parse(position)
+
+    return run
+
+
+def run_benchmark(item: Benchmark, quick: bool) -> dict[str, object]:
+    """Run benchmark and return its results."""
+    function = item.function(quick)
+    repeat = 1 if quick else item.repeat
+    times: list[float] = []
+    for _ in range(repeat):
+        gc.collect()
+        if item.name == "import_lintcheck":
+            # Measured inside the new interpreter
+            times.append(float(function()))  # type: ignore[arg-type]
+            continue
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return {
+        "best": min(times),
+        "median": statistics.median(times),
+        "repeat": repeat,
+    }
+
+
+def compare(
+    results: dict[str, dict[str, object]],
+    baseline: dict[str, dict[str, object]],
+    tolerance: float,
+) -> list[str]:
+    """Print comparison with baseline. Return names of regressions."""
+    regressions: list[str] = []
+    for name, result in results.items():
+        old = baseline.get(name)
+        if old is None:
+            print(f"{name:<32} {'new':>10}")
+            continue
+        best = result["best"]
+        old_best = old["best"]
+        assert isinstance(best, float)
+        assert isinstance(old_best, (int, float))
+        ratio = best / old_best if old_best else float("inf")
+        status = ""
+        if ratio > 1 + tolerance:
+            status = "  REGRESSION"
+            regressions.append(name)
+        print(f"{name:<32} {ratio:>9.2f}x{status}")
+    return regressions
+
+
+def get_environment() -> dict[str, str]:
+    """Return description of where benchmarks ran."""
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "pylint": cache.get_pylint_version(),
+        "cpus": str(os.cpu_count()),
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run benchmark suite. Return exit status."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--quick", action="store_true")
+    parser.add_argument("--only", default="")
+    parser.add_argument("--output", type=Path, default=Path("results.json"))
+    parser.add_argument(
+        "--baseline",
+        type=Path,
+        default=HERE / "baseline.json",
+    )
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    args = parser.parse_args(argv)
+
+    results: dict[str, dict[str, object]] = {}
+    for item in BENCHMARKS:
+        if args.only not in item.name:
+            continue
+        result = run_benchmark(item, args.quick)
+        results[item.name] = result
+        best = result["best"]
+        assert isinstance(best, float)
+        print(f"{item.name:<32} {best * 1000:>10.2f} ms")
+
+    data = {
+        "environment": get_environment(),
+        "quick": args.quick,
+        "results": results,
+    }
+    args.output.write_text(json.dumps(data, indent=2) + "\n", encoding="utf-8")
+    print(f"Results written to {args.output}")
+
+    if args.save_baseline:
+        args.baseline.write_text(
+            json.dumps(data, indent=2) + "\n",
+            encoding="utf-8",
+        )
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    if not args.baseline.exists():
+        print(f"No baseline at {args.baseline}, use --save-baseline")
+        return 0
+    baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+    if baseline.get("quick") != args.quick:
+        print("Baseline was made with a different --quick setting")
+        return 0
+    print(f"\nCompared to {args.baseline}")
+    regressions = compare(results, baseline["results"], args.tolerance)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
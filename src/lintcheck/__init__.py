@@ -34,9 +34,6 @@ def check_installed() -> bool:
     return utils.check_installed(__title__, __version__, lintcheck)
 
 
-lintcheck.reload()
-
-
 if __name__ == "__main__":
     print(f"{__title__} v{__version__}\nProgrammed by {__author__}.\n")
     check_installed()
@@ -0,0 +1,270 @@
+"""Lint Check Astroid Cache - Keep astroid's module cache bounded."""
+
+# Programmed by CoolCat467
+
+from __future__ import annotations
+
+# Lint Check Astroid Cache - Keep astroid's module cache bounded.
+# Copyright (C) 2025  CoolCat467
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+__title__ = "astroid-cache"
+__author__ = "CoolCat467"
+__license__ = "GNU General Public License Version 3"
+
+# Imports astroid, only import this module when about to run pylint.
+
+import gc
+import os
+import sys
+import sysconfig
+from typing import TYPE_CHECKING, Literal
+
+from astroid import MANAGER, nodes
+from astroid.context import InferenceContext
+from astroid.exceptions import TooManyLevelsError
+from astroid.inference_tip import clear_inference_tip_cache
+
+if TYPE_CHECKING:
+    from collections.abc import Collection
+
+    from typing_extensions import TypeAlias
+
+    ModuleKind: TypeAlias = Literal["stdlib", "third-party", "user"]
+
+STDLIB_PATHS = tuple(
+    {
+        os.path.normcase(os.path.realpath(sysconfig.get_path(name))) + os.sep
+        for name in ("stdlib", "platstdlib")
+    },
+)
+THIRD_PARTY_DIRECTORIES = frozenset({"site-packages", "dist-packages"})
+
+
+def clear_inference_caches() -> None:
+    """Clear astroid inference caches.
+
+    Needed after removing modules, or after a cancelled run, as the
+    caches can hold on to results from those modules. Parsed modules
+    are kept, see CachePolicy.abort_run for ones a run did not finish.
+    """
+    clear_inference_tip_cache()
+    # Every context shares the one inference cache
+    InferenceContext().inferred.clear()
+
+
+def get_mtime(path: str) -> float | None:
+    """Return modification time of path or None if it does not exist."""
+    try:
+        return os.stat(path).st_mtime
+    except OSError:
+        return None
+
+
+def get_module_kind(file: str | None) -> ModuleKind:
+    """Return if module file is standard library, installed, or user code.
+
+    Modules without a file (like builtins) count as standard library.
+    """
+    if not file:
+        return "stdlib"
+    path = os.path.normcase(os.path.realpath(file))
+    if THIRD_PARTY_DIRECTORIES.intersection(path.split(os.sep)):
+        return "third-party"
+    if path.startswith(STDLIB_PATHS):
+        return "stdlib"
+    return "user"
+
+
+def get_memory_usage() -> int | None:
+    """Return resident memory of this process in bytes.
+
+    Return None if it can not be found, only Linux is supported.
+    """
+    usage: int | None = None
+    if sys.platform != "win32":
+        try:
+            with open("/proc/self/statm", encoding="ascii") as fp:
+                pages = int(fp.read().split()[1])
+        except (OSError, ValueError, IndexError):
+            pages = None
+        if pages is not None:
+            usage = pages * os.sysconf("SC_PAGE_SIZE")
+    return usage
+
+
+def get_imported_names(module: nodes.Module) -> set[str]:
+    """Return names of modules module imports and of their packages.
+
+    Names from `from x import y` include `x.y`, y could be a module.
+    """
+    names: set[str] = set()
+    for node in module.nodes_of_class((nodes.Import, nodes.ImportFrom)):
+        if isinstance(node, nodes.Import):
+            imported = [name for name, _alias in node.names]
+        else:
+            try:
+                base = module.relative_to_absolute_name(
+                    node.modname,
+                    node.level,
+                )
+            except TooManyLevelsError:
+                continue
+            # Empty for `from . import x` in a top level module
+            prefix = f"{base}." if base else ""
+            imported = [base] if base else []
+            imported.extend(f"{prefix}{name}" for name, _alias in node.names)
+        for name in imported:
+            parts = name.split(".")
+            names.update(
+                ".".join(parts[:index]) for index in range(1, len(parts) + 1)
+            )
+    return names
+
+
+class CachePolicy:
+    """Decide which modules stay in astroid's cache between lint runs.
+
+    Modules whose files changed are removed before every run, so user
+    code is parsed again after an edit while everything else stays
+    parsed. User modules importing a changed module, directly or
+    through other user modules, go too, as pylint caches what their
+    nodes were inferred to be. If memory_limit (MiB, 0 for none) is
+    set and the process uses more after a run, user modules are
+    removed, then installed packages if that was not enough.
+    """
+
+    __slots__ = ("cached_before", "imports", "memory_limit", "mtimes")
+
+    def __init__(self, memory_limit: int = 0) -> None:
+        """Initialize policy."""
+        self.memory_limit = memory_limit
+        # Module name to file and modification time when first cached
+        self.mtimes: dict[str, tuple[str, float]] = {}
+        # User module name to names of modules it imports
+        self.imports: dict[str, set[str]] = {}
+        # Names of modules cached when the current run started
+        self.cached_before: set[str] = set()
+
+    def __repr__(self) -> str:
+        """Return representation of self."""
+        return f"{self.__class__.__name__}({self.memory_limit!r})"
+
+    def record(self) -> None:
+        """Record modification times of cached modules not yet seen."""
+        for modname, module in tuple(MANAGER.astroid_cache.items()):
+            if modname in self.mtimes or not module.file:
+                continue
+            mtime = get_mtime(module.file)
+            if mtime is None:
+                continue
+            self.mtimes[modname] = (module.file, mtime)
+            if get_module_kind(module.file) == "user":
+                self.imports[modname] = get_imported_names(module)
+
+    def remove(self, modnames: Collection[str]) -> None:
+        """Remove modules from cache and clear inference caches."""
+        if not modnames:
+            return
+        for modname in modnames:
+            MANAGER.astroid_cache.pop(modname, None)
+            self.mtimes.pop(modname, None)
+            self.imports.pop(modname, None)
+        clear_inference_caches()
+
+    def evict_changed(self) -> list[str]:
+        """Remove cached modules whose files changed and their importers.
+
+        Return removed names.
+        """
+        changed: list[str] = []
+        for modname, (file, mtime) in tuple(self.mtimes.items()):
+            if get_mtime(file) == mtime:
+                continue
+            del self.mtimes[modname]
+            module = MANAGER.astroid_cache.get(modname)
+            if module is not None and module.file == file:
+                changed.append(modname)
+        if not changed:
+            return []
+        evicted = set(changed)
+        pending = changed
+        while pending:
+            name = pending.pop()
+            for modname, imported in self.imports.items():
+                if modname not in evicted and name in imported:
+                    evicted.add(modname)
+                    pending.append(modname)
+        self.remove(evicted)
+        return sorted(evicted)
+
+    def evict_kind(self, kind: ModuleKind) -> list[str]:
+        """Remove cached modules of kind. Return their names."""
+        evicted = [
+            modname
+            for modname, module in MANAGER.astroid_cache.items()
+            if get_module_kind(module.file) == kind
+        ]
+        self.remove(evicted)
+        return evicted
+
+    def is_over_limit(self) -> bool:
+        """Return if process uses more memory than memory_limit."""
+        if self.memory_limit <= 0:
+            return False
+        usage = get_memory_usage()
+        return usage is not None and usage > self.memory_limit * 1024 * 1024
+
+    def enforce_memory_limit(self) -> list[str]:
+        """Remove modules until under memory_limit. Return removed names.
+
+        Standard library modules are never removed.
+        """
+        evicted: list[str] = []
+        kinds: tuple[ModuleKind, ...] = ("user", "third-party")
+        for kind in kinds:
+            if not self.is_over_limit():
+                break
+            evicted.extend(self.evict_kind(kind))
+            gc.collect()
+        return evicted
+
+    def before_run(self) -> list[str]:
+        """Prepare cache for a lint run. Return removed module names."""
+        evicted = self.evict_changed()
+        self.cached_before = set(MANAGER.astroid_cache)
+        return evicted
+
+    def after_run(self) -> list[str]:
+        """Record new modules and apply limit. Return removed module names."""
+        self.record()
+        return self.enforce_memory_limit()
+
+    def abort_run(self) -> list[str]:
+        """Forget a lint run that did not finish. Return removed names.
+
+        Call instead of after_run. Astroid caches a module before it is
+        done building it, so modules the run added may be incomplete
+        and are removed. Inference caches are cleared either way.
+        """
+        added = [
+            modname
+            for modname in MANAGER.astroid_cache
+            if modname not in self.cached_before
+        ]
+        self.remove(added)
+        if not added:
+            clear_inference_caches()
+        return added
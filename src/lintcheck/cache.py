@@ -0,0 +1,321 @@
+"""Lint Check Cache - Remember lint results for unchanged files."""
+
+# Programmed by CoolCat467
+
+from __future__ import annotations
+
+# Lint Check Cache - Remember lint results for unchanged files.
+# Copyright (C) 2025  CoolCat467
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+__title__ = "cache"
+__author__ = "CoolCat467"
+__license__ = "GNU General Public License Version 3"
+
+import hashlib
+import json
+import sqlite3
+import sys
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING
+
+from lintcheck.message import messages_from_json
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from pathlib import Path
+
+    from lintcheck.message import LintMessage
+
+    Messages = list[LintMessage]
+
+# Default limits for ResultCache
+MAX_ENTRIES = 64
+MAX_SIZE = 8 * 1024 * 1024
+
+# Default size limit for DiskCache
+DISK_MAX_SIZE = 64 * 1024 * 1024
+# Bump when format of stored messages changes
+DISK_SCHEMA_VERSION = 2
+
+
+def get_pylint_version() -> str:
+    """Return installed pylint version without importing pylint."""
+    # pylint: disable=import-outside-toplevel
+    import importlib.metadata
+
+    try:
+        return importlib.metadata.version("pylint")
+    except importlib.metadata.PackageNotFoundError:
+        return "unknown"
+
+
+def get_rcfile_contents() -> bytes:
+    """Return path and contents of the configuration file pylint would use.
+
+    Empty if pylint would not find one.
+    """
+    # pylint: disable=import-outside-toplevel
+    from pylint.config.find_default_config_files import (
+        find_default_config_files,
+    )
+
+    rcfile = next(find_default_config_files(), None)
+    if rcfile is None:
+        return b""
+    try:
+        return str(rcfile).encode("utf-8") + b"\0" + rcfile.read_bytes()
+    except OSError:
+        return b""
+
+
+def hash_parts(*parts: bytes) -> str:
+    """Return SHA-256 hex digest of length prefixed parts."""
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(len(part).to_bytes(8, "little"))
+        digest.update(part)
+    return digest.hexdigest()
+
+
+def get_cache_key(file: str, args: Iterable[str]) -> str | None:
+    """Return cache key for linting file with args.
+
+    Key is `{content_hash}:{config_hash}`, where content hash covers
+    file path and contents and config hash covers pylint arguments,
+    pylint version, and resolved rcfile contents.
+    Return None if file cannot be read.
+    """
+    try:
+        with open(file, "rb") as fp:
+            contents = fp.read()
+    except OSError:
+        return None
+    content_hash = hash_parts(file.encode("utf-8"), contents)
+    config_hash = hash_parts(
+        "\0".join(args).encode("utf-8"),
+        get_pylint_version().encode("utf-8"),
+        get_rcfile_contents(),
+    )
+    return f"{content_hash}:{config_hash}"
+
+
+def get_messages_size(messages: Messages) -> int:
+    """Return approximate memory used by messages in bytes."""
+    size = sys.getsizeof(messages)
+    for message in messages:
+        size += sys.getsizeof(message)
+        size += sum(map(sys.getsizeof, message))
+    return size
+
+
+class ResultCache:
+    """Least recently used cache of lint messages.
+
+    Bounded by both number of entries and approximate size in bytes.
+    Cached message lists are shared, do not modify them.
+    """
+
+    __slots__ = ("entries", "max_entries", "max_size", "size")
+
+    def __init__(
+        self,
+        max_entries: int = MAX_ENTRIES,
+        max_size: int = MAX_SIZE,
+    ) -> None:
+        """Initialize empty cache."""
+        self.max_entries = max_entries
+        self.max_size = max_size
+        self.entries: OrderedDict[str, tuple[Messages, int]] = OrderedDict()
+        self.size = 0
+
+    def __repr__(self) -> str:
+        """Return representation of self."""
+        return f"{self.__class__.__name__}({self.max_entries!r}, {self.max_size!r})"
+
+    def __len__(self) -> int:
+        """Return number of cached entries."""
+        return len(self.entries)
+
+    def __contains__(self, key: str) -> bool:
+        """Return if key is cached."""
+        return key in self.entries
+
+    def get(self, key: str) -> Messages | None:
+        """Return cached messages for key or None if not cached."""
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        self.entries.move_to_end(key)
+        return entry[0]
+
+    def put(self, key: str, messages: Messages) -> None:
+        """Cache messages for key, evicting old entries if needed."""
+        self.pop(key)
+        size = get_messages_size(messages)
+        if size > self.max_size or self.max_entries < 1:
+            return
+        self.entries[key] = (messages, size)
+        self.size += size
+        while (
+            len(self.entries) > self.max_entries or self.size > self.max_size
+        ):
+            _key, (_messages, old_size) = self.entries.popitem(last=False)
+            self.size -= old_size
+
+    def pop(self, key: str) -> Messages | None:
+        """Remove and return cached messages for key if cached."""
+        entry = self.entries.pop(key, None)
+        if entry is None:
+            return None
+        self.size -= entry[1]
+        return entry[0]
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        self.entries.clear()
+        self.size = 0
+
+
+class DiskCache:
+    """Lint messages stored in a SQLite database so they outlive IDLE.
+
+    Safe to share between several IDLE processes, SQLite handles the
+    locking. When the stored messages grow larger than max_size, least
+    recently used entries are removed.
+    """
+
+    __slots__ = ("connection", "max_size", "path")
+
+    def __init__(self, path: Path, max_size: int = DISK_MAX_SIZE) -> None:
+        """Initialize cache stored at path. Opened on first use."""
+        self.path = path
+        self.max_size = max_size
+        self.connection: sqlite3.Connection | None = None
+
+    def __repr__(self) -> str:
+        """Return representation of self."""
+        return f"{self.__class__.__name__}({self.path!r}, {self.max_size!r})"
+
+    def connect(self) -> sqlite3.Connection:
+        """Return database connection, creating database if needed."""
+        if self.connection is not None:
+            return self.connection
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(self.path, timeout=10)
+        # Write ahead log lets readers and a writer work at the same time
+        connection.execute("PRAGMA journal_mode=WAL")
+        with connection:
+            (version,) = connection.execute("PRAGMA user_version").fetchone()
+            if version != DISK_SCHEMA_VERSION:
+                connection.execute("DROP TABLE IF EXISTS results")
+                connection.execute(
+                    f"PRAGMA user_version = {DISK_SCHEMA_VERSION:d}",
+                )
+            connection.execute(
+                """CREATE TABLE IF NOT EXISTS results (
+                    content_hash TEXT NOT NULL,
+                    config_hash TEXT NOT NULL,
+                    messages TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    accessed REAL NOT NULL,
+                    PRIMARY KEY (content_hash, config_hash)
+                )""",
+            )
+            connection.execute(
+                "CREATE INDEX IF NOT EXISTS results_accessed "
+                "ON results (accessed)",
+            )
+        self.connection = connection
+        return connection
+
+    def close(self) -> None:
+        """Close database connection."""
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+
+    def get(self, key: str) -> Messages | None:
+        """Return stored messages for key or None if not stored."""
+        content_hash, config_hash = key.split(":", 1)
+        connection = self.connect()
+        with connection:
+            row = connection.execute(
+                "SELECT messages FROM results "
+                "WHERE content_hash = ? AND config_hash = ?",
+                (content_hash, config_hash),
+            ).fetchone()
+            if row is None:
+                return None
+            connection.execute(
+                "UPDATE results SET accessed = ? "
+                "WHERE content_hash = ? AND config_hash = ?",
+                (time.time(), content_hash, config_hash),
+            )
+        return messages_from_json(json.loads(row[0]))
+
+    def put(self, key: str, messages: Messages) -> None:
+        """Store messages for key, removing old entries if needed."""
+        content_hash, config_hash = key.split(":", 1)
+        data = json.dumps(messages, separators=(",", ":"))
+        if len(data) > self.max_size:
+            return
+        connection = self.connect()
+        with connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?)",
+                (content_hash, config_hash, data, len(data), time.time()),
+            )
+        self.collect_garbage()
+
+    def get_size(self) -> int:
+        """Return total size of stored messages in bytes."""
+        (size,) = (
+            self.connect()
+            .execute("SELECT COALESCE(SUM(size), 0) FROM results")
+            .fetchone()
+        )
+        assert isinstance(size, int)
+        return size
+
+    def collect_garbage(self) -> int:
+        """Remove least recently used entries over size limit.
+
+        Return number of entries removed.
+        """
+        connection = self.connect()
+        with connection:
+            if self.get_size() <= self.max_size:
+                return 0
+            total = 0
+            remove: list[tuple[int]] = []
+            for rowid, size in connection.execute(
+                "SELECT rowid, size FROM results ORDER BY accessed DESC",
+            ):
+                total += size
+                if total > self.max_size:
+                    remove.append((rowid,))
+            connection.executemany(
+                "DELETE FROM results WHERE rowid = ?",
+                remove,
+            )
+        return len(remove)
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        connection = self.connect()
+        with connection:
+            connection.execute("DELETE FROM results")
@@ -0,0 +1,318 @@
+"""Lint Check Checker Costs - Time spent in each pylint checker."""
+
+# Programmed by CoolCat467
+
+from __future__ import annotations
+
+# Lint Check Checker Costs - Time spent in each pylint checker.
+# Copyright (C) 2025  CoolCat467
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+__title__ = "checker-costs"
+__author__ = "CoolCat467"
+__license__ = "GNU General Public License Version 3"
+
+# Measuring needs pylint, see instrument. This module does not import
+# it, so reports can be made without loading pylint.
+
+import io
+import sqlite3
+from collections import Counter
+from typing import TYPE_CHECKING, NamedTuple
+
+if TYPE_CHECKING:
+    from collections.abc import Collection, Iterable
+    from pathlib import Path
+
+    from lintcheck.message import LintMessage
+
+# Suggestions must save at least this share of an average run
+SUGGEST_MIN_SHARE = 0.02
+# Most suggestions of each kind listed in a report
+SUGGEST_COUNT = 5
+# Most checker methods needed for some messages listed in a report
+REPORT_METHOD_COUNT = 20
+
+
+class RunCosts:
+    """Seconds spent in pylint checkers during one run.
+
+    Time is keyed by checker name and the message symbols (sorted,
+    separated by commas) the checker method that took it is only
+    needed for. Symbols are empty for methods that run whenever the
+    checker is enabled. total is the whole run, including parsing.
+    """
+
+    __slots__ = ("seconds", "total")
+
+    def __init__(self) -> None:
+        """Initialize costs."""
+        self.seconds: dict[tuple[str, str], float] = {}
+        self.total = 0.0
+
+    def __repr__(self) -> str:
+        """Return representation of self."""
+        return f"{self.__class__.__name__}({self.seconds!r})"
+
+    def add(self, checker: str, symbols: str, seconds: float) -> None:
+        """Add seconds to checker method needed for symbols."""
+        key = (checker, symbols)
+        self.seconds[key] = self.seconds.get(key, 0.0) + seconds
+
+    def to_json(self) -> dict[str, object]:
+        """Return costs as JSON compatible object."""
+        return {
+            "total": self.total,
+            "seconds": [
+                [checker, symbols, seconds]
+                for (checker, symbols), seconds in self.seconds.items()
+            ],
+        }
+
+    def update_from_json(self, data: object) -> None:
+        """Add costs from object made by to_json. Does nothing for None."""
+        if not isinstance(data, dict):
+            return
+        total = data.get("total")
+        if isinstance(total, (int, float)):
+            self.total += total
+        rows = data.get("seconds")
+        if not isinstance(rows, list):
+            return
+        for row in rows:
+            checker, symbols, seconds = row
+            self.add(checker, symbols, seconds)
+
+
+class CostTotals(NamedTuple):
+    """Costs of every measured run added up."""
+
+    runs: int
+    seconds: float
+    # Checker and symbols to seconds, see RunCosts
+    checkers: dict[tuple[str, str], float]
+    # Symbol to number of messages found
+    messages: dict[str, int]
+
+
+class CostTable:
+    """Checker costs of every measured run, stored in a SQLite database.
+
+    Safe to share between several IDLE processes, SQLite handles the
+    locking. Delete the database to start over.
+    """
+
+    __slots__ = ("connection", "path")
+
+    def __init__(self, path: Path) -> None:
+        """Initialize table stored at path. Opened on first use."""
+        self.path = path
+        self.connection: sqlite3.Connection | None = None
+
+    def __repr__(self) -> str:
+        """Return representation of self."""
+        return f"{self.__class__.__name__}({self.path!r})"
+
+    def connect(self) -> sqlite3.Connection:
+        """Return database connection, creating database if needed."""
+        if self.connection is not None:
+            return self.connection
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(self.path, timeout=10)
+        connection.execute("PRAGMA journal_mode=WAL")
+        with connection:
+            connection.execute(
+                """CREATE TABLE IF NOT EXISTS runs (
+                    id INTEGER PRIMARY KEY CHECK (id = 0),
+                    runs INTEGER NOT NULL,
+                    seconds REAL NOT NULL
+                )""",
+            )
+            connection.execute(
+                """CREATE TABLE IF NOT EXISTS checkers (
+                    checker TEXT NOT NULL,
+                    symbols TEXT NOT NULL,
+                    seconds REAL NOT NULL,
+                    PRIMARY KEY (checker, symbols)
+                )""",
+            )
+            connection.execute(
+                """CREATE TABLE IF NOT EXISTS messages (
+                    symbol TEXT PRIMARY KEY,
+                    count INTEGER NOT NULL
+                )""",
+            )
+        self.connection = connection
+        return connection
+
+    def close(self) -> None:
+        """Close database connection."""
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+
+    def record(
+        self,
+        costs: RunCosts,
+        messages: Iterable[LintMessage],
+    ) -> None:
+        """Add costs of a run and the messages it found."""
+        counts = Counter(message.symbol for message in messages)
+        connection = self.connect()
+        with connection:
+            connection.execute(
+                "INSERT INTO runs VALUES (0, 1, ?) "
+                "ON CONFLICT (id) DO UPDATE SET "
+                "runs = runs + 1, seconds = seconds + excluded.seconds",
+                (costs.total,),
+            )
+            connection.executemany(
+                "INSERT INTO checkers VALUES (?, ?, ?) "
+                "ON CONFLICT (checker, symbols) DO UPDATE SET "
+                "seconds = seconds + excluded.seconds",
+                [
+                    (checker, symbols, seconds)
+                    for (checker, symbols), seconds in costs.seconds.items()
+                ],
+            )
+            connection.executemany(
+                "INSERT INTO messages VALUES (?, ?) "
+                "ON CONFLICT (symbol) DO UPDATE SET "
+                "count = count + excluded.count",
+                counts.items(),
+            )
+
+    def get_totals(self) -> CostTotals:
+        """Return costs of every recorded run added up."""
+        connection = self.connect()
+        row = connection.execute(
+            "SELECT runs, seconds FROM runs WHERE id = 0",
+        ).fetchone()
+        runs, seconds = (0, 0.0) if row is None else row
+        checkers = {
+            (checker, symbols): checker_seconds
+            for checker, symbols, checker_seconds in connection.execute(
+                "SELECT checker, symbols, seconds FROM checkers",
+            )
+        }
+        messages = dict(
+            connection.execute("SELECT symbol, count FROM messages"),
+        )
+        return CostTotals(runs, seconds, checkers, messages)
+
+    def clear(self) -> None:
+        """Remove all recorded costs."""
+        connection = self.connect()
+        with connection:
+            connection.execute("DELETE FROM runs")
+            connection.execute("DELETE FROM checkers")
+            connection.execute("DELETE FROM messages")
+
+
+def format_report(totals: CostTotals, ignore: Collection[str] = ()) -> str:
+    """Return report of where pylint spends time and what to ignore.
+
+    ignore is what the ignore option already disables, those messages
+    and checkers are not suggested again.
+    """
+    if not totals.runs:
+        return (
+            "No checker costs recorded yet. Turn on the checker_costs "
+            "option and check some files.\n"
+        )
+    ignored = {name.lower() for name in ignore}
+    runs = totals.runs
+    average = totals.seconds / runs
+    # Checker name to seconds of all its methods
+    checker_seconds: dict[str, float] = {}
+    for (checker, _symbols), seconds in totals.checkers.items():
+        checker_seconds[checker] = checker_seconds.get(checker, 0.0) + seconds
+    checkers = sorted(
+        checker_seconds.items(),
+        key=lambda item: item[1],
+        reverse=True,
+    )
+    measured = sum(checker_seconds.values()) / runs
+
+    out = io.StringIO()
+    out.write(
+        f"Checker costs over {runs} pylint runs, "
+        f"{average:.3f}s per run on average.\n"
+        f"Checkers took {measured:.3f}s of that, the rest is parsing "
+        "files and pylint itself.\n"
+        "Inference results are shared, so the first checker to infer "
+        "something pays for it,\nand ignoring that checker can move "
+        "some of its time to another one.\n",
+    )
+
+    out.write("\nSeconds per run by checker\n")
+    for checker, seconds in checkers:
+        share = seconds / totals.seconds if totals.seconds else 0.0
+        out.write(f"  {checker:<30} {seconds / runs:8.3f} {share:7.1%}\n")
+
+    groups = sorted(
+        (
+            (seconds, checker, symbols)
+            for (checker, symbols), seconds in totals.checkers.items()
+            if symbols
+        ),
+        reverse=True,
+    )
+    out.write(
+        f"\nSeconds per run of the {REPORT_METHOD_COUNT} slowest checker "
+        "methods only needed for some messages\n",
+    )
+    for seconds, checker, symbols in groups[:REPORT_METHOD_COUNT]:
+        found = sum(
+            totals.messages.get(name, 0) for name in symbols.split(",")
+        )
+        out.write(
+            f"  {seconds / runs:8.3f}  {checker}: {symbols} "
+            f"(found {found} times)\n",
+        )
+
+    minimum = average * SUGGEST_MIN_SHARE
+    out.write("\nBiggest savings from adding messages to ignore\n")
+    suggested = 0
+    for seconds, checker, symbols in groups:
+        names = symbols.split(",")
+        if seconds / runs < minimum or suggested >= SUGGEST_COUNT:
+            break
+        if ignored.issuperset(names) or checker in ignored:
+            continue
+        found = sum(totals.messages.get(name, 0) for name in names)
+        out.write(
+            f"  {';'.join(names):<40} {seconds / runs:8.3f}s  "
+            f"found {found} times\n",
+        )
+        suggested += 1
+    if not suggested:
+        out.write("  None would save much\n")
+
+    out.write(
+        "\nBiggest savings from adding a checker name to ignore, "
+        "disabling all its messages\n",
+    )
+    suggested = 0
+    for checker, seconds in checkers:
+        if seconds / runs < minimum or suggested >= SUGGEST_COUNT:
+            break
+        if checker in ignored:
+            continue
+        out.write(f"  {checker:<40} {seconds / runs:8.3f}s\n")
+        suggested += 1
+    if not suggested:
+        out.write("  None would save much\n")
+    return out.getvalue()
@@ -25,95 +25,101 @@ __author__ = "CoolCat467"
 __license__ = "GNU General Public License Version 3"
 
 import os
+import sqlite3
+import time
 import traceback
+from bisect import bisect_right, insort
+from contextlib import nullcontext
 from typing import TYPE_CHECKING, Any, ClassVar
 
-from pylint.lint import Run as run_pylint  # noqa: N813
-
-from lintcheck import utils
+from lintcheck import cache, utils
+from lintcheck.checker_costs import CostTable, RunCosts, format_report
+from lintcheck.runner import (
+    LintCancelled,
+    LintJob,
+    Reporter,
+    SubprocessLintJob,
+    WorkerLintJob,
+    choose_jobs,
+    get_available_cpus,
+    get_total_size,
+    get_worker,
+    start_preload,
+)
+from lintcheck.timing import PhaseTimer
 
 if TYPE_CHECKING:
     from collections.abc import Sequence
+    from contextlib import AbstractContextManager
+    from idlelib.editor import EditorWindow
     from idlelib.pyshell import PyShellEditorWindow
     from tkinter import Event
 
-    import pylint
-
-
-class Reporter:
-    """Reporter class."""
-
-    __slots__ = ("linter", "messages")
-
-    def __init__(self) -> None:
-        """Initialize reporter."""
-        self.linter: pylint.lint.pylinter.PyLinter | None = None
-        self.messages: list[dict[str, str | int]] = []
-
-    def handle_message(self, msg: pylint.message.message.Message) -> None:
-        """Record message."""
-        # Convert message object into dictionary
-        data: dict[str, str | int] = {}
-        for attr in ("abspath", "column", "line", "msg", "msg_id", "symbol"):
-            data[attr] = getattr(msg, attr)
-        # Save message
-        self.messages.append(data)
-
-    def on_set_current_module(self, modname: str, filepath: str) -> None:
-        """Handle module starts to be analysed."""
+    from lintcheck.message import LintMessage
+    from lintcheck.profiling import ProfileSession
 
-    def display_messages(
-        self,
-        section: pylint.reporters.ureports.nodes.Section,
-    ) -> None:
-        """Handle displaying the messages of the reporter."""
-
-    def on_close(
-        self,
-        stats: pylint.utils.linterstats.LinterStats,
-        previous_stats: pylint.utils.linterstats.LinterStats,
-    ) -> None:
-        """Handle when a module finished analyzing."""
-
-    def display_reports(
-        self,
-        section: pylint.reporters.ureports.nodes.Section,
-    ) -> None:
-        """Display results encapsulated in the layout tree."""
+# Milliseconds between checks on a background lint job
+POLL_INTERVAL = 100
+# Milliseconds lint timings and other notes stay in the status bar
+STATUS_TIME = 5000
 
-    def get_messages(self) -> list[dict[str, str | int]]:
-        """Return Messages."""
-        return self.messages
+# Lint results for unchanged files, shared by all windows
+RESULT_CACHE = cache.ResultCache()
+# Lint results kept between IDLE sessions
+DISK_CACHE = cache.DiskCache(utils.CACHE_PATH / "lintcheck.sqlite3")
+# Time spent in each pylint checker, added up over every measured check
+COST_TABLE = CostTable(utils.CACHE_PATH / "lintcheck-costs.sqlite3")
 
 
 def parse_comments(
-    comments: list[dict[str, str | int]],
+    comments: list[LintMessage],
+    spans: bool = False,
 ) -> dict[str, list[utils.Comment]]:
-    """Get list of message dictionaries from pylint output."""
+    """Return comments for each file from pylint messages.
+
+    If spans is True, comments for messages ending on the line they
+    start on get column_end set to their last column.
+    """
     files: dict[str, list[utils.Comment]] = {}
+    # Messages mostly share a few paths, only resolve each once
+    filenames: dict[str, str] = {}
+    new_comment = utils.Comment
 
     for comment in comments:
-        path = comment["abspath"]
-        assert isinstance(path, str)
-        filename = os.path.abspath(path)
-        files.setdefault(filename, [])
-
-        head = f"{comment['symbol']} ({comment['msg_id']}): "
-        message_lines = comment["msg"]
-        assert isinstance(message_lines, str)
-        line = comment["line"]
-        assert isinstance(line, int)
-        column = comment["column"]
-        assert isinstance(column, int)
-        for idx, msg in enumerate(reversed(message_lines.splitlines())):
-            message = utils.Comment(
-                file=filename,
-                line=line,
-                column=column,
-                contents=msg if idx != 0 else f"{head}{msg}",
+        filename = filenames.get(comment.abspath)
+        if filename is None:
+            filename = os.path.abspath(comment.abspath)
+            filenames[comment.abspath] = filename
+        file_comments = files.setdefault(filename, [])
+
+        line = comment.line
+        column = comment.column
+        column_end = None
+        if (
+            spans
+            and comment.end_line == line
+            and comment.end_column is not None
+        ):
+            # Pylint's end column is exclusive
+            column_end = comment.end_column - 1
+        message_lines = comment.msg.splitlines()
+        if not message_lines:
+            continue
+        file_comments.append(
+            new_comment(
+                filename,
+                line,
+                f"{comment.symbol} ({comment.msg_id}): {message_lines[-1]}",
+                None,
+                column,
+                column_end,
+            ),
+        )
+        if len(message_lines) > 1:
+            file_comments.extend(
+                new_comment(filename, line, msg, None, column, column_end)
+                for msg in reversed(message_lines[:-1])
             )
-
-            files[filename].append(message)
     return files
 
 
@@ -125,7 +131,16 @@ def parse_comments(
 class lintcheck(utils.BaseExtension):  # noqa: N801
     """Add comments from pylint to an open program."""
 
-    __slots__ = ()
+    __slots__ = (
+        "idle_after_id",
+        "lint_deadline",
+        "lint_job",
+        "lint_profile",
+        "lint_timer",
+        "poll_after_id",
+        "status_after_id",
+        "streamed_lines",
+    )
     # Extend the file and format menus.
     menudefs: ClassVar[
         Sequence[tuple[str, Sequence[tuple[str, str] | None]]]
@@ -135,7 +150,15 @@ class lintcheck(utils.BaseExtension):  # noqa: N801
             (
                 None,
                 ("_Lint Check File", "<<lint-check>>"),
+                ("Lint All Open Files", "<<lint-all-open-files>>"),
+                ("Cancel Lint", "<<cancel-lint>>"),
+                ("Show Lint Profile", "<<show-lint-profile>>"),
+                ("Show Checker Costs", "<<show-checker-costs>>"),
                 ("Find Next Lint Comment", "<<find-next-lint-comment>>"),
+                (
+                    "Find Previous Lint Comment",
+                    "<<find-previous-lint-comment>>",
+                ),
             ),
         ),
         (
@@ -148,27 +171,99 @@ class lintcheck(utils.BaseExtension):  # noqa: N801
         "enable": "True",
         "enable_editor": "True",
         "enable_shell": "False",
+        "backend": "thread",
+        "cache": "True",
+        "cache_memory_limit": "0",
+        "checker_costs": "False",
+        "config_version": "1",
+        "cpu_limit": "0",
         "ignore": "None",
-        "jobs": "0",
+        "jobs": "auto",
+        "memory_limit": "0",
+        "partial_results": "True",
+        "persistent_cache": "True",
+        "pointer_ranges": "False",
+        "preload": "False",
+        "profile": "off",
         "search_wrap": "False",
+        "stream": "True",
+        "timeout": "0",
+        "timing": "False",
+    }
+    # Defaults changed since older configuration, see migrate_config
+    config_migrations: ClassVar = {
+        1: {"jobs": ("0", "auto")},
     }
     # Default key-binds for configuration file
     bind_defaults: ClassVar = {
         "lint-check": "<Control-Shift-Key-C>",
+        "lint-all-open-files": None,
+        "cancel-lint": None,
+        "show-lint-profile": None,
+        "show-checker-costs": None,
         "remove-lint-comments": "<Control-Alt-Key-c>",
         "find-next-lint-comment": "<Alt-Key-c>",
+        "find-previous-lint-comment": "<Alt-Shift-Key-C>",
     }
 
     # Overwritten in reload
+    backend = "thread"
+    cache = "True"
+    cache_memory_limit = "0"
+    checker_costs = "False"
+    config_version = "1"
+    cpu_limit = "0"
     ignore = ""
-    jobs = "0"
+    jobs = "auto"
+    memory_limit = "0"
+    partial_results = "True"
+    persistent_cache = "True"
+    pointer_ranges = "False"
+    preload = "False"
+    profile = "off"
     search_wrap = "False"
+    stream = "True"
+    timeout = "0"
+    timing = "False"
 
     def __init__(self, editwin: PyShellEditorWindow) -> None:
         """Initialize the settings for this extension."""
         super().__init__(editwin, comment_prefix="lintcheck")
         # pylint: disable=C0401
 
+        self.lint_job: LintJob | SubprocessLintJob | WorkerLintJob | None = (
+            None
+        )
+        self.poll_after_id: str | None = None
+        # time.monotonic() the running job times out at
+        self.lint_deadline: float | None = None
+        # While streaming, sorted pylint line numbers of comment lines
+        # added so far, to map pylint's lines to lines in the editor.
+        self.streamed_lines: list[int] | None = None
+        # Phase timings of the current check, see report_timing
+        self.lint_timer = PhaseTimer(enabled=False)
+        self.status_after_id: str | None = None
+        # Profile of the current check if profile option is on
+        self.lint_profile: ProfileSession | None = None
+
+        # Configuration and pylint are loaded once the window is up
+        # instead of when IDLE imports this extension.
+        self.idle_after_id: str | None = self.text.after_idle(
+            self.window_ready,
+        )
+
+    @utils.log_exceptions
+    def window_ready(self) -> None:
+        """Load configuration and start preloading pylint if enabled."""
+        self.idle_after_id = None
+        self.reload()
+        if self.preload != "True":
+            return
+        if self.backend == "worker":
+            get_worker().start()
+        else:
+            start_preload()
+
     @property
     def lintcomment_only_current_file(self) -> bool:
         """Should only add lint comments for currently open file?."""
@@ -177,53 +272,78 @@ class lintcheck(utils.BaseExtension):  # noqa: N801
     def add_lint_comments_for_file(
         self,
         comments: list[utils.Comment],
+        pointers: bool = True,
     ) -> dict[str, list[int]]:
         """Add lint comments for target files.
 
         Return list of lines were a comment was added.
         """
-        # Split up comments by line in order
-        line_data: dict[int, list[utils.Comment]] = {}
+        # Split up comments by file and line in order
+        line_data: dict[tuple[str, int], list[utils.Comment]] = {}
         for comment in comments:
-            line_data.setdefault(comment.line, [])
-            line_data[comment.line].append(comment)
+            line_data.setdefault((comment.file, comment.line), [])
+            line_data[(comment.file, comment.line)].append(comment)
+
+        # Text of each file, read once instead of once per pointer
+        file_lines: dict[str, list[str]] = {}
+        ranges = self.pointer_ranges == "True"
 
         all_messages = []
-        for line in sorted(line_data):
-            messages = line_data[line]
+        for file, line in sorted(line_data):
+            messages = line_data[(file, line)]
             if not messages:
                 continue
             all_messages.extend(messages)
-            pointers = self.get_pointers(messages)
-            if pointers is not None:
-                all_messages.append(pointers)
+            if not pointers:
+                continue
+            lines = file_lines.get(file)
+            if lines is None:
+                lines = self.get_file_lines(file)
+                file_lines[file] = lines
+            pointer = self.get_pointers(
+                messages,
+                lines[line] if line < len(lines) else "",
+                ranges,
+            )
+            if pointer is not None:
+                all_messages.append(pointer)
 
         return self.add_comments(all_messages)
 
     def lint_check_add_response_comments(
         self,
-        lint_messages: list[dict[str, str | int]],
+        lint_messages: list[LintMessage],
         only_filename: str | None = None,
+        partial: bool = False,
     ) -> dict[str, list[int]]:
         """Add comments for each line given in lint_messages.
 
+        If only_filename is None, comments are added to every file
+        with messages, otherwise only to that file.
+
+        If partial, lint_messages are only some of the messages of a run
+        that is still going. Pointers and notes about other files are
+        left for the final call with all messages, as they depend on
+        messages that might not have arrived yet.
+
         Return list of lines where comments were added.
         """
-        assert self.files.filename is not None
-
         if only_filename is not None:
+            # Checking a single file, so this window's file is saved
+            assert self.files.filename is not None
             only_filename = os.path.abspath(only_filename)
 
         start_line = self.editwin.getlineno()
 
-        files = parse_comments(lint_messages)
-
-        file_commented_lines: dict[str, list[int]] = {}
+        with self.lint_timer.phase("parse"):
+            files = parse_comments(
+                lint_messages,
+                spans=self.pointer_ranges == "True",
+            )
 
         to_comment = list(files)
 
-        if self.lintcomment_only_current_file:
-            assert only_filename is not None
+        if only_filename is not None and self.lintcomment_only_current_file:
             to_comment = [only_filename]
 
             # Find first line in target file or use start_line
@@ -237,7 +357,7 @@ class lintcheck(utils.BaseExtension):  # noqa: N801
             # Add comments about how other files have errors
             files.setdefault(only_filename, [])
             for filename in files:
-                if filename == only_filename:
+                if partial or filename == only_filename:
                     continue
                 files[only_filename].append(
                     utils.Comment(
@@ -248,13 +368,33 @@ class lintcheck(utils.BaseExtension):  # noqa: N801
                     ),
                 )
 
-        for target_filename in to_comment:
-            if target_filename not in files:
-                continue
-            file_comments = self.add_lint_comments_for_file(
-                files[target_filename],
+        comments = [
+            comment
+            for target_filename in to_comment
+            for comment in files.get(target_filename, ())
+        ]
+        streamed = self.streamed_lines
+        original: dict[int, int] = {}
+        if streamed is not None:
+            # Earlier batches moved lines down
+            for index, comment in enumerate(comments):
+                line = comment.line + bisect_right(streamed, comment.line)
+                original[line] = comment.line
+                comments[index] = comment._replace(line=line)
+        with self.lint_timer.phase("insert"):
+            file_commented_lines = self.add_lint_comments_for_file(
+                comments,
+                pointers=not partial,
             )
-            file_commented_lines.update(file_comments)
+        self.lint_timer.count(
+            "comments",
+            sum(map(len, file_commented_lines.values())),
+        )
+        if streamed is not None and only_filename is not None:
+            for line in file_commented_lines.get(only_filename, ()):
+                # Pointer lines are below a message line, not from pylint
+                if line in original:
+                    insort(streamed, original[line])
         return file_commented_lines
 
     def initial(self) -> tuple[str | None, str | None]:
@@ -264,7 +404,8 @@ class lintcheck(utils.BaseExtension):  # noqa: N801
         and make sure mypy is installed
         """
         # Reload configuration
-        self.reload()
+        with self.lint_timer.phase("reload"):
+            self.reload()
 
         # Get file we are checking
         raw_filename: str | None = self.files.filename
@@ -279,16 +420,80 @@ class lintcheck(utils.BaseExtension):  # noqa: N801
                 self.text.bell()
                 return "break", file
             # Otherwise, we are clear to save
-            self.files.save(None)
+            with self.lint_timer.phase("save"):
+                self.files.save(None)
             if not self.files.get_saved():
                 return "break", file
 
         # Everything worked
         return None, file
 
+    def get_pylint_args(self, *files: str) -> list[str]:
+        """Return pylint command line arguments for checking files."""
+        if self.jobs == "auto":
+            cpus = get_available_cpus()
+            size = get_total_size(files)
+            jobs = choose_jobs(len(files), size, cpus)
+            utils.extension_log(
+                f"jobs=auto chose {jobs} for {len(files)} files "
+                f"of {size} bytes on {cpus} cpus",
+            )
+        else:
+            jobs = max(0, utils.int_default(self.jobs))
+        args = [*files, f"--jobs={jobs}"]
+        ignore = self.get_ignored()
+        if ignore:
+            args.append("--disable=" + ",".join(ignore))
+        return args
+
+    def get_ignored(self) -> list[str]:
+        """Return messages and checkers the ignore option disables."""
+        if not self.ignore or self.ignore == "None":
+            return []
+        return self.ignore.split(";")
+
+    def get_cached_messages(
+        self,
+        cache_key: str,
+    ) -> list[LintMessage] | None:
+        """Return cached lint messages for key or None if not cached."""
+        messages = RESULT_CACHE.get(cache_key)
+        if messages is not None or self.persistent_cache != "True":
+            return messages
+        # OSError if the cache directory can not be made, carry on
+        # with only the results remembered in memory
+        try:
+            messages = DISK_CACHE.get(cache_key)
+        except (OSError, sqlite3.Error) as exc:
+            utils.extension_log_exception(exc)
+            return None
+        if messages is not None:
+            RESULT_CACHE.put(cache_key, messages)
+        return messages
+
+    def cache_messages(
+        self,
+        cache_key: str,
+        messages: list[LintMessage],
+    ) -> None:
+        """Remember lint messages for key."""
+        RESULT_CACHE.put(cache_key, messages)
+        if self.persistent_cache != "True":
+            return
+        try:
+            DISK_CACHE.put(cache_key, messages)
+        except (OSError, sqlite3.Error) as exc:
+            utils.extension_log_exception(exc)
+
     def lint_check_event(self, event: Event[Any] | None = None) -> str:
         """Perform a pylint check and add comments."""
         # pylint: disable=unused-argument
+        if self.lint_job is not None:
+            # Already checking, do not start another run.
+            self.text.bell()
+            return "break"
+
+        self.lint_timer = PhaseTimer(self.timing == "True")
         init_return, file = self.initial()
 
         if init_return is not None:
@@ -297,38 +502,370 @@ class lintcheck(utils.BaseExtension):  # noqa: N801
         if file is None:
             return "break"
 
+        self.start_profile(f"lint check of {file}")
+
         # Get arguments
-        try:
-            jobs = int(self.jobs)
-        except ValueError:
-            jobs = 0
-        jobs = max(0, jobs)
-        args = [file, f"--jobs={jobs}"]
-        if self.ignore and self.ignore != "None":
-            if ";" not in self.ignore:
-                ignore = [self.ignore]
-            else:
-                ignore = self.ignore.split(";")
-            args.append("--disable=" + ",".join(ignore))
+        args = self.get_pylint_args(file)
+
+        # Use previous results if file and configuration are unchanged
+        cache_key = None
+        if self.cache == "True":
+            cache_key = cache.get_cache_key(file, args)
+        if cache_key is not None:
+            with self.lint_timer.phase("cache"):
+                messages = self.get_cached_messages(cache_key)
+            if messages is not None:
+                self.lint_timer.count("messages", len(messages))
+                with self.profile_phase("comments"):
+                    self.lint_check_add_response_comments(messages, file)
+                self.report_timing(file)
+                self.finish_profile()
+                self.text.bell()
+                return "break"
 
         # Run pylint on open file
-        reporter = Reporter()
-        try:
-            run_pylint(
+        # Inline runs block the event loop, nothing to stream to
+        # Profiles can not be captured by two threads at once
+        stream = (
+            self.stream == "True"
+            and self.backend != "inline"
+            and self.lint_profile is None
+        )
+        self.start_lint_job(args, file, cache_key, stream)
+        return "break"
+
+    def get_open_python_files(self) -> dict[str, EditorWindow]:
+        """Return editor windows of open Python files by absolute path."""
+        windows: dict[str, EditorWindow] = {}
+        for editwin in self.flist.inversedict:
+            filename = editwin.io.filename
+            if filename and editwin.ispythonsource(filename):
+                windows[os.path.abspath(filename)] = editwin
+        return windows
+
+    def lint_all_open_files_event(self, _event: Event[Any]) -> str:
+        """Check every open Python file with one pylint run."""
+        if self.lint_job is not None:
+            # Already checking, do not start another run.
+            self.text.bell()
+            return "break"
+
+        # Reload configuration
+        self.lint_timer = PhaseTimer(self.timing == "True")
+        with self.lint_timer.phase("reload"):
+            self.reload()
+
+        windows = self.get_open_python_files()
+        if not windows:
+            self.text.bell()
+            return "break"
+
+        # Make sure files are saved
+        unsaved = [
+            editwin
+            for editwin in windows.values()
+            if not editwin.io.get_saved()
+        ]
+        if unsaved:
+            if not utils.ask_save_dialog(self.text):
+                self.text.bell()
+                return "break"
+            with self.lint_timer.phase("save"):
+                for editwin in unsaved:
+                    editwin.io.save(None)
+            if not all(editwin.io.get_saved() for editwin in unsaved):
+                return "break"
+
+        self.start_profile(f"lint check of {len(windows)} open files")
+        # Comments go to every window, so nothing to stream line
+        # numbers for, and results of several files are not cached.
+        args = self.get_pylint_args(*sorted(windows))
+        self.start_lint_job(args, None, None, stream=False)
+        return "break"
+
+    def start_lint_job(
+        self,
+        args: list[str],
+        file: str | None,
+        cache_key: str | None,
+        stream: bool,
+    ) -> None:
+        """Run pylint with args and add comments when it is done.
+
+        If file is None, comments are added to every file with messages.
+        """
+        self.lint_timer.begin("run")
+        job: LintJob | SubprocessLintJob | WorkerLintJob
+        cache_memory_limit = utils.int_default(self.cache_memory_limit)
+        costs = RunCosts() if self.checker_costs == "True" else None
+        if self.backend == "worker":
+            job = WorkerLintJob(
                 args,
-                reporter=reporter,  # type: ignore[arg-type]
-                exit=False,
+                get_worker(),
+                stream,
+                cache_memory_limit,
+                costs,
             )
-        except SystemExit as exc:
-            traceback.print_exception(exc)
-            return "break"
+        elif self.backend == "subprocess":
+            job = SubprocessLintJob(
+                args,
+                stream,
+                memory_limit=utils.int_default(self.memory_limit),
+                cpu_limit=utils.int_default(self.cpu_limit),
+                costs=costs,
+            )
+        else:
+            job = LintJob(
+                args,
+                Reporter(),
+                stream,
+                cache_memory_limit,
+                self.lint_profile,
+                costs,
+            )
+        if self.backend == "inline":
+            job.run()
+            self.lint_timer.end("run")
+            self.lint_check_finish(job, file, cache_key)
+            return
+
+        try:
+            job.start()
+        except (OSError, RuntimeError) as exc:
+            # No thread or process was started, nothing to wait for
+            self.lint_timer = PhaseTimer(enabled=False)
+            utils.extension_log_exception(exc)
+            self.finish_profile()
+            self.text.bell()
+            return
+        self.lint_job = job
+        self.streamed_lines = [] if stream else None
+        self.lint_deadline = None
+        timeout = utils.int_default(self.timeout)
+        if timeout > 0:
+            self.lint_deadline = time.monotonic() + timeout
+        if self.status_after_id is not None:
+            self.text.after_cancel(self.status_after_id)
+            self.status_after_id = None
+        self.set_status("Linting...")
+        self.poll_after_id = self.text.after(
+            POLL_INTERVAL,
+            self.poll_lint_job,
+            file,
+            cache_key,
+        )
+
+    @utils.log_exceptions
+    def poll_lint_job(self, file: str | None, cache_key: str | None) -> None:
+        """Check if background lint job is done, handle results if so."""
+        job = self.lint_job
+        if job is None:
+            return
+        if not job.done():
+            deadline = self.lint_deadline
+            if deadline is not None and time.monotonic() >= deadline:
+                self.lint_deadline = None
+                utils.extension_log(
+                    f"Lint timed out after {self.timeout} seconds: "
+                    f"{job.args!r}",
+                )
+                job.cancel()
+            messages = job.get_new_messages()
+            if messages:
+                # Show what we have so far, the rest is added when done
+                self.lint_check_add_response_comments(
+                    messages,
+                    file,
+                    partial=True,
+                )
+            self.poll_after_id = self.text.after(
+                POLL_INTERVAL,
+                self.poll_lint_job,
+                file,
+                cache_key,
+            )
+            return
+        self.lint_timer.end("run")
+        self.poll_after_id = None
+        self.lint_job = None
+        self.lint_deadline = None
+        self.set_status()
+        try:
+            self.lint_check_finish(job, file, cache_key)
+        finally:
+            self.streamed_lines = None
+
+    def lint_check_finish(
+        self,
+        job: LintJob | SubprocessLintJob | WorkerLintJob,
+        file: str | None,
+        cache_key: str | None = None,
+    ) -> None:
+        """Add comments from finished lint job and cache messages."""
+        try:
+            self.handle_lint_result(job, file, cache_key)
+        finally:
+            self.finish_profile()
+
+    def handle_lint_result(
+        self,
+        job: LintJob | SubprocessLintJob | WorkerLintJob,
+        file: str | None,
+        cache_key: str | None,
+    ) -> None:
+        """Add comments for result of finished lint job."""
+        if isinstance(job.exception, LintCancelled):
+            self.lint_timer = PhaseTimer(enabled=False)
+            # Partial results are never cached
+            if self.partial_results == "True":
+                with self.profile_phase("comments"):
+                    self.lint_check_add_response_comments(
+                        job.get_messages(),
+                        file,
+                    )
+            self.show_status("Lint cancelled")
+            self.text.bell()
+            return
+        if job.exception is not None:
+            self.lint_timer = PhaseTimer(enabled=False)
+            traceback.print_exception(job.exception)
+            if not isinstance(job.exception, SystemExit):
+                utils.extension_log_exception(job.exception, print_=False)
+            self.text.bell()
+            return
+
+        messages = job.get_messages()
+        self.lint_timer.count("messages", len(messages))
+        if job.costs is not None:
+            self.record_costs(job.costs, messages)
+        if cache_key is not None:
+            with self.lint_timer.phase("cache"):
+                self.cache_messages(cache_key, messages)
 
         # Add code comments
-        self.lint_check_add_response_comments(reporter.get_messages(), file)
+        with self.profile_phase("comments"):
+            self.lint_check_add_response_comments(messages, file)
+        self.report_timing(file)
 
         # Make bell sound so user knows we are done,
-        # as it freezes a bit while pylint looks at the file
+        # as pylint might take a while to look at the file
         self.text.bell()
+
+    def record_costs(
+        self,
+        costs: RunCosts,
+        messages: list[LintMessage],
+    ) -> None:
+        """Add checker costs of a finished check to COST_TABLE."""
+        if not costs.seconds:
+            # Parallel jobs, checkers were not measured
+            return
+        try:
+            COST_TABLE.record(costs, messages)
+        except (OSError, sqlite3.Error) as exc:
+            utils.extension_log_exception(exc)
+
+    def show_checker_costs_event(self, _event: Event[Any]) -> str:
+        """Open report of time spent in each checker in a text window."""
+        # pylint: disable=import-outside-toplevel
+        from idlelib.textview import view_text
+
+        # Reload configuration
+        self.reload()
+
+        try:
+            totals = COST_TABLE.get_totals()
+        except (OSError, sqlite3.Error) as exc:
+            utils.extension_log_exception(exc)
+            self.text.bell()
+            return "break"
+        view_text(
+            self.text,  # type: ignore[arg-type]
+            "Checker Costs",
+            format_report(totals, self.get_ignored()),
+            modal=False,
+        )
+        return "break"
+
+    def report_timing(self, file: str | None) -> None:
+        """Log timings of the check that just finished and show them."""
+        timer = self.lint_timer
+        self.lint_timer = PhaseTimer(enabled=False)
+        if not timer.enabled:
+            return
+        target = "all-open-files" if file is None else file
+        utils.extension_log(f"timing file={target!r} {timer.format_log()}")
+        self.show_status(timer.format_status())
+
+    def start_profile(self, label: str) -> None:
+        """Start profiling check described by label if profile is on."""
+        self.lint_profile = None
+        if self.profile == "off":
+            return
+        # pylint: disable=import-outside-toplevel
+        from lintcheck.profiling import ProfileSession
+
+        self.lint_profile = ProfileSession.from_option(self.profile, label)
+
+    def profile_phase(self, phase: str) -> AbstractContextManager[None]:
+        """Return context capturing phase in profile, if profiling."""
+        if self.lint_profile is None:
+            return nullcontext()
+        return self.lint_profile.capture(phase)
+
+    def finish_profile(self) -> None:
+        """Write profile of the check that just finished, if profiling."""
+        session = self.lint_profile
+        self.lint_profile = None
+        if session is None:
+            return
+        path = session.finish(utils.LOGS_PATH, utils.TITLE)
+        utils.extension_log(f"Profile written to {path}")
+
+    def show_lint_profile_event(self, _event: Event[Any]) -> str:
+        """Open summary of the latest profile in a text window."""
+        # pylint: disable=import-outside-toplevel
+        from idlelib.textview import view_file
+
+        from lintcheck.profiling import get_latest_summary
+
+        path = get_latest_summary(utils.LOGS_PATH, utils.TITLE)
+        if path is None:
+            self.text.bell()
+            return "break"
+        view_file(
+            self.text,  # type: ignore[arg-type]
+            path.name,
+            str(path),
+            "utf-8",
+            modal=False,
+        )
+        return "break"
+
+    def show_status(self, text: str) -> None:
+        """Show text in the status bar for STATUS_TIME."""
+        self.set_status(text)
+        if self.status_after_id is not None:
+            self.text.after_cancel(self.status_after_id)
+        self.status_after_id = self.text.after(
+            STATUS_TIME,
+            self.clear_status,
+        )
+
+    def clear_status(self) -> None:
+        """Clear text shown by show_status."""
+        self.status_after_id = None
+        self.set_status()
+
+    def cancel_lint_event(self, _event: Event[Any]) -> str:
+        """Cancel running lint check."""
+        job = self.lint_job
+        if job is None:
+            self.text.bell()
+            return "break"
+        self.lint_deadline = None
+        job.cancel()
+        self.set_status("Cancelling...")
         return "break"
 
     def remove_lint_comments_event(self, _event: Event[Any]) -> str:
@@ -342,7 +879,7 @@ class lintcheck(utils.BaseExtension):  # noqa: N801
         return "break"
 
     def find_next_lint_comment_event(self, _event: Event[Any]) -> str:
-        """Find next extension comment by hacking the search dialog engine."""
+        """Find next extension comment after the cursor."""
         # Reload configuration
         self.reload()
 
@@ -351,5 +888,30 @@ class lintcheck(utils.BaseExtension):  # noqa: N801
 
         return "break"
 
-    # def close(self) -> None:
-    #     """Extension cleanup before IDLE window closes."""
+    def find_previous_lint_comment_event(self, _event: Event[Any]) -> str:
+        """Find previous extension comment before the cursor."""
+        # Reload configuration
+        self.reload()
+
+        # Find comment
+        self.find_previous_extension_comment(self.search_wrap == "True")
+
+        return "break"
+
+    def close(self) -> None:
+        """Extension cleanup before IDLE window closes."""
+        if self.idle_after_id is not None:
+            self.text.after_cancel(self.idle_after_id)
+            self.idle_after_id = None
+        if self.status_after_id is not None:
+            self.text.after_cancel(self.status_after_id)
+            self.status_after_id = None
+        # Stop polling, background thread results are discarded.
+        if self.poll_after_id is not None:
+            self.text.after_cancel(self.poll_after_id)
+            self.poll_after_id = None
+        self.lint_job = None
+        self.lint_deadline = None
+        self.streamed_lines = None
+        self.finish_profile()
+        super().close()
@@ -0,0 +1,152 @@
+"""Lint Check Instrument - Time pylint checkers while they run."""
+
+# Programmed by CoolCat467
+
+from __future__ import annotations
+
+# Lint Check Instrument - Time pylint checkers while they run.
+# Copyright (C) 2025  CoolCat467
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+__title__ = "instrument"
+__author__ = "CoolCat467"
+__license__ = "GNU General Public License Version 3"
+
+# Imports pylint, only import this module when about to run pylint.
+
+import functools
+from contextvars import ContextVar
+from time import perf_counter
+from typing import TYPE_CHECKING, Any, TypeVar
+
+from pylint.exceptions import UnknownMessageError
+from pylint.lint import PyLinter, Run
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Sequence
+
+    from pylint.checkers import BaseChecker
+    from pylint.reporters import BaseReporter
+
+    from lintcheck.checker_costs import RunCosts
+
+T = TypeVar("T")
+
+# Checker methods timed besides visit_ and leave_ methods
+TIMED_METHODS = frozenset(
+    {"open", "close", "process_module", "process_tokens"},
+)
+
+# Costs of the run in this thread, pylint makes its linter itself
+_COSTS: ContextVar[RunCosts | None] = ContextVar(
+    "lintcheck_costs",
+    default=None,
+)
+
+
+def get_symbols(linter: PyLinter, method: Callable[..., object]) -> str:
+    """Return symbols method is only needed for, separated by commas.
+
+    Empty if the method always runs while its checker is enabled.
+    """
+    symbols: set[str] = set()
+    for msgid in getattr(method, "checks_msgs", ()):
+        try:
+            definitions = linter.msgs_store.get_message_definitions(msgid)
+        except UnknownMessageError:
+            symbols.add(msgid)
+            continue
+        symbols.update(definition.symbol for definition in definitions)
+    return ",".join(sorted(symbols))
+
+
+def timed(
+    method: Callable[..., T],
+    record: Callable[[float], object],
+) -> Callable[..., T]:
+    """Return wrapper of method giving record the seconds each call took.
+
+    Attributes of method, like the messages it is needed for, are kept.
+    """
+
+    @functools.wraps(method)
+    def wrapper(*args: Any, **kwargs: Any) -> T:
+        start = perf_counter()
+        try:
+            return method(*args, **kwargs)
+        finally:
+            record(perf_counter() - start)
+
+    return wrapper
+
+
+def instrument(
+    linter: PyLinter,
+    checkers: Sequence[BaseChecker],
+    costs: RunCosts,
+) -> None:
+    """Replace methods of checkers with ones adding their time to costs."""
+    for checker in checkers:
+        for name in dir(checker):
+            if name not in TIMED_METHODS and not name.startswith(
+                ("visit_", "leave_"),
+            ):
+                continue
+            method = getattr(checker, name)
+            if not callable(method):
+                continue
+            record = functools.partial(
+                costs.add,
+                checker.name,
+                get_symbols(linter, method),
+            )
+            setattr(checker, name, timed(method, record))
+
+
+class CostLinter(PyLinter):
+    """PyLinter timing its checkers if run by run_pylint_measured."""
+
+    def prepare_checkers(self) -> list[BaseChecker]:
+        """Return checkers needed for enabled messages, instrumented."""
+        checkers = super().prepare_checkers()
+        costs = _COSTS.get()
+        if costs is not None:
+            instrument(self, checkers, costs)
+        return checkers
+
+
+class CostRun(Run):
+    """Pylint run using CostLinter."""
+
+    LinterClass = CostLinter  # type: ignore[mutable-override]
+
+
+def run_pylint_measured(
+    args: Sequence[str],
+    reporter: BaseReporter,
+    costs: RunCosts,
+) -> None:
+    """Run pylint like pylint.lint.Run, adding time spent to costs.
+
+    Checkers run by parallel jobs (`--jobs` other than 1) are not
+    measured, only the total.
+    """
+    token = _COSTS.set(costs)
+    start = perf_counter()
+    try:
+        CostRun(args, reporter=reporter, exit=False)
+    finally:
+        costs.total += perf_counter() - start
+        _COSTS.reset(token)
@@ -0,0 +1,70 @@
+"""Lint Check Message - Compact record of one pylint message."""
+
+# Programmed by CoolCat467
+
+from __future__ import annotations
+
+# Lint Check Message - Compact record of one pylint message.
+# Copyright (C) 2025  CoolCat467
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+__title__ = "message"
+__author__ = "CoolCat467"
+__license__ = "GNU General Public License Version 3"
+
+from typing import TYPE_CHECKING, NamedTuple
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from pylint.message import Message
+
+
+class LintMessage(NamedTuple):
+    """One pylint message.
+
+    Tuple backed so there is no per message dictionary, and serialized
+    to JSON as an array in field order.
+    """
+
+    abspath: str
+    line: int
+    column: int
+    end_line: int | None
+    end_column: int | None
+    msg_id: str
+    symbol: str
+    msg: str
+
+    @classmethod
+    def from_pylint(cls, msg: Message) -> LintMessage:
+        """Return record of pylint message object."""
+        return cls(
+            msg.abspath,
+            msg.line,
+            msg.column,
+            msg.end_line,
+            msg.end_column,
+            msg.msg_id,
+            msg.symbol,
+            msg.msg,
+        )
+
+
+def messages_from_json(
+    data: Iterable[list[str | int | None]],
+) -> list[LintMessage]:
+    """Return messages from JSON arrays of message fields."""
+    return [LintMessage._make(fields) for fields in data]
@@ -0,0 +1,168 @@
+"""Lint Check Profiling - Capture cProfile and tracemalloc data of checks."""
+
+# Programmed by CoolCat467
+
+from __future__ import annotations
+
+# Lint Check Profiling - Capture cProfile and tracemalloc data of checks.
+# Copyright (C) 2025  CoolCat467
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+__title__ = "profiling"
+__author__ = "CoolCat467"
+__license__ = "GNU General Public License Version 3"
+
+import cProfile
+import io
+import pstats
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Generator
+    from pathlib import Path
+
+# Number of functions and allocation sites listed in summaries
+PROFILE_TOP = 30
+# Values of the profile option and if they use cProfile and tracemalloc
+PROFILE_MODES = {
+    "cpu": (True, False),
+    "memory": (False, True),
+    "all": (True, True),
+}
+
+
+class ProfileSession:
+    """cProfile and tracemalloc data of one lint check.
+
+    CPU time is collected only inside `capture` blocks, which can be in
+    different threads as long as they do not overlap. Allocations are
+    traced for every thread from creation until `finish`.
+    """
+
+    __slots__ = ("label", "phases", "profiler", "started", "tracing")
+
+    def __init__(
+        self,
+        label: str,
+        cpu: bool = True,
+        memory: bool = True,
+    ) -> None:
+        """Initialize session and start tracing allocations if memory."""
+        self.label = label
+        self.profiler = cProfile.Profile() if cpu else None
+        self.started = time.time()
+        # Seconds spent in each captured phase
+        self.phases: dict[str, float] = {}
+        # Do not stop tracing someone else started
+        self.tracing = memory and not tracemalloc.is_tracing()
+        if self.tracing:
+            tracemalloc.start()
+
+    def __repr__(self) -> str:
+        """Return representation of self."""
+        return f"{self.__class__.__name__}({self.label!r})"
+
+    @classmethod
+    def from_option(cls, option: str, label: str) -> ProfileSession | None:
+        """Return session for profile option value, None if off."""
+        mode = PROFILE_MODES.get(option)
+        if mode is None:
+            return None
+        cpu, memory = mode
+        return cls(label, cpu, memory)
+
+    @contextmanager
+    def capture(self, phase: str) -> Generator[None, None, None]:
+        """Collect CPU profile of phase for duration of with block."""
+        start = time.perf_counter()
+        if self.profiler is not None:
+            self.profiler.enable()
+        try:
+            yield
+        finally:
+            if self.profiler is not None:
+                self.profiler.disable()
+            self.phases[phase] = (
+                self.phases.get(phase, 0.0) + time.perf_counter() - start
+            )
+
+    def get_summary(self) -> str:
+        """Return text summary of profile and allocations."""
+        out = io.StringIO()
+        out.write(f"Profile of {self.label}\n")
+        out.write(
+            time.strftime(
+                "%Y-%m-%d %H:%M:%S\n\n",
+                time.localtime(self.started),
+            ),
+        )
+        for phase, seconds in self.phases.items():
+            out.write(f"{phase}: {seconds:.3f}s\n")
+
+        # pstats can not read a profiler that was never enabled
+        if self.profiler is not None and self.phases:
+            out.write(f"\nTop {PROFILE_TOP} functions by cumulative time\n")
+            stats = pstats.Stats(self.profiler, stream=out)
+            stats.sort_stats(pstats.SortKey.CUMULATIVE)
+            stats.print_stats(PROFILE_TOP)
+
+        if tracemalloc.is_tracing():
+            current, peak = tracemalloc.get_traced_memory()
+            out.write(
+                f"\nTraced memory: {current / 1024 / 1024:.1f} MiB now, "
+                f"{peak / 1024 / 1024:.1f} MiB peak\n",
+            )
+            out.write(f"Top {PROFILE_TOP} allocation sites still in use\n")
+            snapshot = tracemalloc.take_snapshot().filter_traces(
+                (
+                    tracemalloc.Filter(False, tracemalloc.__file__),
+                    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+                ),
+            )
+            for stat in snapshot.statistics("lineno")[:PROFILE_TOP]:
+                out.write(f"{stat}\n")
+        return out.getvalue()
+
+    def finish(self, directory: Path, prefix: str) -> Path:
+        """Stop tracing and write results. Return summary path.
+
+        Writes directory/prefix-profile-<time>.txt with the summary and
+        a .prof file with the same name of the cProfile data that
+        pstats and snakeviz can read, if any phase was captured.
+        """
+        stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(self.started))
+        stamp += f"-{int(self.started * 1000) % 1000:03d}"
+        directory.mkdir(parents=True, exist_ok=True)
+        base = directory / f"{prefix}-profile-{stamp}"
+        summary = self.get_summary()
+        if self.tracing:
+            tracemalloc.stop()
+            self.tracing = False
+        if self.profiler is not None and self.phases:
+            self.profiler.dump_stats(base.with_suffix(".prof"))
+        path = base.with_suffix(".txt")
+        path.write_text(summary, encoding="utf-8")
+        return path
+
+
+def get_latest_summary(directory: Path, prefix: str) -> Path | None:
+    """Return path of newest profile summary in directory or None."""
+    summaries = sorted(directory.glob(f"{prefix}-profile-*.txt"))
+    if not summaries:
+        return None
+    return summaries[-1]
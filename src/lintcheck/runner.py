@@ -0,0 +1,884 @@
+"""Lint Check Runner - Run pylint and collect messages."""
+
+# Programmed by CoolCat467
+
+from __future__ import annotations
+
+# Lint Check Runner - Run pylint and collect messages.
+# Copyright (C) 2023-2025  CoolCat467
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+__title__ = "runner"
+__author__ = "CoolCat467"
+__license__ = "GNU General Public License Version 3"
+
+import atexit
+import ctypes
+import gc
+import json
+import os
+import queue
+import subprocess
+import sys
+import threading
+import time
+from contextlib import nullcontext
+from typing import TYPE_CHECKING
+
+from lintcheck.message import LintMessage, messages_from_json
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Sequence
+    from typing import IO
+
+    import pylint
+
+    from lintcheck.astroid_cache import CachePolicy
+    from lintcheck.checker_costs import RunCosts
+    from lintcheck.profiling import ProfileSession
+
+# Default limits for batches of messages sent while pylint is running
+BATCH_SIZE = 50
+BATCH_INTERVAL = 0.1
+
+# For jobs="auto", every parallel job needs at least this many bytes of
+# source to check, starting a job process costs about as much as
+# checking that much code.
+AUTO_JOBS_BYTES_PER_JOB = 256 * 1024
+
+# Pylint and astroid keep global state, so only one in-process
+# run can happen at a time no matter how many windows ask for one.
+PYLINT_LOCK = threading.Lock()
+
+# Pylint is imported on first use, importing it takes a while
+_PRELOAD_THREAD: threading.Thread | None = None
+# Astroid cache policy of in-process runs, made on first run
+_CACHE_POLICY: CachePolicy | None = None
+
+
+def get_cgroup_cpu_limit() -> float | None:
+    """Return number of CPUs the cgroup CPU quota allows.
+
+    Return None if there is no quota or it can not be read.
+    """
+    try:
+        # cgroup v2, "max 100000" if unlimited
+        with open("/sys/fs/cgroup/cpu.max", encoding="utf-8") as fp:
+            quota, period = fp.read().split()[:2]
+    except (OSError, ValueError):
+        try:
+            # cgroup v1, quota is -1 if unlimited
+            with open(
+                "/sys/fs/cgroup/cpu/cpu.cfs_quota_us",
+                encoding="utf-8",
+            ) as fp:
+                quota = fp.read().strip()
+            with open(
+                "/sys/fs/cgroup/cpu/cpu.cfs_period_us",
+                encoding="utf-8",
+            ) as fp:
+                period = fp.read().strip()
+        except OSError:
+            return None
+    try:
+        quota_us = int(quota)
+        period_us = int(period)
+    except ValueError:
+        return None
+    if quota_us <= 0 or period_us <= 0:
+        return None
+    return quota_us / period_us
+
+
+def get_available_cpus() -> int:
+    """Return number of CPUs this process can use.
+
+    Respects CPU affinity and cgroup CPU quotas.
+    """
+    if hasattr(os, "sched_getaffinity"):
+        cpus = len(os.sched_getaffinity(0))
+    else:  # pragma: no cover
+        cpus = os.cpu_count() or 1
+    limit = get_cgroup_cpu_limit()
+    if limit is not None:
+        cpus = min(cpus, int(limit))
+    return max(1, cpus)
+
+
+def get_total_size(files: Sequence[str]) -> int:
+    """Return total size of files in bytes, skipping unreadable files."""
+    total = 0
+    for file in files:
+        try:
+            total += os.path.getsize(file)
+        except OSError:
+            continue
+    return total
+
+
+def choose_jobs(file_count: int, total_bytes: int, cpus: int) -> int:
+    """Return number of pylint jobs worth using to check files.
+
+    Parallel jobs only pay off with several files and enough code to
+    split between them, otherwise checking is done in one process.
+    """
+    if file_count < 2:
+        return 1
+    by_size = total_bytes // AUTO_JOBS_BYTES_PER_JOB
+    return max(1, min(cpus, file_count, by_size))
+
+
+def get_pylint_jobs(args: Sequence[str]) -> int:
+    """Return number of processes pylint will check files with for args.
+
+    Like pylint, the last `--jobs` wins and 0 means one per CPU.
+    """
+    jobs = "1"
+    for index, arg in enumerate(args):
+        if arg.startswith("--jobs="):
+            jobs = arg.split("=", 1)[1]
+        elif arg in {"--jobs", "-j"} and index + 1 < len(args):
+            jobs = args[index + 1]
+    try:
+        count = int(jobs)
+    except ValueError:
+        return 1
+    if count == 0:
+        return get_available_cpus()
+    return count
+
+
+class LintCancelled(BaseException):
+    """Lint run was cancelled.
+
+    Not an Exception, so pylint and astroid code catching Exception
+    does not stop it when raised inside a running pylint thread.
+    """
+
+
+def import_pylint() -> None:
+    """Import the parts of pylint a lint run needs."""
+    # pylint: disable=import-outside-toplevel,unused-import
+    import pylint.lint  # noqa: F401
+
+
+def get_cache_policy() -> CachePolicy:
+    """Return astroid cache policy of in-process runs.
+
+    Imports astroid, only call when about to run pylint.
+    """
+    global _CACHE_POLICY
+    if _CACHE_POLICY is None:
+        # pylint: disable=import-outside-toplevel
+        from lintcheck.astroid_cache import CachePolicy
+
+        _CACHE_POLICY = CachePolicy()
+    return _CACHE_POLICY
+
+
+def start_preload() -> None:
+    """Start importing pylint in a background thread, if not already."""
+    global _PRELOAD_THREAD
+    if _PRELOAD_THREAD is not None or "pylint.lint" in sys.modules:
+        return
+    _PRELOAD_THREAD = threading.Thread(
+        target=import_pylint,
+        name="lintcheck-preload",
+        daemon=True,
+    )
+    _PRELOAD_THREAD.start()
+
+
+class Reporter:
+    """Reporter class.
+
+    If batch_callback is set, it is called from the pylint thread with
+    each new batch of messages, every batch_size messages or once
+    batch_interval seconds have passed since the last batch.
+    """
+
+    __slots__ = (
+        "batch_callback",
+        "batch_interval",
+        "batch_size",
+        "flushed",
+        "last_flush",
+        "linter",
+        "messages",
+        "path_strip_prefix",
+    )
+
+    def __init__(
+        self,
+        batch_callback: Callable[[list[LintMessage]], object] | None = None,
+        batch_size: int = BATCH_SIZE,
+        batch_interval: float = BATCH_INTERVAL,
+    ) -> None:
+        """Initialize reporter."""
+        self.linter: pylint.lint.pylinter.PyLinter | None = None
+        self.messages: list[LintMessage] = []
+        # Pylint expects reporters to have this, see BaseReporter
+        self.path_strip_prefix = os.getcwd() + os.sep
+
+        self.batch_callback = batch_callback
+        self.batch_size = batch_size
+        self.batch_interval = batch_interval
+        # Number of messages already sent to batch_callback
+        self.flushed = 0
+        self.last_flush = time.monotonic()
+
+    def handle_message(self, msg: pylint.message.message.Message) -> None:
+        """Record message."""
+        self.messages.append(LintMessage.from_pylint(msg))
+
+        if self.batch_callback is not None and (
+            len(self.messages) - self.flushed >= self.batch_size
+            or time.monotonic() - self.last_flush >= self.batch_interval
+        ):
+            self.flush()
+
+    def flush(self) -> None:
+        """Send messages not yet sent to batch_callback."""
+        self.last_flush = time.monotonic()
+        if self.batch_callback is None or self.flushed == len(self.messages):
+            return
+        batch = self.messages[self.flushed :]
+        self.flushed = len(self.messages)
+        self.batch_callback(batch)
+
+    def on_set_current_module(self, modname: str, filepath: str) -> None:
+        """Handle module starts to be analysed."""
+
+    def display_messages(
+        self,
+        section: pylint.reporters.ureports.nodes.Section,
+    ) -> None:
+        """Handle displaying the messages of the reporter."""
+
+    def on_close(
+        self,
+        stats: pylint.utils.linterstats.LinterStats,
+        previous_stats: pylint.utils.linterstats.LinterStats,
+    ) -> None:
+        """Handle when a module finished analyzing."""
+
+    def display_reports(
+        self,
+        section: pylint.reporters.ureports.nodes.Section,
+    ) -> None:
+        """Display results encapsulated in the layout tree."""
+
+    def get_messages(self) -> list[LintMessage]:
+        """Return Messages."""
+        return self.messages
+
+
+class LintJob:
+    """Run pylint with a reporter, either inline or in a background thread.
+
+    Tk is not thread safe, so the thread only runs pylint. The event
+    loop is expected to check `done` periodically (with `after`) and
+    handle the messages once the job is finished.
+
+    If stream is True, batches of messages found so far can be taken
+    with `get_new_messages` while the job is running. Parallel pylint
+    jobs pickle the reporter, so it only streams when args run one.
+
+    Astroid's cache is managed by the shared CachePolicy, see
+    astroid_cache. cache_memory_limit is its memory limit in MiB.
+
+    If profile is given, the pylint run is captured as its "run" phase.
+    If costs is given, time spent in each checker is added to it.
+    """
+
+    __slots__ = (
+        "args",
+        "batches",
+        "cache_memory_limit",
+        "cancelled",
+        "costs",
+        "exception",
+        "profile",
+        "reporter",
+        "thread",
+    )
+
+    def __init__(
+        self,
+        args: list[str],
+        reporter: Reporter,
+        stream: bool = False,
+        cache_memory_limit: int = 0,
+        profile: ProfileSession | None = None,
+        costs: RunCosts | None = None,
+    ) -> None:
+        """Initialize job with pylint arguments and reporter."""
+        self.args = args
+        self.reporter = reporter
+        self.cache_memory_limit = cache_memory_limit
+        self.profile = profile
+        self.costs = costs
+        self.exception: BaseException | None = None
+        self.thread: threading.Thread | None = None
+        self.cancelled = False
+        self.batches: queue.SimpleQueue[list[LintMessage]] = (
+            queue.SimpleQueue()
+        )
+        if stream and get_pylint_jobs(args) == 1:
+            self.reporter.batch_callback = self.batches.put
+
+    def __repr__(self) -> str:
+        """Return representation of self."""
+        return f"{self.__class__.__name__}({self.args!r})"
+
+    def run(self) -> None:
+        """Run pylint in the current thread.
+
+        Exceptions (including pylint's SystemExit and LintCancelled)
+        are stored in `exception` instead of propagating.
+        """
+        try:
+            # pylint: disable=import-outside-toplevel
+            from pylint.lint import Run as run_pylint  # noqa: N813
+
+            from lintcheck.instrument import run_pylint_measured
+
+            with PYLINT_LOCK:
+                policy = get_cache_policy()
+                policy.memory_limit = self.cache_memory_limit
+                policy.before_run()
+                capture = (
+                    nullcontext()
+                    if self.profile is None
+                    else self.profile.capture("run")
+                )
+                try:
+                    with capture:
+                        if self.costs is None:
+                            run_pylint(
+                                self.args,
+                                reporter=self.reporter,  # type: ignore[arg-type]
+                                exit=False,
+                            )
+                        else:
+                            run_pylint_measured(
+                                self.args,
+                                self.reporter,  # type: ignore[arg-type]
+                                self.costs,
+                            )
+                except BaseException:
+                    # Cancelled or crashed, maybe while building a module
+                    policy.abort_run()
+                    raise
+                policy.after_run()
+        except (Exception, SystemExit, LintCancelled) as exc:
+            self.exception = exc
+        if self.cancelled:
+            # Free what the interrupted run left, while still
+            # in the background thread.
+            gc.collect()
+
+    def run_thread(self) -> None:
+        """Run pylint, target of background thread."""
+        try:
+            self.run()
+        except LintCancelled as exc:
+            # Cancelled just after pylint finished
+            self.exception = exc
+
+    def start(self) -> None:
+        """Start running pylint in a background thread."""
+        if self.thread is not None:
+            raise RuntimeError("Job already started")
+        self.thread = threading.Thread(
+            target=self.run_thread,
+            name="lintcheck-pylint",
+            daemon=True,
+        )
+        self.thread.start()
+
+    def cancel(self) -> None:
+        """Stop background thread by raising LintCancelled in it.
+
+        Pylint stops the next time it runs Python code, call `done` to
+        see when it has. Messages found so far stay in the reporter.
+        Jobs run inline can not be cancelled.
+        """
+        thread = self.thread
+        if self.cancelled or thread is None or thread.ident is None:
+            return
+        if not thread.is_alive():
+            return
+        self.cancelled = True
+        ctypes.pythonapi.PyThreadState_SetAsyncExc(
+            ctypes.c_ulong(thread.ident),
+            ctypes.py_object(LintCancelled),
+        )
+
+    def done(self) -> bool:
+        """Return if job is finished."""
+        if self.thread is None:
+            return True
+        return not self.thread.is_alive()
+
+    def get_messages(self) -> list[LintMessage]:
+        """Return messages collected by reporter."""
+        return self.reporter.get_messages()
+
+    def get_new_messages(self) -> list[LintMessage]:
+        """Return streamed messages not returned by a previous call."""
+        messages: list[LintMessage] = []
+        while True:
+            try:
+                messages.extend(self.batches.get_nowait())
+            except queue.Empty:
+                return messages
+
+
+class LintError(Exception):
+    """Pylint failed in lint worker process."""
+
+
+class WorkerProcess:
+    """Long lived pylint process that keeps astroid's caches warm.
+
+    Jobs are run one at a time in the order they were submitted.
+    Responses are read by a helper thread so `poll` never blocks.
+    """
+
+    __slots__ = ("current", "pending", "process", "reader", "responses")
+
+    def __init__(self) -> None:
+        """Initialize worker, process is not started yet."""
+        self.process: subprocess.Popen[str] | None = None
+        self.reader: threading.Thread | None = None
+        self.responses: queue.SimpleQueue[dict[str, object] | None] = (
+            queue.SimpleQueue()
+        )
+        self.current: WorkerLintJob | None = None
+        self.pending: list[WorkerLintJob] = []
+
+    def __repr__(self) -> str:
+        """Return representation of self."""
+        return f"{self.__class__.__name__}()"
+
+    def is_alive(self) -> bool:
+        """Return if worker process is running."""
+        return self.process is not None and self.process.poll() is None
+
+    def start(self) -> None:
+        """Start worker process if it is not running."""
+        if self.is_alive():
+            return
+        self.process = subprocess.Popen(  # noqa: S603
+            get_worker_command(),
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            text=True,
+            encoding="utf-8",
+        )
+        self.responses = queue.SimpleQueue()
+        assert self.process.stdout is not None
+        self.reader = threading.Thread(
+            target=self.read_responses,
+            args=(self.process.stdout, self.responses),
+            name="lintcheck-worker-reader",
+            daemon=True,
+        )
+        self.reader.start()
+
+    @staticmethod
+    def read_responses(
+        stream: IO[str],
+        responses: queue.SimpleQueue[dict[str, object] | None],
+    ) -> None:
+        """Read responses from stream into queue. None means closed."""
+        for line in stream:
+            responses.put(json.loads(line))
+        responses.put(None)
+
+    def stop(self) -> None:
+        """Stop worker process, failing any jobs it had."""
+        process = self.process
+        self.process = None
+        if process is not None:
+            if process.stdin is not None:
+                process.stdin.close()
+            try:
+                process.wait(timeout=1)
+            except subprocess.TimeoutExpired:
+                process.kill()
+                process.wait()
+        jobs = self.pending
+        if self.current is not None:
+            jobs.insert(0, self.current)
+        self.current = None
+        self.pending = []
+        for job in jobs:
+            job.finish([], LintError("Lint worker stopped"))
+
+    def cancel(self, job: WorkerLintJob) -> None:
+        """Cancel job, killing the worker process if it is running it.
+
+        Other pending jobs are run by a new worker process.
+        """
+        if job in self.pending:
+            self.pending.remove(job)
+            job.finish([], LintCancelled())
+            return
+        if job is not self.current:
+            return
+        self.current = None
+        process = self.process
+        self.process = None
+        if process is not None:
+            process.kill()
+            process.wait()
+        job.finish(job.received, LintCancelled())
+        if self.pending:
+            self.send_next()
+
+    def submit(self, job: WorkerLintJob) -> None:
+        """Add job to queue of jobs to run."""
+        self.pending.append(job)
+        self.poll()
+
+    def send_next(self) -> None:
+        """Send next pending job to worker process."""
+        self.start()
+        assert self.process is not None
+        assert self.process.stdin is not None
+        job = self.pending.pop(0)
+        request = {
+            "args": job.args,
+            "cwd": os.getcwd(),
+            "stream": job.stream,
+            "cache_memory_limit": job.cache_memory_limit,
+            "costs": job.costs is not None,
+        }
+        try:
+            self.process.stdin.write(json.dumps(request) + "\n")
+            self.process.stdin.flush()
+        except OSError as exc:
+            job.finish([], exc)
+            self.stop()
+            return
+        self.current = job
+
+    def poll(self, block: bool = False) -> None:
+        """Handle any responses and send the next job if idle.
+
+        If block is True, wait for the running job to finish.
+        """
+        while self.current is not None:
+            try:
+                response = self.responses.get(block=block)
+            except queue.Empty:
+                return
+            if response is None:
+                # Worker died, fail its jobs.
+                # Next job submitted will start a new one.
+                self.stop()
+                return
+            job = self.current
+            partial = response.get("partial")
+            if isinstance(partial, list):
+                batch = messages_from_json(partial)
+                job.batches.append(batch)
+                job.received.extend(batch)
+                continue
+            self.current = None
+            if job.costs is not None:
+                job.costs.update_from_json(response.get("costs"))
+            error = response.get("error")
+            messages = response.get("messages")
+            assert isinstance(messages, list)
+            job.finish(
+                messages_from_json(messages),
+                LintError(error) if isinstance(error, str) else None,
+            )
+        if self.current is None and self.pending:
+            self.send_next()
+
+
+_WORKER: WorkerProcess | None = None
+
+
+def get_worker() -> WorkerProcess:
+    """Return shared worker process manager, creating it if needed."""
+    global _WORKER
+    if _WORKER is None:
+        _WORKER = WorkerProcess()
+        atexit.register(_WORKER.stop)
+    return _WORKER
+
+
+class WorkerLintJob:
+    """Run pylint in the shared worker process.
+
+    Has the same interface as `LintJob`.
+    """
+
+    __slots__ = (
+        "args",
+        "batches",
+        "cache_memory_limit",
+        "costs",
+        "exception",
+        "finished",
+        "messages",
+        "received",
+        "stream",
+        "worker",
+    )
+
+    def __init__(
+        self,
+        args: list[str],
+        worker: WorkerProcess,
+        stream: bool = False,
+        cache_memory_limit: int = 0,
+        costs: RunCosts | None = None,
+    ) -> None:
+        """Initialize job with pylint arguments and worker to run it.
+
+        cache_memory_limit is the memory limit in MiB of the worker's
+        astroid cache policy, see astroid_cache. If costs is given, the
+        time the worker spent in each checker is added to it.
+        """
+        self.args = args
+        self.worker = worker
+        self.stream = stream
+        self.cache_memory_limit = cache_memory_limit
+        self.costs = costs
+        self.exception: BaseException | None = None
+        self.finished = False
+        self.messages: list[LintMessage] = []
+        self.batches: list[list[LintMessage]] = []
+        # Every streamed message, kept if the job is cancelled
+        self.received: list[LintMessage] = []
+
+    def __repr__(self) -> str:
+        """Return representation of self."""
+        return f"{self.__class__.__name__}({self.args!r})"
+
+    def finish(
+        self,
+        messages: list[LintMessage],
+        exception: BaseException | None,
+    ) -> None:
+        """Handle result from worker."""
+        self.messages = messages
+        self.exception = exception
+        self.finished = True
+
+    def run(self) -> None:
+        """Run in worker process and wait for the result."""
+        self.start()
+        while not self.finished:
+            self.worker.poll(block=True)
+
+    def start(self) -> None:
+        """Submit job to worker process."""
+        self.worker.submit(self)
+
+    def cancel(self) -> None:
+        """Cancel job. Streamed messages are kept as its messages."""
+        if not self.finished:
+            self.worker.cancel(self)
+
+    def done(self) -> bool:
+        """Return if job is finished."""
+        if not self.finished:
+            self.worker.poll()
+        return self.finished
+
+    def get_messages(self) -> list[LintMessage]:
+        """Return messages from worker."""
+        return self.messages
+
+    def get_new_messages(self) -> list[LintMessage]:
+        """Return streamed messages not returned by a previous call."""
+        if not self.finished:
+            self.worker.poll()
+        messages = [message for batch in self.batches for message in batch]
+        self.batches.clear()
+        return messages
+
+
+def get_worker_command(memory_limit: int = 0, cpu_limit: int = 0) -> list[str]:
+    """Return command to start a worker process.
+
+    memory_limit is in MiB and cpu_limit in seconds, 0 means no limit.
+    The worker sets them on itself, see worker.set_limits.
+    """
+    command = [sys.executable, "-m", "lintcheck.worker"]
+    if memory_limit > 0:
+        command.append(f"--memory-limit={memory_limit}")
+    if cpu_limit > 0:
+        command.append(f"--cpu-limit={cpu_limit}")
+    return command
+
+
+class SubprocessLintJob:
+    """Run pylint in a new worker process of its own.
+
+    Nothing pylint does stays in this process, and the process can be
+    given memory and CPU time limits, so a runaway check only kills
+    its own process. Slower than WorkerLintJob, as astroid starts with
+    empty caches every time.
+
+    Has the same interface as `LintJob`.
+    """
+
+    __slots__ = (
+        "args",
+        "batches",
+        "cancelled",
+        "command",
+        "costs",
+        "exception",
+        "messages",
+        "process",
+        "reader",
+        "received",
+        "stream",
+    )
+
+    def __init__(
+        self,
+        args: list[str],
+        stream: bool = False,
+        memory_limit: int = 0,
+        cpu_limit: int = 0,
+        costs: RunCosts | None = None,
+    ) -> None:
+        """Initialize job with pylint arguments and limits.
+
+        If costs is given, the time the process spent in each checker
+        is added to it.
+        """
+        self.args = args
+        self.stream = stream
+        self.costs = costs
+        self.command = get_worker_command(memory_limit, cpu_limit)
+        self.exception: BaseException | None = None
+        self.cancelled = False
+        self.process: subprocess.Popen[str] | None = None
+        self.reader: threading.Thread | None = None
+        self.messages: list[LintMessage] = []
+        # Every streamed message, kept if the job is cancelled
+        self.received: list[LintMessage] = []
+        self.batches: queue.SimpleQueue[list[LintMessage]] = (
+            queue.SimpleQueue()
+        )
+
+    def __repr__(self) -> str:
+        """Return representation of self."""
+        return f"{self.__class__.__name__}({self.args!r})"
+
+    def start(self) -> None:
+        """Start worker process and send it the request."""
+        if self.process is not None:
+            raise RuntimeError("Job already started")
+        self.process = subprocess.Popen(  # noqa: S603
+            self.command,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            text=True,
+            encoding="utf-8",
+        )
+        assert self.process.stdin is not None
+        request = {
+            "args": self.args,
+            "cwd": os.getcwd(),
+            "stream": self.stream,
+            "costs": self.costs is not None,
+        }
+        try:
+            self.process.stdin.write(json.dumps(request) + "\n")
+            # Worker exits once it has answered
+            self.process.stdin.close()
+        except OSError:
+            # Process died already, reader reports how
+            pass
+        self.reader = threading.Thread(
+            target=self.read_responses,
+            name="lintcheck-subprocess-reader",
+            daemon=True,
+        )
+        self.reader.start()
+
+    def read_responses(self) -> None:
+        """Read responses until the process exits, target of reader thread."""
+        process = self.process
+        assert process is not None
+        assert process.stdout is not None
+        finished = False
+        for line in process.stdout:
+            response = json.loads(line)
+            partial = response.get("partial")
+            if isinstance(partial, list):
+                batch = messages_from_json(partial)
+                self.received.extend(batch)
+                self.batches.put(batch)
+                continue
+            finished = True
+            self.messages = messages_from_json(response["messages"])
+            if self.costs is not None:
+                self.costs.update_from_json(response.get("costs"))
+            error = response.get("error")
+            if isinstance(error, str):
+                self.exception = LintError(error)
+        returncode = process.wait()
+        if self.cancelled:
+            self.messages = self.received
+            self.exception = LintCancelled()
+        elif not finished:
+            # Killed, for example by going over the CPU time limit
+            self.messages = self.received
+            self.exception = LintError(
+                f"Lint process exited with status {returncode}",
+            )
+
+    def run(self) -> None:
+        """Run in a new process and wait for the result."""
+        self.start()
+        assert self.reader is not None
+        self.reader.join()
+
+    def cancel(self) -> None:
+        """Kill process. Streamed messages are kept as its messages."""
+        if self.process is None or self.done():
+            return
+        self.cancelled = True
+        self.process.kill()
+
+    def done(self) -> bool:
+        """Return if job is finished."""
+        return self.reader is None or not self.reader.is_alive()
+
+    def get_messages(self) -> list[LintMessage]:
+        """Return messages from process."""
+        return self.messages
+
+    def get_new_messages(self) -> list[LintMessage]:
+        """Return streamed messages not returned by a previous call."""
+        messages: list[LintMessage] = []
+        while True:
+            try:
+                messages.extend(self.batches.get_nowait())
+            except queue.Empty:
+                return messages
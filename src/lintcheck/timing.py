@@ -0,0 +1,118 @@
+"""Lint Check Timing - Wall and CPU time of each phase of a lint check."""
+
+# Programmed by CoolCat467
+
+from __future__ import annotations
+
+# Lint Check Timing - Wall and CPU time of each phase of a lint check.
+# Copyright (C) 2025  CoolCat467
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+__title__ = "timing"
+__author__ = "CoolCat467"
+__license__ = "GNU General Public License Version 3"
+
+from contextlib import contextmanager
+from time import perf_counter, process_time
+from typing import TYPE_CHECKING, NamedTuple
+
+if TYPE_CHECKING:
+    from collections.abc import Generator
+
+
+class Phase(NamedTuple):
+    """Seconds spent in a phase."""
+
+    wall: float
+    cpu: float
+
+
+class PhaseTimer:
+    """Record wall and CPU time of named phases and some counts.
+
+    Timing a phase more than once adds up the times, so phases that
+    happen once per streamed batch are totals. A disabled timer does
+    nothing, so code can always time phases without checking first.
+
+    CPU time is this process only, pylint run by a worker process is
+    not included.
+    """
+
+    __slots__ = ("counts", "enabled", "phases", "started")
+
+    def __init__(self, enabled: bool = True) -> None:
+        """Initialize timer."""
+        self.enabled = enabled
+        # Phases in the order they first started
+        self.phases: dict[str, Phase] = {}
+        self.counts: dict[str, int] = {}
+        # Start times of running phases
+        self.started: dict[str, Phase] = {}
+
+    def __repr__(self) -> str:
+        """Return representation of self."""
+        return f"{self.__class__.__name__}({self.phases!r})"
+
+    def begin(self, name: str) -> None:
+        """Start timing phase."""
+        if not self.enabled:
+            return
+        self.phases.setdefault(name, Phase(0.0, 0.0))
+        self.started[name] = Phase(perf_counter(), process_time())
+
+    def end(self, name: str) -> None:
+        """Stop timing phase. Does nothing if phase was not started."""
+        start = self.started.pop(name, None)
+        if start is None:
+            return
+        wall, cpu = self.phases[name]
+        self.phases[name] = Phase(
+            wall + perf_counter() - start.wall,
+            cpu + process_time() - start.cpu,
+        )
+
+    @contextmanager
+    def phase(self, name: str) -> Generator[None, None, None]:
+        """Time phase for duration of with block."""
+        self.begin(name)
+        try:
+            yield
+        finally:
+            self.end(name)
+
+    def count(self, name: str, value: int) -> None:
+        """Add value to count."""
+        if self.enabled:
+            self.counts[name] = self.counts.get(name, 0) + value
+
+    def total(self) -> float:
+        """Return wall seconds of all phases."""
+        return sum(phase.wall for phase in self.phases.values())
+
+    def format_log(self) -> str:
+        """Return timings and counts as one line of key=value fields."""
+        fields = [f"total={self.total():.4f}"]
+        for name, (wall, cpu) in self.phases.items():
+            fields.append(f"{name}_wall={wall:.4f}")
+            fields.append(f"{name}_cpu={cpu:.4f}")
+        fields.extend(f"{name}={value}" for name, value in self.counts.items())
+        return " ".join(fields)
+
+    def format_status(self) -> str:
+        """Return short summary of wall times for the status bar."""
+        phases = " ".join(
+            f"{name} {phase.wall:.2f}s" for name, phase in self.phases.items()
+        )
+        return f"Lint {self.total():.2f}s ({phases})"
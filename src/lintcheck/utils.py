@@ -24,21 +24,34 @@ __title__ = "extension-utils"
 __author__ = "CoolCat467"
 __license__ = "GNU General Public License Version 3"
 
+import atexit
 import importlib
+import os
 import sys
+import threading
 import time
+import tokenize
 import traceback
+from bisect import bisect_left, bisect_right, insort
 from contextlib import contextmanager
 from functools import wraps
-from idlelib import search, searchengine
 from idlelib.config import idleConf
+from idlelib.delegator import Delegator
 from os.path import abspath
 from pathlib import Path
-from tkinter import TclError, Text, Tk, messagebox
-from typing import TYPE_CHECKING, ClassVar, Literal, NamedTuple, TypeVar
+from tkinter import TclError, Text, messagebox
+from typing import (
+    TYPE_CHECKING,
+    ClassVar,
+    Literal,
+    NamedTuple,
+    Protocol,
+    TypeVar,
+)
 
 if TYPE_CHECKING:
     from collections.abc import Callable, Generator, Iterable, Sequence
+    from idlelib import searchengine
     from idlelib.editor import EditorWindow
     from idlelib.format import FormatRegion
     from idlelib.iomenu import IOBinding
@@ -52,8 +65,22 @@ if TYPE_CHECKING:
 T = TypeVar("T")
 
 LOGS_PATH = Path(idleConf.userdir) / "logs"
+CACHE_PATH = Path(idleConf.userdir) / "cache"
 TITLE: str = __title__
 
+# When removing comments, if there is a run of comment lines at least
+# every this many lines, replace the whole range in one edit instead.
+REBUILD_RUN_DENSITY = 8
+
+# Log file is rotated when it would grow past this many bytes
+LOG_MAX_BYTES = 1024 * 1024
+# Number of rotated log files kept, as name.log.1 to name.log.N
+LOG_BACKUP_COUNT = 3
+# Seconds logged lines can wait in the buffer before being written
+LOG_FLUSH_INTERVAL = 2.0
+# Buffered characters that make the log be written right away
+LOG_BUFFER_SIZE = 64 * 1024
+
 
 def set_title(title: str) -> None:
     """Set program title."""
@@ -256,6 +283,64 @@ def get_line_indent_handle_tabs(text: str) -> tuple[bool, int]:
     return uses_tabs, indent
 
 
+def get_comment_runs(
+    lines: Iterable[str],
+    prefix: str,
+) -> list[tuple[int, int]]:
+    """Return (index, length) of each run of adjacent comment lines.
+
+    Comment lines are lines that start with prefix after indentation.
+    """
+    runs: list[tuple[int, int]] = []
+    run_start: int | None = None
+    index = -1
+    for index, line_text in enumerate(lines):
+        if line_text.lstrip().startswith(prefix):
+            if run_start is None:
+                run_start = index
+        elif run_start is not None:
+            runs.append((run_start, index - run_start))
+            run_start = None
+    if run_start is not None:
+        runs.append((run_start, index + 1 - run_start))
+    return runs
+
+
+def get_config_stamp() -> tuple[tuple[str, int, int], ...]:
+    """Return path, modification time, and size of IDLE's config files.
+
+    Changes whenever any default or user configuration file does.
+    """
+    stamp: list[tuple[str, int, int]] = []
+    for configs in (idleConf.defaultCfg, idleConf.userCfg):
+        for config_type in sorted(configs):
+            file = configs[config_type].file
+            try:
+                stat = os.stat(file)
+            except OSError:
+                stamp.append((file, -1, -1))
+            else:
+                stamp.append((file, stat.st_mtime_ns, stat.st_size))
+    return tuple(stamp)
+
+
+def read_source_lines(file: str) -> tuple[list[str], str, str]:
+    """Return lines of source file, its encoding, and its newline.
+
+    Lines keep their endings. Encoding is found the same way Python
+    does. Newline is the ending of the first line, or a line feed.
+    """
+    with open(file, "rb") as fp:
+        encoding, _ = tokenize.detect_encoding(fp.readline)
+    with open(file, encoding=encoding, newline="") as fp:
+        raw_lines = fp.readlines()
+    newline = "\n"
+    if raw_lines:
+        first = raw_lines[0]
+        newline = first[len(first.rstrip("\r\n")) :] or newline
+    return raw_lines, encoding, newline
+
+
 def ensure_section_exists(section: str) -> bool:
     """Ensure section exists in user extensions configuration.
 
@@ -365,23 +450,153 @@ def temporary_overwrite(
             setattr(object_, attribute, original)
 
 
+class LogWriter:
+    """Buffered log file writer with size based rotation.
+
+    Lines are kept in memory and written when LOG_BUFFER_SIZE is
+    reached, LOG_FLUSH_INTERVAL seconds after the first unwritten line,
+    on flush, and at exit. Safe to use from several threads.
+    """
+
+    __slots__ = (
+        "backup_count",
+        "buffer",
+        "buffer_size",
+        "buffered",
+        "flush_interval",
+        "lock",
+        "max_bytes",
+        "path",
+        "stamp",
+        "stamp_second",
+        "timer",
+    )
+
+    def __init__(
+        self,
+        path: Path,
+        max_bytes: int = LOG_MAX_BYTES,
+        backup_count: int = LOG_BACKUP_COUNT,
+        flush_interval: float = LOG_FLUSH_INTERVAL,
+        buffer_size: int = LOG_BUFFER_SIZE,
+    ) -> None:
+        """Initialize writer for path."""
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.flush_interval = flush_interval
+        self.buffer_size = buffer_size
+
+        self.buffer: list[str] = []
+        self.buffered = 0
+        self.lock = threading.Lock()
+        self.timer: threading.Timer | None = None
+        # Formatted time, only redone when the second changes
+        self.stamp = ""
+        self.stamp_second = -1
+
+    def __repr__(self) -> str:
+        """Return representation of self."""
+        return f"{self.__class__.__name__}({self.path!r})"
+
+    def get_stamp(self) -> str:
+        """Return time prefix for log lines."""
+        second = int(time.time())
+        if second != self.stamp_second:
+            self.stamp_second = second
+            self.stamp = time.strftime("[%Y-%m-%d %H:%M:%S] ")
+        return self.stamp
+
+    def write(self, content: str) -> None:
+        """Add content to log, each line prefixed with the time."""
+        stamp = self.get_stamp()
+        chars = "".join(
+            f"{stamp}{line}" for line in content.splitlines(keepends=True)
+        )
+        if not chars.endswith("\n"):
+            chars += "\n"
+        with self.lock:
+            self.buffer.append(chars)
+            self.buffered += len(chars)
+            if self.buffered < self.buffer_size:
+                if self.timer is None:
+                    self.timer = threading.Timer(
+                        self.flush_interval,
+                        self.flush,
+                    )
+                    self.timer.daemon = True
+                    self.timer.start()
+                return
+        self.flush()
+
+    def flush(self) -> None:
+        """Write buffered lines to log file."""
+        with self.lock:
+            if self.timer is not None:
+                self.timer.cancel()
+                self.timer = None
+            if not self.buffer:
+                return
+            data = "".join(self.buffer).encode("utf-8")
+            self.buffer.clear()
+            self.buffered = 0
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            try:
+                size = self.path.stat().st_size
+            except FileNotFoundError:
+                size = 0
+            if size and size + len(data) > self.max_bytes:
+                self.rotate()
+            with self.path.open("ab") as fp:
+                fp.write(data)
+
+    def rotate(self) -> None:
+        """Move log file to name.log.1, shifting older files up one."""
+        name = self.path.name
+        if self.backup_count <= 0:
+            self.path.unlink()
+            return
+        for number in range(self.backup_count - 1, 0, -1):
+            source = self.path.with_name(f"{name}.{number}")
+            if source.exists():
+                os.replace(source, self.path.with_name(f"{name}.{number + 1}"))
+        os.replace(self.path, self.path.with_name(f"{name}.1"))
+
+
+LOG_WRITER: LogWriter | None = None
+
+
+def get_log_writer() -> LogWriter:
+    """Return log writer for the extension log file."""
+    global LOG_WRITER
+    path = LOGS_PATH / f"{TITLE}.log"
+    if LOG_WRITER is None or LOG_WRITER.path != path:
+        if LOG_WRITER is not None:
+            LOG_WRITER.flush()
+        LOG_WRITER = LogWriter(path)
+    return LOG_WRITER
+
+
+@atexit.register
+def flush_log() -> None:
+    """Write anything still buffered to the extension log file."""
+    if LOG_WRITER is not None:
+        LOG_WRITER.flush()
+
+
 def extension_log(content: str) -> None:
-    """Log content to extension log file."""
-    if not LOGS_PATH.exists():
-        LOGS_PATH.mkdir(exist_ok=True)
-    log_file = LOGS_PATH / f"{TITLE}.log"
-    with log_file.open("a", encoding="utf-8") as fp:
-        format_time = time.strftime("[%Y-%m-%d %H:%M:%S] ")
-        for line in content.splitlines(keepends=True):
-            fp.write(f"{format_time}{line}")
-        if not line.endswith("\n"):
-            fp.write("\n")
+    """Log content to extension log file.
+
+    Writes are buffered, see LogWriter.
+    """
+    get_log_writer().write(content)
 
 
 def extension_log_exception(exc: BaseException, print_: bool = True) -> None:
-    """Log exception to extension log."""
+    """Log exception to extension log, writing it out right away."""
     exception_text = "".join(traceback.format_exception(exc))
     extension_log(exception_text)
+    flush_log()
     if print_:
         print(exception_text, file=sys.stderr)
 
@@ -416,6 +631,33 @@ def log_exceptions_catch(function: Callable[PS, T]) -> Callable[PS, T | None]:
     return wrapper
 
 
+class ChangeDelegator(Delegator):
+    """Call changed_callback after every insert and delete.
+
+    Same idea as idlelib.sidebar.EndLineDelegator.
+    """
+
+    def __init__(self, changed_callback: Callable[[], object]) -> None:
+        """Initialize with callback."""
+        super().__init__()
+        self.changed_callback = changed_callback
+
+    def insert(
+        self,
+        index: str,
+        chars: str,
+        tags: str | tuple[str, ...] | None = None,
+    ) -> None:
+        """Insert chars at index and call changed callback."""
+        self.delegate.insert(index, chars, tags)  # type: ignore[attr-defined]
+        self.changed_callback()
+
+    def delete(self, index1: str, index2: str | None = None) -> None:
+        """Delete text from index1 to index2 and call changed callback."""
+        self.delegate.delete(index1, index2)  # type: ignore[attr-defined]
+        self.changed_callback()
+
+
 class Comment(NamedTuple):
     """Represents one comment."""
 
@@ -448,6 +690,215 @@ def int_default(text: str, default: int = 0) -> int:
         return default
 
 
+class TextBuffer(Protocol):
+    """Text the comment engine can edit.
+
+    tkinter.Text is one. LineBuffer is one that does not need Tk.
+    Indexes used are `{line}.{col}`, `end`, and `end-1c`.
+    """
+
+    def get(self, index1: str, index2: str | None = None) -> str:
+        """Return text between indexes, or one character at index1."""
+
+    def insert(self, index: str, chars: str, *args: tuple[str, ...]) -> None:
+        """Insert chars at index."""
+
+    def delete(self, index1: str, index2: str | None = None) -> None:
+        """Delete text between indexes, or one character at index1."""
+
+    def index(self, index: str) -> str:
+        """Return index normalized to `{line}.{col}`."""
+
+    def tag_names(self) -> tuple[str, ...]:
+        """Return names of all tags."""
+
+    def tag_ranges(self, tag_name: str, /) -> tuple[object, ...]:
+        """Return start and end index of each range of tag, flattened."""
+
+    def tag_add(self, tag_name: str, index1: str, /, *args: str) -> None:
+        """Add tag to ranges from index1 to args[0], then args[1:3] etc."""
+
+    def mark_names(self) -> tuple[str, ...]:
+        """Return names of all marks."""
+
+    def mark_set(self, mark_name: str, index: str, /) -> None:
+        """Move mark to index."""
+
+
+class LineBuffer:
+    """Text buffer backed by a list of lines, for use without Tk.
+
+    Behaves like tkinter.Text for the indexes TextBuffer uses. Like Tk,
+    there is always a final newline that cannot be deleted and is not
+    part of `get_chars`. It has no tags or marks.
+    """
+
+    __slots__ = ("lines",)
+
+    def __init__(self, chars: str = "") -> None:
+        """Initialize buffer containing chars."""
+        self.lines = chars.split("\n")
+
+    def __repr__(self) -> str:
+        """Return representation of self."""
+        return f"{self.__class__.__name__}({self.get_chars()!r})"
+
+    def get_chars(self) -> str:
+        """Return all text without Tk's final newline."""
+        return "\n".join(self.lines)
+
+    def resolve(self, index: str) -> tuple[int, int]:
+        """Return (line, col) of index.
+
+        Line past the end means after the final newline.
+        """
+        if index == "end":
+            return len(self.lines) + 1, 0
+        if index == "end-1c":
+            return len(self.lines), len(self.lines[-1])
+        line_text, col_text = index.split(".", 1)
+        line = int(line_text)
+        if line < 1:
+            return 1, 0
+        if line > len(self.lines):
+            return len(self.lines) + 1, 0
+        if col_text == "end":
+            return line, len(self.lines[line - 1])
+        return line, min(int(col_text), len(self.lines[line - 1]))
+
+    def clamp(self, position: tuple[int, int]) -> tuple[int, int]:
+        """Return position moved before the final newline if after it."""
+        if position[0] > len(self.lines):
+            return len(self.lines), len(self.lines[-1])
+        return position
+
+    def index(self, index: str) -> str:
+        """Return index normalized to `{line}.{col}`."""
+        line, col = self.resolve(index)
+        return f"{line}.{col}"
+
+    def get(self, index1: str, index2: str | None = None) -> str:
+        """Return text between indexes, or one character at index1."""
+        first = self.resolve(index1)
+        if index2 is None:
+            last = (first[0], first[1] + 1)
+            if first[0] <= len(self.lines) and first[1] == len(
+                self.lines[first[0] - 1],
+            ):
+                last = (first[0] + 1, 0)
+        else:
+            last = self.resolve(index2)
+        final_newline = last[0] > len(self.lines)
+        first = self.clamp(first)
+        last = self.clamp(last)
+        if last <= first:
+            return "\n" if final_newline and first == last else ""
+        if first[0] == last[0]:
+            chars = self.lines[first[0] - 1][first[1] : last[1]]
+        else:
+            chars = "\n".join(
+                [
+                    self.lines[first[0] - 1][first[1] :],
+                    *self.lines[first[0] : last[0] - 1],
+                    self.lines[last[0] - 1][: last[1]],
+                ],
+            )
+        if final_newline:
+            chars += "\n"
+        return chars
+
+    def insert(self, index: str, chars: str, *args: tuple[str, ...]) -> None:
+        """Insert chars at index. Tags are ignored."""
+        line, col = self.clamp(self.resolve(index))
+        current = self.lines[line - 1]
+        self.lines[line - 1 : line] = (
+            current[:col] + chars + current[col:]
+        ).split("\n")
+
+    def delete(self, index1: str, index2: str | None = None) -> None:
+        """Delete text between indexes, or one character at index1."""
+        first = self.clamp(self.resolve(index1))
+        if index2 is None:
+            last = (first[0], first[1] + 1)
+            if first[1] == len(self.lines[first[0] - 1]):
+                last = (first[0] + 1, 0)
+        else:
+            last = self.resolve(index2)
+        last = self.clamp(last)
+        if last <= first:
+            return
+        head = self.lines[first[0] - 1][: first[1]]
+        tail = self.lines[last[0] - 1][last[1] :]
+        self.lines[first[0] - 1 : last[0]] = [head + tail]
+
+    def tag_names(self) -> tuple[str, ...]:
+        """Return names of all tags. There are none."""
+        return ()
+
+    def tag_ranges(self, tag_name: str) -> tuple[object, ...]:
+        """Return ranges of tag. There are none."""
+        return ()
+
+    def tag_add(self, tag_name: str, index1: str, *args: str) -> None:
+        """Do nothing, tags are not kept."""
+
+    def mark_names(self) -> tuple[str, ...]:
+        """Return names of all marks. There are none."""
+        return ()
+
+    def mark_set(self, mark_name: str, index: str) -> None:
+        """Do nothing, marks are not kept."""
+
+
+class CommentIndex:
+    """Index of extension comment lines in a file.
+
+    Maps line numbers to the set of comment contents on that line, and
+    each content to the sorted line numbers it is on, so checking if a
+    comment is within a range of lines is a binary search.
+    """
+
+    __slots__ = ("by_content", "by_line")
+
+    def __init__(self) -> None:
+        """Initialize empty index."""
+        self.by_line: dict[int, set[str]] = {}
+        self.by_content: dict[str, list[int]] = {}
+
+    def __repr__(self) -> str:
+        """Return representation of self."""
+        return f"<{self.__class__.__name__} {len(self.by_line)} lines>"
+
+    @classmethod
+    def from_lines(cls, lines: Iterable[str], prefix: str) -> Self:
+        """Return index of comments starting with prefix in lines.
+
+        Line numbers start at one, like Tk.
+        """
+        index = cls()
+        for line, line_text in enumerate(lines, 1):
+            stripped = line_text.lstrip()
+            if stripped.startswith(prefix):
+                index.add(line, stripped[len(prefix) :])
+        return index
+
+    def add(self, line: int, content: str) -> None:
+        """Record content being on line."""
+        contents = self.by_line.setdefault(line, set())
+        if content in contents:
+            return
+        contents.add(content)
+        insort(self.by_content.setdefault(content, []), line)
+
+    def exists(self, content: str, first: int, last: int) -> bool:
+        """Return if content is on any line from first to last inclusive."""
+        lines = self.by_content.get(content)
+        if not lines:
+            return False
+        position = bisect_left(lines, first)
+        return position < len(lines) and lines[position] <= last
+
+
 class FilePosition(NamedTuple):
     """File Position."""
 
@@ -531,6 +982,8 @@ class BaseExtension:
     """Base extension class."""
 
     __slots__ = (
+        "change_watcher",
+        "comment_lines",
         "comment_prefix",
         "editwin",
         "files",
@@ -555,6 +1008,14 @@ class BaseExtension:
     # Default key binds for configuration file
     bind_defaults: ClassVar[dict[str, str | None]] = {}
 
+    # Config files stamp from last reload, see get_config_stamp
+    config_stamp: ClassVar[tuple[tuple[str, int, int], ...] | None] = None
+
+    # Defaults changed by each configuration version, version to
+    # {key: (old default, new default)}, see migrate_config. The
+    # current version is the "config_version" value in values.
+    config_migrations: ClassVar[dict[int, dict[str, tuple[str, str]]]] = {}
+
     def __init__(
         self,
         editwin: PyShellEditorWindow,
@@ -573,12 +1034,26 @@ class BaseExtension:
             comment_prefix = f"{self.__class__.__name__}"
         self.comment_prefix = f"# {comment_prefix}: "
 
+        # Sorted line numbers of our comments, None if out of date
+        self.comment_lines: list[int] | None = None
+        # After undo delegator so undo and redo are seen too
+        self.change_watcher = ChangeDelegator(self.invalidate_comment_lines)
+        if hasattr(editwin.per, "insertfilterafter"):
+            editwin.per.insertfilterafter(self.change_watcher, after=self.undo)
+        else:  # pragma: no cover
+            # Python 3.9
+            editwin.per.insertfilter(self.change_watcher)
+
         self.bind_non_keyboard(self.bind_defaults)
 
     def __repr__(self) -> str:
         """Return representation of self."""
         return f"{self.__class__.__name__}({self.editwin!r})"
 
+    def close(self) -> None:
+        """Extension cleanup before IDLE window closes."""
+        self.editwin.per.removefilter(self.change_watcher)
+
     def bind_non_keyboard(self, bind_defaults: dict[str, str | None]) -> None:
         """Bind non-keyboard triggered events.
 
@@ -683,7 +1158,7 @@ class BaseExtension:
 
         Return True if need to save.
         """
-        need_save = False
+        need_save = cls.migrate_config()
         if ensure_section_exists(cls.__name__):
             need_save = True
         if ensure_values_exist_in_section(cls.__name__, cls.values):
@@ -691,8 +1166,58 @@ class BaseExtension:
         return need_save
 
     @classmethod
-    def reload(cls) -> None:
-        """Load class variables from configuration."""
+    def migrate_config(cls) -> bool:
+        """Update defaults in configuration of older versions.
+
+        Values still set to a default that config_migrations says
+        changed since the configuration's version get the new default.
+        One set by hand to the old default can not be told apart, so it
+        changes too. Configuration without config_version is version 0.
+        New configuration is left for ensure_config_exists to write.
+
+        Return True if need to save.
+        """
+        section = cls.__name__
+        latest = cls.values.get("config_version")
+        if latest is None or section not in idleConf.GetSectionList(
+            "user",
+            "extensions",
+        ):
+            return False
+        current = idleConf.GetOption(
+            "extensions",
+            section,
+            "config_version",
+            warn_on_default=False,
+        )
+        version = int_default(str(current or "0"))
+        if version >= int(latest):
+            return False
+        for migration, changes in sorted(cls.config_migrations.items()):
+            if migration <= version:
+                continue
+            for key, (old, new) in changes.items():
+                value = idleConf.GetOption(
+                    "extensions",
+                    section,
+                    key,
+                    warn_on_default=False,
+                )
+                if value == old:
+                    idleConf.SetOption("extensions", section, key, new)
+        idleConf.SetOption("extensions", section, "config_version", latest)
+        return True
+
+    @classmethod
+    def reload(cls, force: bool = False) -> None:
+        """Load class variables from configuration.
+
+        Does nothing if no configuration file changed since last time,
+        unless force is True.
+        """
+        if not force and cls.config_stamp == get_config_stamp():
+            return
+
         # Ensure file default values exist so they appear in settings menu
         save = cls.ensure_config_exists()
         if cls.ensure_bindings_exist() or save:
@@ -700,6 +1225,8 @@ class BaseExtension:
 
         # Reload configuration file
         idleConf.LoadCfgFiles()
+        # After saving, so our own save does not count as a change
+        cls.config_stamp = get_config_stamp()
 
         # For all possible configuration values
         for key, default in cls.values.items():
@@ -713,6 +1240,14 @@ class BaseExtension:
                 )
                 setattr(cls, key, value)
 
+    def set_status(self, text: str = "") -> None:
+        """Set status bar label for this extension. Empty text clears it."""
+        self.editwin.status_bar.set_label(
+            self.__class__.__name__,
+            text,
+            side="right",
+        )
+
     def get_tabwidth_indent_spaces(self) -> str:
         """Return tabwidth indent as spaces."""
         return " " * self.editwin.get_tk_tabwidth()
@@ -720,7 +1255,7 @@ class BaseExtension:
     def get_line(
         self,
         line: int,
-        text_win: Text | None = None,
+        text_win: TextBuffer | None = None,
     ) -> str:
         """Get the characters from the given line in currently open file."""
         if text_win is None:
@@ -731,7 +1266,7 @@ class BaseExtension:
     def get_line_replace_tabs(
         self,
         line: int,
-        text_win: Text | None = None,
+        text_win: TextBuffer | None = None,
     ) -> tuple[bool, str]:
         """Return if line uses tabs and line using spaces."""
         chars = self.get_line(line, text_win)
@@ -763,7 +1298,7 @@ class BaseExtension:
         self,
         line: int,
         comment: str,
-        text_win: Text | None = None,
+        text_win: TextBuffer | None = None,
     ) -> bool:
         """Return True if comment for message already exists on line."""
         return self.get_comment_line(0, comment) in self.get_line(
@@ -790,14 +1325,9 @@ class BaseExtension:
         line = comment.line
         msg = comment.contents
 
-        editwin: EditorWindow = self.editwin
-
-        open_file: str | None = self.files.filename
-        if open_file is None or abspath(open_file) != file:
-            opened = self.flist.open(file)
-            if opened is None:
-                return False
-            editwin = opened
+        editwin = self.get_editwin_for_file(file)
+        if editwin is None:
+            return False
 
         # If there is already a comment from us there, ignore that line.
         # +1-1 is so at least up by 1 is checked, range(0) = []
@@ -822,7 +1352,12 @@ class BaseExtension:
         editwin.text.insert(start, chars, ())
         return True
 
-    def get_pointers(self, comments: list[Comment]) -> Comment | None:
+    def get_pointers(
+        self,
+        comments: list[Comment],
+        next_line_text: str | None = None,
+        ranges: bool = False,
+    ) -> Comment | None:
         """Return comment pointing to multiple comments all on the same line.
 
         If none of the comment pointers are going to be visible
@@ -831,6 +1366,12 @@ class BaseExtension:
         Does not handle comments that span multiple lines, assumes
         comments are all comment.line
 
+        next_line_text is the text of the line after comment line, read
+        from the text widget if not given.
+
+        If ranges is True, each comment's span is drawn as `^~~~`
+        instead of all carets.
+
         Messages must all be on the same line and be in the same file,
         otherwise ValueError is raised.
         """
@@ -838,13 +1379,14 @@ class BaseExtension:
         file = comments[0].file
 
         # Figure out next line intent
-        next_line_text = self.get_line(line + 1)
+        if next_line_text is None:
+            next_line_text = self.get_line(line + 1)
         _uses_tabs, indent = get_line_indent_handle_tabs(next_line_text)
 
-        lastcol = len(self.get_comment_line(indent, ""))
-
-        columns: set[int] = set()
+        # Characters before this column are covered by the comment prefix
+        first_visible = len(self.get_comment_line(indent, ""))
 
+        spans: list[tuple[int, int]] = []
         for comment in comments:
             if comment.line != line:
                 raise ValueError(f"Comment `{comment}` not on line `{line}`")
@@ -854,21 +1396,186 @@ class BaseExtension:
                 end = comment.column
             else:
                 end = comment.column_end
-            for col in range(comment.column, end + 1):
-                columns.add(col)
-
-        new_line = ""
-        for col in sorted(columns):
-            spaces = (col - lastcol) - 1
-            if spaces < 0:
+            if end < comment.column:
                 continue
-            new_line += " " * spaces + "^"
-            lastcol = col
+            # Column is drawn one character before its index
+            spans.append((comment.column - 1, end - 1))
+        spans.sort()
+
+        # Merge overlapping and touching spans, remembering where each
+        # span starts so ranges can mark them.
+        merged: list[tuple[int, int, list[int]]] = []
+        for start, end in spans:
+            if merged and start <= merged[-1][1] + 1:
+                last_start, last_end, starts = merged[-1]
+                if starts[-1] != start:
+                    starts.append(start)
+                merged[-1] = (last_start, max(last_end, end), starts)
+            else:
+                merged.append((start, end, [start]))
 
-        if not new_line.strip():
+        parts: list[str] = []
+        position = first_visible
+        for start, end, starts in merged:
+            if end < position:
+                continue
+            if start > position:
+                parts.append(" " * (start - position))
+            if not ranges:
+                parts.append("^" * (end + 1 - max(start, position)))
+            else:
+                # Caret at each span start, tildes up to the next one
+                bounds = [*starts[1:], end + 1]
+                for span_start, span_end in zip(starts, bounds):
+                    if span_end <= position:
+                        continue
+                    if span_start >= position:
+                        parts.append("^" + "~" * (span_end - span_start - 1))
+                    else:
+                        parts.append("~" * (span_end - position))
+            position = end + 1
+
+        if not parts:
             return None
 
-        return Comment(file=file, line=line + 1, contents=new_line)
+        return Comment(file=file, line=line + 1, contents="".join(parts))
+
+    def get_open_editwin(self, file: str) -> EditorWindow | None:
+        """Return editor window for file if it is open, otherwise None."""
+        open_file: str | None = self.files.filename
+        if open_file is not None and abspath(open_file) == file:
+            return self.editwin
+        editwin: EditorWindow | None = self.flist.dict.get(
+            os.path.normcase(file),
+        )
+        return editwin
+
+    def get_editwin_for_file(self, file: str) -> EditorWindow | None:
+        """Return editor window for file, opening a new one if needed."""
+        editwin = self.get_open_editwin(file)
+        if editwin is not None:
+            return editwin
+        opened: EditorWindow | None = self.flist.open(file)
+        return opened
+
+    def get_file_lines(self, file: str) -> list[str]:
+        """Return lines of file without opening a window for it.
+
+        Reads from the editor window if file is open, otherwise from
+        disk. Return empty list if file cannot be read.
+        """
+        editwin = self.get_open_editwin(file)
+        if editwin is not None:
+            return editwin.text.get("1.0", "end-1c").split("\n")
+        try:
+            raw_lines, _encoding, _newline = read_source_lines(file)
+        except (OSError, SyntaxError, UnicodeError):
+            return []
+        return [line.rstrip("\r\n") for line in raw_lines]
+
+    def get_comment_block(
+        self,
+        line_text: str,
+        contents: Iterable[str],
+    ) -> str:
+        """Return comment lines to go above line_text, matching its indent."""
+        uses_tabs = line_text.startswith("\t")
+        if uses_tabs:
+            line_text = line_text.replace(
+                "\t",
+                self.get_tabwidth_indent_spaces(),
+            )
+        indent = get_line_indent(line_text)
+        block = "".join(
+            f"{self.get_comment_line(indent, content)}\n"
+            for content in contents
+        )
+        if uses_tabs:
+            return self.reinstate_char_tabs(block)
+        return block
+
+    def plan_comments(
+        self,
+        lines: Sequence[str],
+        comments: Sequence[Comment],
+        max_exist_up: int = 0,
+    ) -> tuple[dict[int, list[str]], list[int]]:
+        """Return comment contents to insert above each line and added lines.
+
+        lines are the current lines of the file. A comment is skipped if
+        the same comment is already within max_exist_up lines above its
+        line, or was already planned for the same line. Existing comments
+        are indexed once up front, so checks do not rescan lines.
+
+        Line numbers are relative to the given lines, comments past the
+        end of the file are placed above the last line.
+        """
+        insertions: dict[int, list[str]] = {}
+        added: list[int] = []
+        last_line = max(1, len(lines))
+        index = CommentIndex.from_lines(lines, self.comment_prefix)
+        for comment in reversed(comments):
+            line = min(comment.line, last_line)
+            # Planned comments count as being on their target line
+            if index.exists(comment.contents, line - max_exist_up, line):
+                continue
+            index.add(line, comment.contents)
+            insertions.setdefault(line, []).insert(0, comment.contents)
+            added.append(comment.line)
+        return insertions, added
+
+    def get_planned_comment_lines(
+        self,
+        lines: Sequence[str],
+        insertions: dict[int, list[str]],
+    ) -> list[int]:
+        """Return sorted comment line numbers after insertions are applied."""
+        comment_lines: list[int] = []
+        offset = 0
+        for line, line_text in enumerate(lines, 1):
+            inserted = len(insertions.get(line, ()))
+            comment_lines.extend(
+                range(line + offset, line + offset + inserted),
+            )
+            offset += inserted
+            if line_text.lstrip().startswith(self.comment_prefix):
+                comment_lines.append(line + offset)
+        return comment_lines
+
+    def insert_planned_comments(
+        self,
+        text: TextBuffer,
+        lines: Sequence[str],
+        insertions: dict[int, list[str]],
+    ) -> None:
+        """Insert planned comments into text with as few edits as possible.
+
+        Runs of adjacent target lines are rebuilt with one delete and
+        one insert, other targets are a single insert. Does not use an
+        undo block, please use one yourself.
+        """
+        regions: list[list[int]] = []
+        for line in sorted(insertions):
+            if regions and regions[-1][-1] == line - 1:
+                regions[-1].append(line)
+            else:
+                regions.append([line])
+
+        # Bottom up so line numbers above stay valid
+        for region in reversed(regions):
+            first = region[0]
+            last = region[-1]
+            chars: list[str] = []
+            for line in region:
+                line_text = lines[line - 1] if line <= len(lines) else ""
+                chars.append(
+                    self.get_comment_block(line_text, insertions[line]),
+                )
+                if line != last:
+                    chars.append(f"{line_text}\n")
+            if last != first:
+                text.delete(f"{first}.0", f"{last}.0")
+            text.insert(f"{first}.0", "".join(chars), ())
 
     def add_comments(
         self,
@@ -878,18 +1585,57 @@ class BaseExtension:
 
         Return dict of per file a list of lines were a comment was added.
 
-        Changes are wrapped in an undo block.
+        Each file's text is read once, the new text is worked out in
+        Python, and then applied with one edit per region of touched
+        lines, see add_comments_to_buffer. Changes are wrapped in an
+        undo block per file.
         """
         file_comments: dict[str, list[int]] = {}
 
-        with undo_block(self.undo):
-            total = len(comments)
-            for comment in reversed(comments):
-                if self.add_comment(comment, total):
-                    file_comments.setdefault(comment.file, [])
-                    file_comments[comment.file].append(comment.line)
+        by_file: dict[str, list[Comment]] = {}
+        for comment in comments:
+            by_file.setdefault(comment.file, []).append(comment)
+
+        total = len(comments)
+        for file, target_comments in by_file.items():
+            editwin = self.get_editwin_for_file(file)
+            if editwin is None:
+                continue
+            with undo_block(editwin.undo):
+                added, comment_lines = self.add_comments_to_buffer(
+                    editwin.text,
+                    target_comments,
+                    total,
+                )
+            if not added:
+                continue
+            if editwin is self.editwin:
+                self.comment_lines = comment_lines
+            file_comments[file] = added
         return file_comments
 
+    def add_comments_to_buffer(
+        self,
+        text: TextBuffer,
+        comments: Sequence[Comment],
+        max_exist_up: int = 0,
+    ) -> tuple[list[int], list[int]]:
+        """Add comments to text, ignoring comments that already exist.
+
+        Comment files are not checked, all are added to text. Works
+        with any TextBuffer, so can be used without Tk.
+
+        Return lines a comment was added for and sorted line numbers of
+        all extension comments in text afterwards. Does not use an undo
+        block, please use one yourself.
+        """
+        lines = text.get("1.0", "end-1c").split("\n")
+        insertions, added = self.plan_comments(lines, comments, max_exist_up)
+        if not added:
+            return [], []
+        self.insert_planned_comments(text, lines, insertions)
+        return added, self.get_planned_comment_lines(lines, insertions)
+
     def add_comment_block(
         self,
         file: str,
@@ -916,25 +1662,118 @@ class BaseExtension:
         )
         return file_comments.get(file, [])
 
+    def remove_extension_comment_lines(
+        self,
+        text: TextBuffer,
+        start: str,
+        end: str,
+    ) -> bool:
+        """Remove extension comment lines between start and end indexes.
+
+        start must be at the start of a line. Each run of adjacent
+        comment lines is deleted with one call, or if runs are dense the
+        lines from the first run to the last are replaced at once. Return
+        if removed any comments.
+
+        Does not use an undo block, please use one yourself.
+        """
+        chars = text.get(start, end)
+        lines = chars.split("\n")
+        runs = get_comment_runs(lines, self.comment_prefix)
+        if not runs:
+            return False
+
+        first_line = get_line_col(start)[0]
+        if len(runs) > 1 and len(runs) * REBUILD_RUN_DENSITY >= len(lines):
+            first_index = runs[0][0]
+            last_index, last_length = runs[-1]
+            self.rebuild_without_comment_lines(
+                text,
+                *get_line_selection(
+                    first_line + first_index,
+                    last_index + last_length - first_index,
+                ),
+            )
+            return True
+
+        # Bottom up so line numbers above stay valid
+        for index, length in reversed(runs):
+            text.delete(*get_line_selection(first_line + index, length))
+        return True
+
+    def rebuild_without_comment_lines(
+        self,
+        text: TextBuffer,
+        start: str,
+        end: str,
+    ) -> None:
+        """Replace lines from start to end with the ones that are not comments.
+
+        Deleting and inserting drops tags and marks, like breakpoints and
+        the insert cursor, so the ones between start and end are put back
+        on the lines they were on. Ones on comment lines go to the start
+        of the next line.
+        """
+        start = text.index(start)
+        end = text.index(end)
+        start_position = get_line_col(start)
+        end_position = get_line_col(end)
+        first_line = start_position[0]
+
+        kept: list[str] = []
+        # Line relative to start to (new relative line, if line was kept)
+        moved: list[tuple[int, bool]] = []
+        for line_text in text.get(start, end).split("\n"):
+            is_comment = line_text.lstrip().startswith(self.comment_prefix)
+            moved.append((len(kept), not is_comment))
+            if not is_comment:
+                kept.append(line_text)
+
+        def move(position: tuple[int, int]) -> str:
+            """Return index position will be at after rebuilding."""
+            line, col = position
+            new_line, was_kept = moved[line - first_line]
+            return f"{first_line + new_line}.{col if was_kept else 0}"
+
+        tags: list[tuple[str, list[str]]] = []
+        for tag in text.tag_names():
+            ranges = [str(index) for index in text.tag_ranges(tag)]
+            indexes: list[str] = []
+            for first, last in zip(ranges[::2], ranges[1::2]):
+                # Only the part in the span, the rest is not edited
+                first_position = max(get_line_col(first), start_position)
+                last_position = min(get_line_col(last), end_position)
+                if first_position >= last_position:
+                    continue
+                new_first = move(first_position)
+                new_last = move(last_position)
+                if get_line_col(new_first) < get_line_col(new_last):
+                    indexes.extend((new_first, new_last))
+            if indexes:
+                tags.append((tag, indexes))
+        marks: list[tuple[str, str]] = []
+        for mark in text.mark_names():
+            position = get_line_col(text.index(mark))
+            if start_position <= position <= end_position:
+                marks.append((mark, move(position)))
+
+        text.delete(start, end)
+        text.insert(start, "\n".join(kept), ())
+        for tag, indexes in tags:
+            text.tag_add(tag, *indexes)
+        for mark, index in marks:
+            text.mark_set(mark, index)
+
     def remove_selected_extension_comments(self) -> bool:
         """Remove selected extension comments. Return if removed any comments.
 
         Changes are wrapped in an undo block.
         """
-        # Get selected region lines
-        head, _tail, _chars, lines = self.formatter.get_region()
-        region_start, _col = get_line_col(head)
+        # Get selected region
+        head, tail, _chars, _lines = self.formatter.get_region()
 
-        edited = False
         with undo_block(self.undo):
-            for index, line_text in reversed(tuple(enumerate(lines))):
-                # If after indent there is mypy comment
-                if line_text.lstrip().startswith(self.comment_prefix):
-                    # If so, remove line
-                    self.text.delete(
-                        *get_line_selection(index + region_start),
-                    )
-                    edited = True
+            edited = self.remove_extension_comment_lines(self.text, head, tail)
         if not edited:
             # Make bell sound so user knows this ran even though
             # nothing happened.
@@ -946,51 +1785,93 @@ class BaseExtension:
 
         Changes are wrapped in an undo block.
         """
-        eof_idx = self.text.index("end")
-        chars = self.text.get("0.0", eof_idx)
-
-        lines = chars.splitlines()
-
-        edited = False
         with undo_block(self.undo):
-            for index, line_text in reversed(tuple(enumerate(lines))):
-                # If after indent there is mypy comment
-                if line_text.lstrip().startswith(self.comment_prefix):
-                    # If so, remove line
-                    self.text.delete(*get_line_selection(index))
-                    edited = True
+            edited = self.remove_extension_comment_lines(
+                self.text,
+                "1.0",
+                "end-1c",
+            )
+        self.comment_lines = []
         if not edited:
             # Make bell sound so user knows this ran even though
             # nothing happened.
             self.text.bell()
         return "break"
 
+    def invalidate_comment_lines(self) -> None:
+        """Mark comment line index as out of date."""
+        self.comment_lines = None
+
+    def get_extension_comment_lines(self) -> list[int]:
+        """Return sorted line numbers of extension comments in this file.
+
+        Rebuilt only if the text changed since last time.
+        """
+        if self.comment_lines is None:
+            lines = self.text.get("1.0", "end-1c").split("\n")
+            self.comment_lines = [
+                line
+                for line, line_text in enumerate(lines, 1)
+                if line_text.lstrip().startswith(self.comment_prefix)
+            ]
+        return self.comment_lines
+
+    def show_extension_comment(self, line: int, back: bool = False) -> None:
+        """Select comment prefix on line and bring it into view.
+
+        Insert mark is moved to end of selection, or start if back.
+        """
+        line_text = self.get_line(line).rstrip("\n")
+        indent = len(line_text) - len(line_text.lstrip())
+        first = f"{line}.0"
+        last = f"{line}.{indent + len(self.comment_prefix)}"
+        self.text.tag_remove("sel", "1.0", "end")
+        highlight_region(self.text, "sel", first, last)
+        set_insert_and_move(self.text, first if back else last)
+
     def find_next_extension_comment(self, search_wrap: bool = True) -> bool:
-        """Find next extension comment by hacking the search dialog engine.
+        """Find next extension comment after the insert mark.
 
         Return True if the search was successful and False otherwise.
         """
-        root: Tk = self.editwin.root
-
-        # Get search engine singleton from root
-        engine: searchengine.SearchEngine = searchengine.get(root)
-
-        # With search engine parameter restore block
-        with search_engine_block(engine):
-            # Set search pattern to comment starter
-            set_search_engine_params(
-                engine,
-                {
-                    "pat": f"^\\s*{self.comment_prefix}",
-                    "re": True,
-                    "case": True,
-                    "word": False,
-                    "wrap": search_wrap,
-                    "back": False,
-                },
-            )
+        comment_lines = self.get_extension_comment_lines()
+        current_line = get_line_col(self.text.index("insert"))[0]
+        position = bisect_right(comment_lines, current_line)
+        if position == len(comment_lines):
+            if not search_wrap or not comment_lines:
+                self.text.bell()
+                return False
+            position = 0
+        self.show_extension_comment(comment_lines[position])
+        return True
+
+    def find_previous_extension_comment(
+        self,
+        search_wrap: bool = True,
+    ) -> bool:
+        """Find previous extension comment before the insert mark.
+
+        Return True if the search was successful and False otherwise.
+        """
+        comment_lines = self.get_extension_comment_lines()
+        current_line = get_line_col(self.text.index("insert"))[0]
+        position = bisect_left(comment_lines, current_line) - 1
+        if position < 0:
+            if not search_wrap or not comment_lines:
+                self.text.bell()
+                return False
+            position = len(comment_lines) - 1
+        self.show_extension_comment(comment_lines[position], back=True)
+        return True
 
-            # Find current pattern
-            found = search.find_again(self.text)
-            assert isinstance(found, bool)
-            return found
+    def goto_extension_comment(self, number: int) -> bool:
+        """Go to extension comment number (starting at one) in file.
+
+        Return True if comment exists and False otherwise.
+        """
+        comment_lines = self.get_extension_comment_lines()
+        if not 1 <= number <= len(comment_lines):
+            self.text.bell()
+            return False
+        self.show_extension_comment(comment_lines[number - 1])
+        return True
@@ -0,0 +1,166 @@
+"""Lint Check Worker - Long lived pylint process."""
+
+# Programmed by CoolCat467
+
+from __future__ import annotations
+
+# Lint Check Worker - Long lived pylint process.
+# Copyright (C) 2025  CoolCat467
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+__title__ = "worker"
+__author__ = "CoolCat467"
+__license__ = "GNU General Public License Version 3"
+
+# Protocol is one JSON object per line.
+# Requests on stdin:   {"args": [...], "cwd": "...", "stream": bool,
+#                       "cache_memory_limit": MiB, "costs": bool}
+# Responses on stdout: {"messages": [...], "error": null | "traceback",
+#                       "costs": null | RunCosts.to_json()}
+# If stream is true, {"partial": [...]} lines with batches of messages
+# are sent before the response while pylint is running.
+# Messages are arrays of LintMessage fields.
+# The process exits when stdin is closed.
+# Options --memory-limit=MiB and --cpu-limit=seconds limit the process.
+
+import argparse
+import json
+import os
+import sys
+import traceback
+from typing import TYPE_CHECKING
+
+from pylint.lint import Run as run_pylint  # noqa: N813
+
+from lintcheck.astroid_cache import CachePolicy
+from lintcheck.checker_costs import RunCosts
+from lintcheck.instrument import run_pylint_measured
+from lintcheck.runner import Reporter, get_pylint_jobs
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from typing import TextIO
+
+
+def handle_request(
+    request: dict[str, object],
+    policy: CachePolicy,
+    send: Callable[[dict[str, object]], object] | None = None,
+) -> dict[str, object]:
+    """Run pylint for request and return response.
+
+    If request asks for streaming, partial responses are given to send.
+    If it asks for costs, time spent in each checker is measured.
+    """
+    cwd = request.get("cwd")
+    if isinstance(cwd, str):
+        os.chdir(cwd)
+    args = request["args"]
+    assert isinstance(args, list)
+
+    limit = request.get("cache_memory_limit")
+    policy.memory_limit = limit if isinstance(limit, int) else 0
+    policy.before_run()
+
+    reporter = Reporter()
+    # Parallel pylint jobs pickle the reporter, callback and all
+    if (
+        request.get("stream")
+        and send is not None
+        and get_pylint_jobs(args) == 1
+    ):
+        reporter.batch_callback = lambda batch: send({"partial": batch})
+    costs = RunCosts() if request.get("costs") else None
+    error: str | None = None
+    try:
+        if costs is None:
+            run_pylint(
+                args,
+                reporter=reporter,  # type: ignore[arg-type]
+                exit=False,
+            )
+        else:
+            run_pylint_measured(
+                args,
+                reporter,  # type: ignore[arg-type]
+                costs,
+            )
+    except (Exception, SystemExit) as exc:
+        error = "".join(traceback.format_exception(exc))
+
+    if error is None:
+        policy.after_run()
+    else:
+        policy.abort_run()
+    return {
+        "messages": reporter.get_messages(),
+        "error": error,
+        "costs": None if costs is None else costs.to_json(),
+    }
+
+
+def serve(
+    requests: TextIO,
+    responses: TextIO,
+    policy: CachePolicy | None = None,
+) -> None:
+    """Handle requests until requests stream is closed."""
+    if policy is None:
+        policy = CachePolicy()
+
+    def send(response: dict[str, object]) -> None:
+        responses.write(json.dumps(response) + "\n")
+        responses.flush()
+
+    for line in requests:
+        if not line.strip():
+            continue
+        send(handle_request(json.loads(line), policy, send))
+
+
+def set_limits(memory_limit: int, cpu_limit: int) -> None:
+    """Limit address space of this process in MiB and CPU time in seconds.
+
+    0 means no limit. Going over the memory limit raises MemoryError,
+    going over the CPU limit kills the process. Not supported on
+    Windows, where limits are ignored.
+    """
+    if sys.platform != "win32":
+        # pylint: disable=import-outside-toplevel
+        import resource
+
+        if memory_limit > 0:
+            limit = memory_limit * 1024 * 1024
+            resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+        if cpu_limit > 0:
+            resource.setrlimit(resource.RLIMIT_CPU, (cpu_limit, cpu_limit))
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Run worker on standard input and output."""
+    parser = argparse.ArgumentParser(prog="lintcheck.worker")
+    parser.add_argument("--memory-limit", type=int, default=0)
+    parser.add_argument("--cpu-limit", type=int, default=0)
+    options = parser.parse_args(argv)
+    set_limits(options.memory_limit, options.cpu_limit)
+
+    responses = sys.stdout
+    # Anything pylint prints must not end up in the response stream
+    sys.stdout = sys.stderr
+    serve(sys.stdin, responses)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,317 @@
+"""Fake IDLE objects for testing without a display."""
+
+from __future__ import annotations
+
+from collections import Counter
+from typing import TYPE_CHECKING, Any
+
+from lintcheck.utils import LineBuffer, get_line_col
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+
+class FakeText(LineBuffer):
+    """LineBuffer with the other parts of tkinter.Text we use.
+
+    Counts calls and supports mark name indexes. Marks and tags move
+    when text is edited like they do in Tk, except inserted text is
+    never tagged.
+    """
+
+    __slots__ = ("bindings", "calls", "filters", "idle", "marks", "tags")
+
+    def __init__(self, chars: str = "") -> None:
+        super().__init__(chars)
+        self.calls: Counter[str] = Counter()
+        self.marks = {"insert": "1.0"}
+        self.tags: dict[str, list[tuple[str, str]]] = {}
+        # Delegators installed by FakePercolator
+        self.filters: list[Any] = []
+        self.idle: dict[str, tuple[Any, tuple[Any, ...]]] = {}
+        self.bindings: dict[str, Any] = {}
+
+    def resolve(self, index: str) -> tuple[int, int]:
+        """Return (line, col) for index, including marks."""
+        if index in self.marks:
+            index = self.marks[index]
+        return super().resolve(index)
+
+    def get(self, index1: str, index2: str | None = None) -> str:
+        """Return text between indexes."""
+        self.calls["get"] += 1
+        return super().get(index1, index2)
+
+    def insert(self, index: str, chars: str, *args: tuple[str, ...]) -> None:
+        """Insert chars at index."""
+        self.calls["insert"] += 1
+        line, col = self.clamp(self.resolve(index))
+        super().insert(index, chars, *args)
+        added = chars.count("\n")
+        last_col = len(chars.rsplit("\n", 1)[-1])
+        if not added:
+            last_col += col
+
+        def move(position: tuple[int, int]) -> tuple[int, int]:
+            if position < (line, col):
+                return position
+            if position[0] == line:
+                return line + added, last_col + position[1] - col
+            return position[0] + added, position[1]
+
+        self.move_marks_and_tags(move, (line, col))
+        self.changed()
+
+    def delete(self, index1: str, index2: str | None = None) -> None:
+        """Delete text between indexes."""
+        self.calls["delete"] += 1
+        first = self.clamp(self.resolve(index1))
+        if index2 is None:
+            last = (first[0], first[1] + 1)
+            if first[1] == len(self.lines[first[0] - 1]):
+                last = (first[0] + 1, 0)
+        else:
+            last = self.resolve(index2)
+        last = self.clamp(last)
+        super().delete(index1, index2)
+
+        def move(position: tuple[int, int]) -> tuple[int, int]:
+            if position <= first:
+                return position
+            if position <= last:
+                return first
+            if position[0] == last[0]:
+                return first[0], first[1] + position[1] - last[1]
+            return position[0] - last[0] + first[0], position[1]
+
+        if first < last:
+            self.move_marks_and_tags(move, None)
+        self.changed()
+
+    def move_marks_and_tags(
+        self,
+        move: Callable[[tuple[int, int]], tuple[int, int]],
+        inserted_at: tuple[int, int] | None,
+    ) -> None:
+        """Move marks and tag ranges to where move says.
+
+        Tags ending where text was inserted do not grow to include it.
+        Ranges that become empty are removed.
+        """
+
+        def move_index(index: str, *, is_end: bool = False) -> str:
+            position = get_line_col(index)
+            if is_end and position == inserted_at:
+                return index
+            line, col = move(position)
+            return f"{line}.{col}"
+
+        for name, index in self.marks.items():
+            self.marks[name] = move_index(index)
+        for name, ranges in self.tags.items():
+            moved = []
+            for first, last in ranges:
+                new_first = move_index(first)
+                new_last = move_index(last, is_end=True)
+                empty = get_line_col(new_first) >= get_line_col(new_last)
+                if first == last or not empty:
+                    moved.append((new_first, new_last))
+            self.tags[name] = moved
+
+    def changed(self) -> None:
+        """Tell installed change delegators text changed."""
+        for filter_ in self.filters:
+            filter_.changed_callback()
+
+    def bell(self) -> None:
+        """Count bells."""
+        self.calls["bell"] += 1
+
+    def mark_set(self, name: str, index: str) -> None:
+        """Set mark to index."""
+        self.marks[name] = self.index(index)
+
+    def mark_names(self) -> tuple[str, ...]:
+        """Return names of marks."""
+        return tuple(self.marks)
+
+    def tag_add(self, name: str, index1: str, *args: str) -> None:
+        """Add tag to ranges from index1 to args[0], then args[1:3] etc."""
+        indexes = [index1, *args]
+        if len(indexes) == 1:
+            indexes.append(index1)
+        ranges = self.tags.setdefault(name, [])
+        for first, last in zip(indexes[::2], indexes[1::2]):
+            ranges.append((self.index(first), self.index(last)))
+
+    def tag_names(self) -> tuple[str, ...]:
+        """Return names of tags."""
+        return tuple(self.tags)
+
+    def tag_ranges(self, name: str) -> tuple[str, ...]:
+        """Return start and end index of each range of tag, flattened."""
+        return tuple(
+            index for indexes in self.tags.get(name, ()) for index in indexes
+        )
+
+    def tag_remove(self, name: str, first: str, last: str) -> None:
+        """Remove tag, only whole text ranges are supported."""
+        assert (first, last) == ("1.0", "end")
+        self.tags.pop(name, None)
+
+    def see(self, index: str) -> None:
+        """Count see calls."""
+        self.calls["see"] += 1
+
+    def bind(self, sequence: str, func: Any) -> None:
+        """Remember event binding."""
+        self.bindings[sequence] = func
+
+    def update_idletasks(self) -> None:
+        """Do nothing."""
+
+    def after_idle(self, func: Any, *args: Any) -> str:
+        """Remember callback, run them with run_idle."""
+        self.calls["after"] += 1
+        identifier = f"after#{self.calls['after']}"
+        self.idle[identifier] = (func, args)
+        return identifier
+
+    def after(self, _ms: int, func: Any, *args: Any) -> str:
+        """Remember callback, time is ignored, run them with run_idle."""
+        return self.after_idle(func, *args)
+
+    def after_cancel(self, identifier: str) -> None:
+        """Forget callback."""
+        self.idle.pop(identifier, None)
+
+    def run_idle(self) -> None:
+        """Run remembered idle callbacks."""
+        idle, self.idle = self.idle, {}
+        for func, args in idle.values():
+            func(*args)
+
+
+class FakeUndo:
+    """Count undo blocks."""
+
+    def __init__(self) -> None:
+        self.depth = 0
+        self.blocks = 0
+
+    def undo_block_start(self) -> None:
+        """Start undo block."""
+        self.depth += 1
+
+    def undo_block_stop(self) -> None:
+        """Stop undo block."""
+        self.depth -= 1
+        if self.depth == 0:
+            self.blocks += 1
+
+
+class FakeFormatRegion:
+    """Stand in for idlelib.format.FormatRegion with a line selection."""
+
+    def __init__(self, text: FakeText) -> None:
+        self.text = text
+        self.selection = (1, 1)
+
+    def get_region(self) -> tuple[str, str, str, list[str]]:
+        """Return head, tail, chars, and lines of selected lines."""
+        first, last = self.selection
+        head = f"{first}.0"
+        tail = f"{last + 1}.0"
+        chars = self.text.get(head, tail)
+        return head, tail, chars, chars.split("\n")
+
+
+class FakePercolator:
+    """Stand in for idlelib.percolator.Percolator.
+
+    Filters are not really chained, FakeText calls their
+    changed_callback after every edit.
+    """
+
+    def __init__(self, text: FakeText) -> None:
+        self.text = text
+
+    def insertfilterafter(self, filter_: Any, after: Any) -> None:
+        """Install filter."""
+        self.text.filters.append(filter_)
+
+    def removefilter(self, filter_: Any) -> None:
+        """Remove filter."""
+        self.text.filters.remove(filter_)
+
+
+class FakeStatusBar:
+    """Stand in for idlelib.statusbar.MultiStatusBar."""
+
+    def __init__(self) -> None:
+        self.labels: dict[str, str] = {}
+
+    def set_label(self, name: str, text: str = "", side: str = "left") -> None:
+        """Set label text."""
+        self.labels[name] = text
+
+
+class FakeIO:
+    """Stand in for idlelib.iomenu.IOBinding."""
+
+    def __init__(self, filename: str | None) -> None:
+        self.filename = filename
+        self.saved = True
+
+    def get_saved(self) -> bool:
+        """Return if file is saved."""
+        return self.saved
+
+    def save(self, _event: object) -> None:
+        """Pretend to save file."""
+        self.saved = True
+
+
+class FakeFileList:
+    """Stand in for idlelib.pyshell.PyShellFileList."""
+
+    def __init__(self) -> None:
+        self.dict: dict[str, FakeEditorWindow] = {}
+        self.inversedict: dict[FakeEditorWindow, str | None] = {}
+
+    def add(self, editwin: FakeEditorWindow) -> None:
+        """Register editor window as open."""
+        key = editwin.io.filename
+        if key is not None:
+            self.dict[key] = editwin
+        self.inversedict[editwin] = key
+        editwin.flist = self
+
+    def open(self, filename: str) -> FakeEditorWindow | None:
+        """Return window for filename if open, no new windows are made."""
+        return self.dict.get(filename)
+
+
+class FakeEditorWindow:
+    """Stand in for idlelib.pyshell.PyShellEditorWindow."""
+
+    def __init__(self, filename: str | None, chars: str = "") -> None:
+        self.text = FakeText(chars)
+        self.undo = FakeUndo()
+        self.fregion = FakeFormatRegion(self.text)
+        self.per = FakePercolator(self.text)
+        self.io = FakeIO(filename)
+        self.status_bar = FakeStatusBar()
+        self.flist: FakeFileList | None = None
+
+    def getlineno(self, mark: str = "insert") -> int:
+        """Return line number of mark."""
+        return self.text.resolve(mark)[0]
+
+    def get_tk_tabwidth(self) -> int:
+        """Return tab width."""
+        return 4
+
+    def ispythonsource(self, filename: str) -> bool:
+        """Return if filename is a Python file."""
+        return filename.endswith(".py")
@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import os
+from typing import TYPE_CHECKING
+
+import pylint
+from astroid import MANAGER
+
+from lintcheck import astroid_cache
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    import pytest
+
+
+def test_get_module_kind(tmp_path: Path) -> None:
+    assert astroid_cache.get_module_kind(None) == "stdlib"
+    assert astroid_cache.get_module_kind(os.__file__) == "stdlib"
+    assert astroid_cache.get_module_kind(pylint.__file__) == "third-party"
+    assert astroid_cache.get_module_kind(str(tmp_path / "x.py")) == "user"
+
+
+def cache_module(
+    tmp_path: Path,
+    name: str,
+    source: str = "value = 1\n",
+) -> Path:
+    path = tmp_path / f"{name}.py"
+    path.write_text(source, encoding="utf-8")
+    MANAGER.astroid_cache.pop(name, None)
+    MANAGER.ast_from_file(str(path), name)
+    assert name in MANAGER.astroid_cache
+    return path
+
+
+def test_evict_changed(tmp_path: Path) -> None:
+    policy = astroid_cache.CachePolicy()
+    path = cache_module(tmp_path, "lintcheck_waffle")
+    policy.record()
+    assert policy.before_run() == []
+    assert "lintcheck_waffle" in MANAGER.astroid_cache
+
+    mtime = path.stat().st_mtime
+    os.utime(path, (mtime + 10, mtime + 10))
+    assert "lintcheck_waffle" in policy.before_run()
+    assert "lintcheck_waffle" not in MANAGER.astroid_cache
+    assert "lintcheck_waffle" not in policy.mtimes
+
+
+def touch(path: Path) -> None:
+    mtime = path.stat().st_mtime
+    os.utime(path, (mtime + 10, mtime + 10))
+
+
+def test_evict_changed_keeps_unrelated(tmp_path: Path) -> None:
+    policy = astroid_cache.CachePolicy()
+    helper = cache_module(tmp_path, "lintcheck_helper")
+    cache_module(tmp_path, "lintcheck_user", "import lintcheck_helper\n")
+    cache_module(
+        tmp_path,
+        "lintcheck_indirect",
+        "from lintcheck_user import lintcheck_helper\n",
+    )
+    cache_module(tmp_path, "lintcheck_other", "import os\n")
+    policy.record()
+
+    touch(helper)
+    evicted = policy.before_run()
+    assert evicted == [
+        "lintcheck_helper",
+        "lintcheck_indirect",
+        "lintcheck_user",
+    ]
+    assert "lintcheck_other" in MANAGER.astroid_cache
+    assert "lintcheck_other" in policy.mtimes
+    assert "lintcheck_user" not in policy.imports
+
+
+def test_get_imported_names(tmp_path: Path) -> None:
+    cache_module(
+        tmp_path,
+        "lintcheck_imports",
+        "import os.path\nfrom . import sibling\n"
+        "def func():\n    from xml.dom import minidom\n",
+    )
+    module = MANAGER.astroid_cache["lintcheck_imports"]
+    assert astroid_cache.get_imported_names(module) == {
+        "os",
+        "os.path",
+        "sibling",
+        "xml",
+        "xml.dom",
+        "xml.dom.minidom",
+    }
+
+
+def test_enforce_memory_limit(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    policy = astroid_cache.CachePolicy(memory_limit=100)
+    cache_module(tmp_path, "lintcheck_pancake")
+    MANAGER.ast_from_module_name("os")
+    usage = [50 * 1024 * 1024, 200 * 1024 * 1024]
+    monkeypatch.setattr(astroid_cache, "get_memory_usage", usage.pop)
+
+    # Over after the run, back under after removing user modules
+    evicted = policy.after_run()
+    assert "lintcheck_pancake" in evicted
+    assert "lintcheck_pancake" not in MANAGER.astroid_cache
+    assert "os" in MANAGER.astroid_cache
+    assert "lintcheck_pancake" not in policy.mtimes
+
+
+def test_abort_run(tmp_path: Path) -> None:
+    policy = astroid_cache.CachePolicy()
+    cache_module(tmp_path, "lintcheck_kept")
+    policy.before_run()
+    cache_module(tmp_path, "lintcheck_partial")
+    assert policy.abort_run() == ["lintcheck_partial"]
+    assert "lintcheck_partial" not in MANAGER.astroid_cache
+    assert "lintcheck_kept" in MANAGER.astroid_cache
+    policy.record()
+    assert "lintcheck_partial" not in policy.mtimes
+
+
+def test_no_memory_limit() -> None:
+    policy = astroid_cache.CachePolicy()
+    assert not policy.is_over_limit()
+    assert policy.enforce_memory_limit() == []
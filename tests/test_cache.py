@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from lintcheck import cache
+from lintcheck.message import LintMessage
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def make_messages(count: int) -> list[LintMessage]:
+    return [
+        LintMessage(
+            "/waffle.py",
+            line,
+            0,
+            None,
+            None,
+            "W0611",
+            "unused-import",
+            "Unused import os",
+        )
+        for line in range(count)
+    ]
+
+
+def test_cache_key_changes_with_contents(tmp_path: Path) -> None:
+    file = tmp_path / "waffle.py"
+    file.write_text("import os\n", encoding="utf-8")
+    key = cache.get_cache_key(str(file), ["--jobs=1"])
+    assert key is not None
+    assert key == cache.get_cache_key(str(file), ["--jobs=1"])
+    assert key != cache.get_cache_key(str(file), ["--jobs=2"])
+    file.write_text("import sys\n", encoding="utf-8")
+    assert key != cache.get_cache_key(str(file), ["--jobs=1"])
+
+
+def test_cache_key_missing_file(tmp_path: Path) -> None:
+    assert cache.get_cache_key(str(tmp_path / "missing.py"), []) is None
+
+
+def test_result_cache_hit_and_miss() -> None:
+    result_cache = cache.ResultCache()
+    messages = make_messages(3)
+    assert result_cache.get("waffle") is None
+    result_cache.put("waffle", messages)
+    assert result_cache.get("waffle") is messages
+    assert "waffle" in result_cache
+    assert result_cache.size == cache.get_messages_size(messages)
+
+
+def test_result_cache_evicts_least_recently_used() -> None:
+    result_cache = cache.ResultCache(max_entries=2)
+    result_cache.put("a", make_messages(1))
+    result_cache.put("b", make_messages(1))
+    assert result_cache.get("a") is not None
+    result_cache.put("c", make_messages(1))
+    assert "a" in result_cache
+    assert "b" not in result_cache
+    assert "c" in result_cache
+    assert len(result_cache) == 2
+
+
+def test_result_cache_evicts_by_size() -> None:
+    size = cache.get_messages_size(make_messages(10))
+    result_cache = cache.ResultCache(max_size=size * 2)
+    result_cache.put("a", make_messages(10))
+    result_cache.put("b", make_messages(10))
+    result_cache.put("c", make_messages(10))
+    assert "a" not in result_cache
+    assert result_cache.size <= size * 2
+    result_cache.put("huge", make_messages(100))
+    assert "huge" not in result_cache
+
+
+def test_result_cache_clear() -> None:
+    result_cache = cache.ResultCache()
+    result_cache.put("a", make_messages(5))
+    result_cache.clear()
+    assert len(result_cache) == 0
+    assert result_cache.size == 0
+
+
+def test_disk_cache_round_trip(tmp_path: Path) -> None:
+    disk_cache = cache.DiskCache(tmp_path / "cache" / "lint.sqlite3")
+    try:
+        messages = make_messages(3)
+        assert disk_cache.get("content:config") is None
+        disk_cache.put("content:config", messages)
+        assert disk_cache.get("content:config") == messages
+        assert disk_cache.get("content:other") is None
+    finally:
+        disk_cache.close()
+
+
+def test_disk_cache_shared_between_connections(tmp_path: Path) -> None:
+    path = tmp_path / "lint.sqlite3"
+    first = cache.DiskCache(path)
+    second = cache.DiskCache(path)
+    try:
+        first.put("a:b", make_messages(2))
+        assert second.get("a:b") == make_messages(2)
+        second.put("c:d", make_messages(1))
+        assert first.get("c:d") == make_messages(1)
+    finally:
+        first.close()
+        second.close()
+
+
+def test_disk_cache_collects_garbage(tmp_path: Path) -> None:
+    disk_cache = cache.DiskCache(tmp_path / "lint.sqlite3")
+    try:
+        disk_cache.put("a:a", make_messages(10))
+        size = disk_cache.get_size()
+        disk_cache.max_size = size * 2
+        disk_cache.put("b:b", make_messages(10))
+        assert disk_cache.get("a:a") is not None
+        disk_cache.put("c:c", make_messages(10))
+        # b is least recently used
+        assert disk_cache.get("b:b") is None
+        assert disk_cache.get("a:a") is not None
+        assert disk_cache.get_size() <= size * 2
+    finally:
+        disk_cache.close()
@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from lintcheck.checker_costs import (
+    CostTable,
+    CostTotals,
+    RunCosts,
+    format_report,
+)
+from lintcheck.instrument import run_pylint_measured
+from lintcheck.message import LintMessage
+from lintcheck.runner import Reporter
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def make_message(symbol: str) -> LintMessage:
+    return LintMessage("/waffle.py", 1, 0, None, None, "W0000", symbol, "")
+
+
+def make_costs() -> RunCosts:
+    costs = RunCosts()
+    costs.total = 2.0
+    costs.add("similarities", "", 0.1)
+    costs.add("similarities", "duplicate-code", 0.6)
+    costs.add("typecheck", "no-member", 0.5)
+    costs.add("typecheck", "no-member", 0.25)
+    costs.add("format", "", 0.01)
+    return costs
+
+
+def test_run_costs_json() -> None:
+    costs = make_costs()
+    assert costs.seconds[("typecheck", "no-member")] == 0.75
+    copy = RunCosts()
+    copy.update_from_json(costs.to_json())
+    assert copy.seconds == costs.seconds
+    assert copy.total == costs.total
+    copy.update_from_json(None)
+    assert copy.total == costs.total
+
+
+def test_cost_table(tmp_path: Path) -> None:
+    table = CostTable(tmp_path / "costs.sqlite3")
+    assert table.get_totals() == CostTotals(0, 0.0, {}, {})
+    messages = [make_message("no-member"), make_message("no-member")]
+    table.record(make_costs(), messages)
+    table.record(make_costs(), [make_message("unused-import")])
+    table.close()
+
+    totals = CostTable(tmp_path / "costs.sqlite3").get_totals()
+    assert totals.runs == 2
+    assert totals.seconds == 4.0
+    assert totals.checkers[("typecheck", "no-member")] == 1.5
+    assert totals.messages == {"no-member": 2, "unused-import": 1}
+
+    table.clear()
+    assert table.get_totals().runs == 0
+
+
+def test_format_report() -> None:
+    costs = make_costs()
+    totals = CostTotals(
+        2,
+        costs.total * 2,
+        {key: seconds * 2 for key, seconds in costs.seconds.items()},
+        {"no-member": 3},
+    )
+    report = format_report(totals)
+    assert report.startswith("Checker costs over 2 pylint runs, 2.000s")
+    ignore, checkers = report.split("\nBiggest savings")[1:]
+    lines = ignore.splitlines()[1:]
+    assert lines[0].split() == ["no-member", "0.750s", "found", "3", "times"]
+    assert lines[1].split() == [
+        "duplicate-code",
+        "0.600s",
+        "found",
+        "0",
+        "times",
+    ]
+    # Under SUGGEST_MIN_SHARE of a run
+    assert "format" not in checkers
+    assert checkers.splitlines()[1].split() == ["typecheck", "0.750s"]
+    assert checkers.splitlines()[2].split() == ["similarities", "0.700s"]
+
+    report = format_report(totals, ["duplicate-code", "TYPECHECK"])
+    ignore, checkers = report.split("\nBiggest savings")[1:]
+    assert "duplicate-code " not in ignore
+    assert "no-member" not in ignore
+    assert "typecheck" not in checkers
+
+
+def test_format_report_empty() -> None:
+    assert "No checker costs" in format_report(CostTotals(0, 0.0, {}, {}))
+
+
+def test_run_pylint_measured(tmp_path: Path) -> None:
+    module = tmp_path / "waffle.py"
+    module.write_text(
+        '"""Waffle module."""\n\nimport os\n',
+        encoding="utf-8",
+    )
+    costs = RunCosts()
+    reporter = Reporter()
+    run_pylint_measured(
+        [str(module), "--jobs=1"],
+        reporter,  # type: ignore[arg-type]
+        costs,
+    )
+    assert costs.total > 0
+    assert sum(costs.seconds.values()) < costs.total
+    checkers = {checker for checker, _symbols in costs.seconds}
+    assert {"imports", "variables", "typecheck"} <= checkers
+    assert any(
+        "unused-import" in symbols.split(",")
+        for _checker, symbols in costs.seconds
+    )
+    # Methods only needed for some messages still run
+    symbols = {message.symbol for message in reporter.get_messages()}
+    assert "unused-import" in symbols
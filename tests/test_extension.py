@@ -0,0 +1,412 @@
+from __future__ import annotations
+
+import subprocess
+import sys
+from idlelib import textview
+from typing import TYPE_CHECKING
+
+import pytest
+from fakes import FakeEditorWindow, FakeFileList
+
+from lintcheck import cache, extension, utils
+from lintcheck.checker_costs import CostTable
+from lintcheck.extension import lintcheck, parse_comments
+from lintcheck.message import LintMessage
+from lintcheck.runner import LintCancelled, LintJob
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+CODE = """\
+import os
+def waffle():
+    x = 1
+    return 2
+"""
+
+
+def message(line: int, column: int, symbol: str) -> LintMessage:
+    return LintMessage(
+        "/waffle.py",
+        line,
+        column,
+        None,
+        None,
+        "W0000",
+        symbol,
+        symbol.replace("-", " "),
+    )
+
+
+MESSAGES = [
+    message(1, 0, "unused-import"),
+    message(2, 0, "missing-docstring"),
+    message(3, 4, "unused-variable"),
+    message(3, 4, "invalid-name"),
+]
+
+
+def make_extension() -> tuple[lintcheck, FakeEditorWindow]:
+    editwin = FakeEditorWindow("/waffle.py", CODE)
+    return lintcheck(editwin), editwin  # type: ignore[arg-type]
+
+
+@pytest.fixture
+def inline_checks(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Run checks in the test's thread, with fixed configuration."""
+    monkeypatch.setattr(lintcheck, "reload", lambda *_: None)
+    monkeypatch.setattr(lintcheck, "backend", "inline")
+    monkeypatch.setattr(lintcheck, "cache", "False")
+    monkeypatch.setattr(lintcheck, "jobs", "1")
+    monkeypatch.setattr(lintcheck, "ignore", "None")
+
+
+MODULE = '"""Module."""\nimport os\n'
+
+
+def open_module(
+    tmp_path: Path,
+    name: str = "module.py",
+    chars: str = MODULE,
+) -> FakeEditorWindow:
+    path = tmp_path / name
+    path.write_text(chars, encoding="utf-8")
+    return FakeEditorWindow(str(path), chars)
+
+
+@pytest.mark.parametrize(
+    "messages",
+    [
+        MESSAGES,
+        # Far enough right for a pointer line
+        [message(3, 40, "line-too-long"), message(4, 11, "waffle")],
+        # Several messages on adjacent lines, each with a pointer
+        [
+            message(2, 4, "invalid-name"),
+            message(3, 4, "unused-variable"),
+            message(3, 8, "invalid-name"),
+            message(4, 11, "waffle"),
+        ],
+    ],
+)
+def test_streamed_batches_match_single_pass(
+    messages: list[LintMessage],
+) -> None:
+    extension, editwin = make_extension()
+    extension.lint_check_add_response_comments(messages, "/waffle.py")
+    expect = editwin.text.get_chars()
+
+    extension, editwin = make_extension()
+    extension.streamed_lines = []
+    for index in range(len(messages)):
+        extension.lint_check_add_response_comments(
+            messages[index : index + 1],
+            "/waffle.py",
+            partial=True,
+        )
+    assert "^" not in editwin.text.get_chars()
+    extension.lint_check_add_response_comments(messages, "/waffle.py")
+    assert editwin.text.get_chars() == expect
+
+
+def test_parse_comments_multiline() -> None:
+    files = parse_comments(
+        [
+            LintMessage(
+                "/waffle.py",
+                2,
+                4,
+                None,
+                None,
+                "R0000",
+                "waffle",
+                "first\nsecond\nthird",
+            ),
+        ],
+    )
+    assert [comment.contents for comment in files["/waffle.py"]] == [
+        "waffle (R0000): third",
+        "second",
+        "first",
+    ]
+    assert {comment.line for comment in files["/waffle.py"]} == {2}
+
+
+def test_import_does_not_import_pylint() -> None:
+    code = (
+        "import sys, lintcheck\n"
+        "loaded = [name for name in sys.modules"
+        " if name.partition('.')[0] in {'pylint', 'astroid'}]\n"
+        "assert not loaded, loaded\n"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)  # noqa: S603
+
+
+def test_reload_deferred_until_idle(monkeypatch: pytest.MonkeyPatch) -> None:
+    reloads: list[None] = []
+    monkeypatch.setattr(lintcheck, "reload", lambda *_: reloads.append(None))
+    _extension, editwin = make_extension()
+    assert not reloads
+    editwin.text.run_idle()
+    assert len(reloads) == 1
+
+
+def test_close_cancels_deferred_reload(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    reloads: list[None] = []
+    monkeypatch.setattr(lintcheck, "reload", lambda *_: reloads.append(None))
+    extension, editwin = make_extension()
+    extension.close()
+    editwin.text.run_idle()
+    assert not reloads
+
+
+@pytest.mark.usefixtures("inline_checks")
+def test_lint_all_open_files(tmp_path: Path) -> None:
+    flist = FakeFileList()
+    windows = []
+    for name in ("first.py", "second.py", "notes.txt"):
+        editwin = open_module(tmp_path, name)
+        flist.add(editwin)
+        windows.append(editwin)
+    extension = lintcheck(windows[0])  # type: ignore[arg-type]
+
+    extension.lint_all_open_files_event(None)  # type: ignore[arg-type]
+
+    for editwin in windows[:2]:
+        assert "# lintcheck: unused-import" in editwin.text.get_chars()
+        assert "Another file" not in editwin.text.get_chars()
+    assert "lintcheck" not in windows[2].text.get_chars()
+
+
+@pytest.mark.usefixtures("inline_checks")
+def test_lint_all_open_files_from_untitled_window(tmp_path: Path) -> None:
+    flist = FakeFileList()
+    untitled = FakeEditorWindow(None, "import sys\n")
+    flist.add(untitled)
+    editwin = open_module(tmp_path)
+    flist.add(editwin)
+    extension = lintcheck(untitled)  # type: ignore[arg-type]
+
+    extension.lint_all_open_files_event(None)  # type: ignore[arg-type]
+
+    assert "# lintcheck: unused-import" in editwin.text.get_chars()
+    assert untitled.text.get_chars() == "import sys\n"
+
+
+@pytest.mark.usefixtures("inline_checks")
+def test_lint_check_timing(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(lintcheck, "timing", "True")
+    logs: list[str] = []
+    monkeypatch.setattr(utils, "extension_log", logs.append)
+
+    editwin = open_module(tmp_path)
+    editwin.io.saved = False
+    extension = lintcheck(editwin)  # type: ignore[arg-type]
+    monkeypatch.setattr(utils, "ask_save_dialog", lambda _text: True)
+
+    extension.lint_check_event()
+
+    assert len(logs) == 1
+    fields = dict(field.split("=", 1) for field in logs[0].split()[1:])
+    for phase in ("reload", "save", "run", "parse", "insert"):
+        assert float(fields[f"{phase}_wall"]) >= 0
+        assert float(fields[f"{phase}_cpu"]) >= 0
+    assert fields["messages"] == "1"
+    assert fields["comments"] == "1"
+    status = editwin.status_bar.labels["lintcheck"]
+    assert status.startswith("Lint ")
+    # Cleared after a while
+    editwin.text.run_idle()
+    assert editwin.status_bar.labels["lintcheck"] == ""
+
+
+class StuckJob:
+    """Lint job that runs until cancelled."""
+
+    def __init__(self, messages: list[LintMessage]) -> None:
+        self.args = ["/waffle.py"]
+        self.messages = messages
+        self.exception: BaseException | None = None
+
+    def cancel(self) -> None:
+        """Stop job."""
+        self.exception = LintCancelled()
+
+    def done(self) -> bool:
+        """Return if job is finished."""
+        return self.exception is not None
+
+    def get_messages(self) -> list[LintMessage]:
+        """Return messages found so far."""
+        return self.messages
+
+    def get_new_messages(self) -> list[LintMessage]:
+        """Return no streamed messages."""
+        return []
+
+
+def test_lint_timeout_applies_partial_results(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(utils, "extension_log", lambda _content: None)
+    extension, editwin = make_extension()
+    job = StuckJob(MESSAGES[:1])
+    extension.lint_job = job  # type: ignore[assignment]
+    extension.lint_deadline = 0
+
+    # First poll times out, second sees the job stopped
+    extension.poll_lint_job("/waffle.py", None)
+    extension.poll_lint_job("/waffle.py", None)
+
+    assert extension.lint_job is None
+    assert "unused-import" in editwin.text.get_chars()
+    assert editwin.status_bar.labels["lintcheck"] == "Lint cancelled"
+
+
+def test_cancel_lint_without_partial_results(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(lintcheck, "partial_results", "False")
+    extension, editwin = make_extension()
+    job = StuckJob(MESSAGES[:1])
+    extension.lint_job = job  # type: ignore[assignment]
+
+    extension.cancel_lint_event(None)  # type: ignore[arg-type]
+    extension.poll_lint_job("/waffle.py", None)
+
+    assert extension.lint_job is None
+    assert editwin.text.get_chars() == CODE
+    assert editwin.text.calls["bell"] == 1
+
+
+@pytest.mark.usefixtures("inline_checks")
+def test_lint_job_start_failure(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(lintcheck, "backend", "thread")
+    errors: list[BaseException] = []
+    monkeypatch.setattr(utils, "extension_log_exception", errors.append)
+
+    def fail(_job: LintJob) -> None:
+        raise RuntimeError("can't start new thread")
+
+    monkeypatch.setattr(LintJob, "start", fail)
+
+    editwin = open_module(tmp_path)
+    extension = lintcheck(editwin)  # type: ignore[arg-type]
+
+    extension.lint_check_event()
+    assert extension.lint_job is None
+    assert editwin.status_bar.labels.get("lintcheck", "") == ""
+    assert len(errors) == 1
+    # Not stuck thinking a check is running
+    extension.lint_check_event()
+    assert len(errors) == 2
+
+
+def test_persistent_cache_unwritable(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(lintcheck, "persistent_cache", "True")
+    errors: list[BaseException] = []
+    monkeypatch.setattr(utils, "extension_log_exception", errors.append)
+    # Parent directory can not be made, a file is in the way
+    blocker = tmp_path / "cache"
+    blocker.write_text("", encoding="utf-8")
+    disk_cache = cache.DiskCache(blocker / "lintcheck.sqlite3")
+    monkeypatch.setattr(extension, "DISK_CACHE", disk_cache)
+    lint, _editwin = make_extension()
+
+    key = f"unwritable:{tmp_path}"
+    assert lint.get_cached_messages(key) is None
+    lint.cache_messages(key, MESSAGES)
+    assert lint.get_cached_messages(key) == MESSAGES
+    assert len(errors) == 2
+
+
+def test_get_pylint_args_auto_jobs(monkeypatch: pytest.MonkeyPatch) -> None:
+    logs: list[str] = []
+    monkeypatch.setattr(utils, "extension_log", logs.append)
+    monkeypatch.setattr(lintcheck, "jobs", "auto")
+    monkeypatch.setattr(lintcheck, "ignore", "None")
+    extension, _editwin = make_extension()
+    assert extension.get_pylint_args("/waffle.py") == [
+        "/waffle.py",
+        "--jobs=1",
+    ]
+    assert logs[0].startswith("jobs=auto chose 1 for 1 files")
+    monkeypatch.setattr(lintcheck, "jobs", "3")
+    assert extension.get_pylint_args("/waffle.py")[1] == "--jobs=3"
+
+
+@pytest.mark.usefixtures("inline_checks")
+def test_lint_check_profile(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(lintcheck, "profile", "all")
+    monkeypatch.setattr(utils, "LOGS_PATH", tmp_path / "logs")
+    monkeypatch.setattr(utils, "extension_log", lambda _content: None)
+    opened: list[str] = []
+    monkeypatch.setattr(
+        textview,
+        "view_file",
+        lambda _parent, _title, filename, *_args, **_kwargs: opened.append(
+            filename,
+        ),
+    )
+
+    editwin = open_module(tmp_path)
+    extension = lintcheck(editwin)  # type: ignore[arg-type]
+
+    extension.lint_check_event()
+    assert extension.lint_profile is None
+
+    summaries = list((tmp_path / "logs").glob("*.txt"))
+    assert len(summaries) == 1
+    summary = summaries[0].read_text(encoding="utf-8")
+    assert "run: " in summary
+    assert "comments: " in summary
+    assert summaries[0].with_suffix(".prof").exists()
+
+    extension.show_lint_profile_event(None)  # type: ignore[arg-type]
+    assert opened == [str(summaries[0])]
+
+
+@pytest.mark.usefixtures("inline_checks")
+def test_lint_check_checker_costs(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(lintcheck, "ignore", "unused-import;imports")
+    monkeypatch.setattr(lintcheck, "checker_costs", "True")
+    table = CostTable(tmp_path / "costs.sqlite3")
+    monkeypatch.setattr(extension, "COST_TABLE", table)
+    reports: list[str] = []
+    monkeypatch.setattr(
+        textview,
+        "view_text",
+        lambda _parent, _title, contents, **_kwargs: reports.append(contents),
+    )
+
+    editwin = open_module(tmp_path, chars='"""Module."""\nvalue = undefined\n')
+    lint = lintcheck(editwin)  # type: ignore[arg-type]
+
+    lint.lint_check_event()
+    lint.lint_check_event()
+    totals = table.get_totals()
+    assert totals.runs == 2
+    assert totals.messages == {"undefined-variable": 2}
+    assert not any(checker == "imports" for checker, _ in totals.checkers)
+
+    lint.show_checker_costs_event(None)  # type: ignore[arg-type]
+    assert len(reports) == 1
+    assert reports[0].startswith("Checker costs over 2 pylint runs")
+    table.close()
@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import pstats
+import tracemalloc
+from typing import TYPE_CHECKING
+
+from lintcheck.profiling import ProfileSession, get_latest_summary
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def waffle() -> list[int]:
+    return [index * 2 for index in range(10000)]
+
+
+def test_profile_session(tmp_path: Path) -> None:
+    session = ProfileSession("test check")
+    assert tracemalloc.is_tracing()
+    with session.capture("run"):
+        waffle()
+    with session.capture("comments"):
+        waffle()
+    path = session.finish(tmp_path, "lintcheck")
+    assert not tracemalloc.is_tracing()
+
+    summary = path.read_text(encoding="utf-8")
+    assert summary.startswith("Profile of test check\n")
+    assert "run: " in summary
+    assert "comments: " in summary
+    assert "waffle" in summary
+    assert "allocation sites" in summary
+    stats = pstats.Stats(str(path.with_suffix(".prof")))
+    assert any(key[2] == "waffle" for key in stats.stats)  # type: ignore[attr-defined]
+    assert get_latest_summary(tmp_path, "lintcheck") == path
+
+
+def test_profile_session_cpu_only(tmp_path: Path) -> None:
+    session = ProfileSession.from_option("cpu", "test check")
+    assert session is not None
+    assert not tracemalloc.is_tracing()
+    path = session.finish(tmp_path, "lintcheck")
+    assert "allocation sites" not in path.read_text(encoding="utf-8")
+
+
+def test_profile_session_off() -> None:
+    assert ProfileSession.from_option("off", "test check") is None
+
+
+def test_get_latest_summary_none(tmp_path: Path) -> None:
+    assert get_latest_summary(tmp_path, "lintcheck") is None
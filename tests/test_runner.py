@@ -0,0 +1,421 @@
+from __future__ import annotations
+
+import os
+import sys
+import threading
+import time
+from typing import TYPE_CHECKING
+
+import pytest
+from astroid import MANAGER
+from astroid.builder import AstroidBuilder
+
+from lintcheck import runner
+from lintcheck.checker_costs import RunCosts
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from lintcheck.message import LintMessage
+
+
+def write_module(tmp_path: Path) -> str:
+    module = tmp_path / "waffle.py"
+    module.write_text(
+        '"""Waffle module."""\n\nimport os\n',
+        encoding="utf-8",
+    )
+    return str(module)
+
+
+def test_lint_job_inline(tmp_path: Path) -> None:
+    job = runner.LintJob([write_module(tmp_path)], runner.Reporter())
+    job.run()
+    assert job.done()
+    assert job.exception is None
+    symbols = {message.symbol for message in job.get_messages()}
+    assert "unused-import" in symbols
+
+
+def test_lint_job_thread(tmp_path: Path) -> None:
+    job = runner.LintJob([write_module(tmp_path)], runner.Reporter())
+    job.start()
+    assert job.thread is not None
+    job.thread.join()
+    assert job.done()
+    assert job.exception is None
+    assert job.get_messages()
+
+
+def test_lint_job_costs(tmp_path: Path) -> None:
+    costs = RunCosts()
+    job = runner.LintJob(
+        [write_module(tmp_path)],
+        runner.Reporter(),
+        costs=costs,
+    )
+    job.run()
+    assert job.exception is None
+    assert job.get_messages()
+    assert costs.total > 0
+    assert ("imports", "") in costs.seconds
+
+
+def test_lint_job_system_exit_captured() -> None:
+    job = runner.LintJob(["--jobs=-1", "missing.py"], runner.Reporter())
+    job.run()
+    assert isinstance(job.exception, SystemExit)
+
+
+def test_worker_lint_job_reuses_process(tmp_path: Path) -> None:
+    worker = runner.WorkerProcess()
+    try:
+        first = runner.WorkerLintJob([write_module(tmp_path)], worker)
+        first.run()
+        assert first.exception is None
+        assert first.messages
+        process = worker.process
+
+        second = runner.WorkerLintJob([write_module(tmp_path)], worker)
+        second.run()
+        assert second.exception is None
+        assert second.messages == first.messages
+        assert worker.process is process
+    finally:
+        worker.stop()
+
+
+def test_worker_lint_job_costs(tmp_path: Path) -> None:
+    worker = runner.WorkerProcess()
+    try:
+        costs = RunCosts()
+        job = runner.WorkerLintJob(
+            [write_module(tmp_path)],
+            worker,
+            costs=costs,
+        )
+        job.run()
+        assert job.exception is None
+        assert costs.total > 0
+        assert ("imports", "") in costs.seconds
+
+        # Not measured unless asked for
+        other = runner.WorkerLintJob([write_module(tmp_path)], worker)
+        other.run()
+        assert other.costs is None
+    finally:
+        worker.stop()
+
+
+def test_worker_lint_job_error(tmp_path: Path) -> None:
+    worker = runner.WorkerProcess()
+    try:
+        job = runner.WorkerLintJob(
+            ["--jobs=-1", write_module(tmp_path)],
+            worker,
+        )
+        job.run()
+        assert isinstance(job.exception, runner.LintError)
+        assert worker.is_alive()
+    finally:
+        worker.stop()
+
+
+def test_reporter_batches_by_size() -> None:
+    batches: list[list[LintMessage]] = []
+    reporter = runner.Reporter(batches.append, batch_size=2, batch_interval=60)
+
+    class Message:
+        abspath = "/waffle.py"
+        line = 1
+        column = 0
+        end_line = None
+        end_column = None
+        msg_id = "W0000"
+        symbol = "waffle"
+        msg = "waffle"
+
+    for _ in range(5):
+        reporter.handle_message(Message())  # type: ignore[arg-type]
+    assert [len(batch) for batch in batches] == [2, 2]
+    reporter.flush()
+    assert [len(batch) for batch in batches] == [2, 2, 1]
+    reporter.flush()
+    assert len(batches) == 3
+
+
+def test_lint_job_stream(tmp_path: Path) -> None:
+    job = runner.LintJob(
+        [write_module(tmp_path)],
+        runner.Reporter(batch_size=1),
+        stream=True,
+    )
+    job.run()
+    assert job.get_new_messages() == job.get_messages()
+    assert job.get_new_messages() == []
+
+
+def test_lint_job_stream_parallel_jobs(tmp_path: Path) -> None:
+    job = runner.LintJob(
+        [write_module(tmp_path), "--jobs=2"],
+        runner.Reporter(batch_size=1),
+        stream=True,
+    )
+    job.start()
+    assert job.thread is not None
+    job.thread.join()
+    assert job.exception is None
+    symbols = {message.symbol for message in job.get_messages()}
+    assert "unused-import" in symbols
+    assert job.get_new_messages() == []
+
+
+def test_worker_lint_job_stream_parallel_jobs(tmp_path: Path) -> None:
+    worker = runner.WorkerProcess()
+    try:
+        job = runner.WorkerLintJob(
+            [write_module(tmp_path), "--jobs=2"],
+            worker,
+            True,
+        )
+        job.run()
+        assert job.exception is None
+        assert job.get_messages()
+    finally:
+        worker.stop()
+
+
+@pytest.mark.parametrize(
+    ("args", "jobs"),
+    [
+        ([], 1),
+        (["--jobs=3"], 3),
+        (["--jobs=2", "-j", "1"], 1),
+        (["--jobs", "4"], 4),
+        (["--jobs=waffle"], 1),
+    ],
+)
+def test_get_pylint_jobs(args: list[str], jobs: int) -> None:
+    assert runner.get_pylint_jobs(args) == jobs
+
+
+def test_get_pylint_jobs_zero_is_cpus() -> None:
+    assert runner.get_pylint_jobs(["--jobs=0"]) == (
+        runner.get_available_cpus()
+    )
+
+
+def test_worker_lint_job_stream(tmp_path: Path) -> None:
+    worker = runner.WorkerProcess()
+    try:
+        job = runner.WorkerLintJob([write_module(tmp_path)], worker, True)
+        job.run()
+        assert job.exception is None
+        streamed = job.get_new_messages()
+        assert streamed == job.get_messages()[: len(streamed)]
+    finally:
+        worker.stop()
+
+
+def test_lint_job_cancel(tmp_path: Path) -> None:
+    started = threading.Event()
+
+    def stall(_batch: list[LintMessage]) -> None:
+        started.set()
+        while True:
+            time.sleep(0.01)
+
+    job = runner.LintJob(
+        [write_module(tmp_path), "--jobs=1"],
+        runner.Reporter(stall, batch_size=1),
+    )
+    job.start()
+    assert started.wait(60)
+    job.cancel()
+    assert job.thread is not None
+    job.thread.join(10)
+    assert job.done()
+    assert isinstance(job.exception, runner.LintCancelled)
+    # Messages found before cancelling are kept
+    assert job.get_messages()
+    assert not runner.PYLINT_LOCK.locked()
+
+
+def test_lint_job_cancel_not_started() -> None:
+    job = runner.LintJob(["missing.py"], runner.Reporter())
+    job.cancel()
+    assert not job.cancelled
+
+
+def test_worker_lint_job_cancel(tmp_path: Path) -> None:
+    worker = runner.WorkerProcess()
+    try:
+        first = runner.WorkerLintJob([write_module(tmp_path)], worker)
+        second = runner.WorkerLintJob([write_module(tmp_path)], worker)
+        third = runner.WorkerLintJob([write_module(tmp_path)], worker)
+        for job in (first, second, third):
+            job.start()
+        process = worker.process
+        assert process is not None
+
+        # Pending job is dropped without touching the process
+        third.cancel()
+        assert isinstance(third.exception, runner.LintCancelled)
+        assert worker.pending == [second]
+
+        # Running job kills the process, next job gets a new one
+        first.cancel()
+        assert isinstance(first.exception, runner.LintCancelled)
+        assert process.poll() is not None
+        second.run()
+        assert second.exception is None
+        assert second.messages
+        assert worker.process is not process
+    finally:
+        worker.stop()
+
+
+@pytest.mark.parametrize(
+    ("file_count", "total_bytes", "cpus", "expect"),
+    [
+        (1, 10**9, 64, 1),
+        (2, 1000, 64, 1),
+        (40, 4 * runner.AUTO_JOBS_BYTES_PER_JOB, 64, 4),
+        (3, 10**9, 64, 3),
+        (200, 10**9, 8, 8),
+        (200, 10**9, 1, 1),
+    ],
+)
+def test_choose_jobs(
+    file_count: int,
+    total_bytes: int,
+    cpus: int,
+    expect: int,
+) -> None:
+    assert runner.choose_jobs(file_count, total_bytes, cpus) == expect
+
+
+def test_get_available_cpus_respects_quota(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(os, "sched_getaffinity", lambda _pid: {0, 1, 2, 3})
+    monkeypatch.setattr(runner, "get_cgroup_cpu_limit", lambda: None)
+    assert runner.get_available_cpus() == 4
+    monkeypatch.setattr(runner, "get_cgroup_cpu_limit", lambda: 2.5)
+    assert runner.get_available_cpus() == 2
+    monkeypatch.setattr(runner, "get_cgroup_cpu_limit", lambda: 0.5)
+    assert runner.get_available_cpus() == 1
+
+
+def test_get_total_size(tmp_path: Path) -> None:
+    module = write_module(tmp_path)
+    size = os.path.getsize(module)
+    assert runner.get_total_size([module, str(tmp_path / "missing.py")]) == (
+        size
+    )
+
+
+def test_subprocess_lint_job(tmp_path: Path) -> None:
+    job = runner.SubprocessLintJob([write_module(tmp_path)], stream=True)
+    job.run()
+    assert job.done()
+    assert job.exception is None
+    assert job.process is not None
+    assert job.process.returncode == 0
+    symbols = {message.symbol for message in job.get_messages()}
+    assert "unused-import" in symbols
+    streamed = job.get_new_messages()
+    assert streamed == job.get_messages()[: len(streamed)]
+
+
+def test_subprocess_lint_job_error(tmp_path: Path) -> None:
+    job = runner.SubprocessLintJob(["--jobs=-1", write_module(tmp_path)])
+    job.run()
+    assert isinstance(job.exception, runner.LintError)
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="Needs resource limits")
+def test_subprocess_lint_job_memory_limit(tmp_path: Path) -> None:
+    # Too little for pylint to do anything
+    job = runner.SubprocessLintJob([write_module(tmp_path)], memory_limit=1)
+    job.run()
+    assert isinstance(job.exception, runner.LintError)
+    assert job.get_messages() == []
+
+
+def test_subprocess_lint_job_cancel(tmp_path: Path) -> None:
+    job = runner.SubprocessLintJob([write_module(tmp_path)])
+    job.start()
+    job.cancel()
+    assert job.reader is not None
+    job.reader.join(30)
+    assert job.done()
+    assert isinstance(job.exception, runner.LintCancelled)
+
+
+def test_get_worker_command() -> None:
+    assert runner.get_worker_command()[1:] == ["-m", "lintcheck.worker"]
+    assert runner.get_worker_command(512, 30)[3:] == [
+        "--memory-limit=512",
+        "--cpu-limit=30",
+    ]
+
+
+def test_lint_job_sees_edited_import(tmp_path: Path) -> None:
+    helper = tmp_path / "lintcheck_helper.py"
+    helper.write_text(
+        '"""Helper."""\n\n\ndef func():\n    """Func."""\n',
+        encoding="utf-8",
+    )
+    module = tmp_path / "lintcheck_user.py"
+    module.write_text(
+        '"""User."""\n\nimport lintcheck_helper\n\nlintcheck_helper.func(1)\n',
+        encoding="utf-8",
+    )
+    args = [
+        str(module),
+        "--jobs=1",
+        f"--init-hook=import sys; sys.path.insert(0, {str(tmp_path)!r})",
+    ]
+
+    def symbols() -> set[str]:
+        job = runner.LintJob(args, runner.Reporter())
+        job.run()
+        assert job.exception is None
+        return {message.symbol for message in job.get_messages()}
+
+    assert "too-many-function-args" in symbols()
+    helper.write_text(
+        '"""Helper."""\n\n\ndef func(value):\n    """Func."""\n'
+        "    return value\n",
+        encoding="utf-8",
+    )
+    mtime = helper.stat().st_mtime
+    os.utime(helper, (mtime + 10, mtime + 10))
+    assert "too-many-function-args" not in symbols()
+
+
+def test_lint_job_cancelled_during_build(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    module = tmp_path / "lintcheck_halfbuilt.py"
+    module.write_text(
+        '"""Half built."""\n\nfrom os import path\n',
+        encoding="utf-8",
+    )
+
+    def cancel(*_args: object) -> None:
+        # After astroid cached the module, before it is done with it
+        raise runner.LintCancelled
+
+    monkeypatch.setattr(AstroidBuilder, "add_from_names_to_locals", cancel)
+    job = runner.LintJob([str(module), "--jobs=1"], runner.Reporter())
+    job.run()
+    assert isinstance(job.exception, runner.LintCancelled)
+    assert not [
+        name
+        for name, cached in MANAGER.astroid_cache.items()
+        if cached.file == str(module)
+    ]
+    assert "lintcheck_halfbuilt" not in runner.get_cache_policy().mtimes
@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+from lintcheck.timing import Phase, PhaseTimer
+
+
+def test_phase_timer() -> None:
+    timer = PhaseTimer()
+    with timer.phase("run"):
+        sum(range(1000))
+    with timer.phase("parse"):
+        pass
+    with timer.phase("run"):
+        pass
+    timer.count("messages", 3)
+    timer.count("messages", 2)
+    assert list(timer.phases) == ["run", "parse"]
+    assert all(phase.wall >= 0 for phase in timer.phases.values())
+    assert timer.counts == {"messages": 5}
+    assert timer.total() == sum(phase.wall for phase in timer.phases.values())
+
+
+def test_phase_timer_end_without_begin() -> None:
+    timer = PhaseTimer()
+    timer.end("run")
+    assert timer.phases == {}
+
+
+def test_phase_timer_disabled() -> None:
+    timer = PhaseTimer(enabled=False)
+    with timer.phase("run"):
+        pass
+    timer.begin("parse")
+    timer.end("parse")
+    timer.count("messages", 1)
+    assert timer.phases == {}
+    assert timer.counts == {}
+
+
+def test_phase_timer_format() -> None:
+    timer = PhaseTimer()
+    timer.phases = {"run": Phase(1.5, 1.25), "insert": Phase(0.25, 0.125)}
+    timer.counts = {"messages": 4}
+    assert timer.format_log() == (
+        "total=1.7500 run_wall=1.5000 run_cpu=1.2500 "
+        "insert_wall=0.2500 insert_cpu=0.1250 messages=4"
+    )
+    assert timer.format_status() == "Lint 1.75s (run 1.50s insert 0.25s)"
@@ -1,12 +1,17 @@
 from __future__ import annotations
 
 import sys
-from typing import Final
+from idlelib.config import idleConf
+from typing import TYPE_CHECKING, ClassVar, Final
 
 import pytest
+from fakes import FakeEditorWindow, FakeFileList
 
 from lintcheck import utils
 
+if TYPE_CHECKING:
+    from pathlib import Path
+
 IS_WINDOWS: Final = sys.platform == "win32"
 
 
@@ -223,3 +228,531 @@ def test_fileposition_is_range() -> None:
         60,
         48,
     ).is_range()
+
+
+CODE = """\
+def waffle():
+    x = 1
+    return 2
+"""
+
+
+def make_extension(
+    chars: str = CODE,
+    filename: str = "/waffle.py",
+) -> tuple[utils.BaseExtension, FakeEditorWindow]:
+    editwin = FakeEditorWindow(filename, chars)
+    extension = utils.BaseExtension(
+        editwin,  # type: ignore[arg-type]
+        comment_prefix="waffle",
+    )
+    return extension, editwin
+
+
+def test_add_comments_single_edit_per_region() -> None:
+    extension, editwin = make_extension()
+    added = extension.add_comments(
+        [
+            utils.Comment("/waffle.py", 2, "unused-variable"),
+            utils.Comment("/waffle.py", 2, "invalid-name"),
+            utils.Comment("/waffle.py", 3, "    ^"),
+            utils.Comment("/waffle.py", 1, "missing-docstring"),
+        ],
+    )
+    assert (
+        editwin.text.get_chars()
+        == """\
+# waffle: missing-docstring
+def waffle():
+    # waffle: unused-variable
+    # waffle: invalid-name
+    x = 1
+    # waffle:     ^
+    return 2
+"""
+    )
+    assert sorted(added["/waffle.py"]) == [1, 2, 2, 3]
+    # Lines 1-3 are one region
+    assert editwin.text.calls["insert"] == 1
+    assert editwin.text.calls["delete"] == 1
+    assert editwin.text.calls["get"] == 1
+    assert editwin.undo.blocks == 1
+
+
+def test_add_comments_skips_existing() -> None:
+    extension, editwin = make_extension()
+    comments = [
+        utils.Comment("/waffle.py", 2, "unused-variable"),
+        utils.Comment("/waffle.py", 2, "unused-variable"),
+    ]
+    assert extension.add_comments(comments) == {"/waffle.py": [2]}
+    before = editwin.text.get_chars()
+    assert before.count("unused-variable") == 1
+    # Running again shifted down by one line still finds it
+    shifted = [comment._replace(line=3) for comment in comments]
+    assert extension.add_comments(shifted) == {}
+    assert editwin.text.get_chars() == before
+
+
+def test_add_comments_tabs() -> None:
+    extension, editwin = make_extension("if x:\n\tpass\n")
+    extension.add_comments([utils.Comment("/waffle.py", 2, "fish")])
+    assert editwin.text.get_chars() == "if x:\n\t# waffle: fish\n\tpass\n"
+    assert editwin.text.calls["delete"] == 0
+
+
+def test_comment_index() -> None:
+    index = utils.CommentIndex.from_lines(
+        [
+            "x = 1",
+            "    # waffle: fish",
+            "# waffle: cat",
+            "# waffle:     ^",
+            "y = 2  # waffle: not at start",
+        ],
+        "# waffle: ",
+    )
+    assert index.by_line == {2: {"fish"}, 3: {"cat"}, 4: {"    ^"}}
+    assert index.exists("fish", 1, 2)
+    assert index.exists("fish", 2, 2)
+    assert not index.exists("fish", 3, 10)
+    assert not index.exists("not at start", 1, 10)
+    index.add(10, "fish")
+    index.add(1, "fish")
+    assert index.by_content["fish"] == [1, 2, 10]
+    assert index.exists("fish", 3, 10)
+    assert not index.exists("fish", 3, 9)
+
+
+@pytest.mark.parametrize(
+    ("lines", "expect"),
+    [
+        ([], []),
+        (["x"], []),
+        (["# waffle: a"], [(0, 1)]),
+        (["x", "  # waffle: a", "# waffle: b", "y"], [(1, 2)]),
+        (["# waffle: a", "x", "# waffle: b", "# waffle: c"], [(0, 1), (2, 2)]),
+    ],
+)
+def test_get_comment_runs(
+    lines: list[str],
+    expect: list[tuple[int, int]],
+) -> None:
+    assert utils.get_comment_runs(lines, "# waffle: ") == expect
+
+
+COMMENTED = """\
+# waffle: missing-docstring
+def waffle():
+    # waffle: unused-variable
+    # waffle: invalid-name
+    x = 1
+    # waffle:     ^
+    return 2
+"""
+
+
+def test_remove_all_extension_comments() -> None:
+    extension, editwin = make_extension(COMMENTED)
+    extension.remove_all_extension_comments()
+    assert editwin.text.get_chars() == CODE
+    assert editwin.undo.blocks == 1
+
+
+def test_remove_all_extension_comments_sparse_runs() -> None:
+    code = "\n".join(f"x{line} = 1" for line in range(100))
+    chars = "# waffle: a\n# waffle: b\n" + code + "\n# waffle: c\n"
+    extension, editwin = make_extension(chars)
+    extension.remove_all_extension_comments()
+    assert editwin.text.get_chars() == code + "\n"
+    # One delete per run
+    assert editwin.text.calls["delete"] == 2
+    assert editwin.text.calls["insert"] == 0
+
+
+def test_remove_all_extension_comments_dense_rebuilds() -> None:
+    extension, editwin = make_extension(COMMENTED * 10)
+    extension.remove_all_extension_comments()
+    assert editwin.text.get_chars() == CODE * 10
+    assert editwin.text.calls["delete"] == 1
+    assert editwin.text.calls["insert"] == 1
+
+
+def test_remove_all_extension_comments_dense_keeps_tags() -> None:
+    chars = "x = 0\n" + COMMENTED * 10 + "y = 2\n"
+    extension, editwin = make_extension(chars)
+    text = editwin.text
+    # Breakpoint on a line without a comment and one before all comments
+    assert text.get("6.0", "6.end") == "    x = 1"
+    text.tag_add("BREAK", "6.0", "7.0")
+    text.tag_add("BREAK", "1.0", "2.0")
+    text.mark_set("insert", "6.4")
+    extension.remove_all_extension_comments()
+    assert text.get_chars() == "x = 0\n" + CODE * 10 + "y = 2\n"
+    assert text.calls["delete"] == 1
+    assert text.calls["insert"] == 1
+    assert sorted(text.tags["BREAK"]) == [("1.0", "2.0"), ("3.0", "4.0")]
+    assert text.get("3.0", "3.end") == "    x = 1"
+    assert text.index("insert") == "3.4"
+
+
+def test_remove_all_extension_comments_none() -> None:
+    extension, editwin = make_extension()
+    extension.remove_all_extension_comments()
+    assert editwin.text.get_chars() == CODE
+    assert editwin.text.calls["bell"] == 1
+
+
+def test_remove_selected_extension_comments() -> None:
+    extension, editwin = make_extension(COMMENTED)
+    editwin.fregion.selection = (2, 5)
+    assert extension.remove_selected_extension_comments()
+    assert (
+        editwin.text.get_chars()
+        == """\
+# waffle: missing-docstring
+def waffle():
+    x = 1
+    # waffle:     ^
+    return 2
+"""
+    )
+
+
+def test_get_extension_comment_lines() -> None:
+    extension, editwin = make_extension(COMMENTED)
+    assert extension.get_extension_comment_lines() == [1, 3, 4, 6]
+    gets = editwin.text.calls["get"]
+    assert extension.get_extension_comment_lines() == [1, 3, 4, 6]
+    assert editwin.text.calls["get"] == gets
+
+
+def test_extension_comment_lines_invalidated_by_edit() -> None:
+    extension, editwin = make_extension(COMMENTED)
+    assert extension.get_extension_comment_lines() == [1, 3, 4, 6]
+    editwin.text.insert("1.0", "# waffle: new\n")
+    assert extension.get_extension_comment_lines() == [1, 2, 4, 5, 7]
+
+
+def test_extension_comment_lines_after_add_comments() -> None:
+    extension, _editwin = make_extension(COMMENTED)
+    extension.add_comments(
+        [
+            utils.Comment("/waffle.py", 2, "fish"),
+            utils.Comment("/waffle.py", 7, "cat"),
+        ],
+    )
+    assert extension.comment_lines is not None
+    planned = extension.comment_lines
+    extension.invalidate_comment_lines()
+    assert extension.get_extension_comment_lines() == planned
+
+
+def test_extension_comment_lines_after_remove_all() -> None:
+    extension, _editwin = make_extension(COMMENTED)
+    extension.remove_all_extension_comments()
+    assert extension.comment_lines == []
+
+
+def test_find_next_extension_comment() -> None:
+    extension, editwin = make_extension(COMMENTED)
+    editwin.text.mark_set("insert", "1.5")
+    assert extension.find_next_extension_comment(search_wrap=False)
+    assert editwin.text.index("insert") == "3.14"
+    assert editwin.text.tags["sel"] == [("3.0", "3.14")]
+    assert extension.find_next_extension_comment(search_wrap=False)
+    assert extension.find_next_extension_comment(search_wrap=False)
+    assert editwin.text.index("insert") == "6.14"
+    assert not extension.find_next_extension_comment(search_wrap=False)
+    assert editwin.text.calls["bell"] == 1
+    assert extension.find_next_extension_comment(search_wrap=True)
+    assert editwin.text.index("insert") == "1.10"
+
+
+def test_find_previous_extension_comment() -> None:
+    extension, editwin = make_extension(COMMENTED)
+    editwin.text.mark_set("insert", "5.0")
+    assert extension.find_previous_extension_comment(search_wrap=False)
+    assert editwin.text.index("insert") == "4.0"
+    assert editwin.text.tags["sel"] == [("4.0", "4.14")]
+    assert extension.find_previous_extension_comment(search_wrap=False)
+    assert extension.find_previous_extension_comment(search_wrap=False)
+    assert editwin.text.index("insert") == "1.0"
+    assert not extension.find_previous_extension_comment(search_wrap=False)
+    assert extension.find_previous_extension_comment(search_wrap=True)
+    assert editwin.text.index("insert") == "6.0"
+
+
+def test_find_extension_comment_none() -> None:
+    extension, editwin = make_extension()
+    assert not extension.find_next_extension_comment()
+    assert not extension.find_previous_extension_comment()
+    assert editwin.text.calls["bell"] == 2
+
+
+def test_goto_extension_comment() -> None:
+    extension, editwin = make_extension(COMMENTED)
+    assert extension.goto_extension_comment(2)
+    assert editwin.text.index("insert") == "3.14"
+    assert not extension.goto_extension_comment(0)
+    assert not extension.goto_extension_comment(5)
+
+
+def pointer_comment(
+    column: int,
+    column_end: int | None = None,
+) -> utils.Comment:
+    return utils.Comment(
+        "/waffle.py",
+        1,
+        "x",
+        column=column,
+        column_end=column_end,
+    )
+
+
+def test_get_pointers() -> None:
+    extension, _editwin = make_extension()
+    pointer = extension.get_pointers(
+        [
+            pointer_comment(20),
+            pointer_comment(14),
+            pointer_comment(16),
+            pointer_comment(20),
+        ],
+    )
+    # Prefix and indent are 14 columns, hides column 14
+    assert pointer == utils.Comment("/waffle.py", 2, " ^   ^")
+
+
+def test_get_pointers_hidden_by_prefix() -> None:
+    extension, _editwin = make_extension()
+    assert extension.get_pointers([pointer_comment(4)]) is None
+
+
+def test_get_pointers_merges_spans() -> None:
+    extension, _editwin = make_extension()
+    pointer = extension.get_pointers(
+        [
+            pointer_comment(20, 23),
+            pointer_comment(22, 25),
+            pointer_comment(8, 16),
+        ],
+    )
+    assert pointer is not None
+    # Start of first span is hidden by prefix
+    assert pointer.contents == "^^   ^^^^^^"
+
+
+def test_get_pointers_ranges() -> None:
+    extension, editwin = make_extension()
+    gets = editwin.text.calls["get"]
+    pointer = extension.get_pointers(
+        [
+            pointer_comment(20, 23),
+            pointer_comment(22, 25),
+            pointer_comment(8, 16),
+        ],
+        "    x = 1\n",
+        ranges=True,
+    )
+    assert pointer is not None
+    assert pointer.contents == "~~   ^~^~~~"
+    assert editwin.text.calls["get"] == gets
+
+
+def test_reload_only_when_config_changed(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    class waffle(utils.BaseExtension):  # noqa: N801
+        values: ClassVar = {"enable": "True", "flavor": "maple"}
+        flavor = ""
+
+    loads: list[None] = []
+    stamp = (("config-extensions.cfg", 1, 1),)
+    monkeypatch.setattr(
+        idleConf,
+        "LoadCfgFiles",
+        lambda: loads.append(None),
+    )
+    monkeypatch.setattr(idleConf, "SaveUserCfgFiles", lambda: None)
+    monkeypatch.setattr(utils, "get_config_stamp", lambda: stamp)
+
+    waffle.reload()
+    assert waffle.flavor == "maple"
+    waffle.reload()
+    assert len(loads) == 1
+
+    stamp = (("config-extensions.cfg", 2, 1),)
+    waffle.reload()
+    assert len(loads) == 2
+    waffle.reload(force=True)
+    assert len(loads) == 3
+
+
+def test_reload_migrates_old_defaults(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    class pancake(utils.BaseExtension):  # noqa: N801
+        values: ClassVar = {
+            "enable": "True",
+            "config_version": "2",
+            "flavor": "syrup",
+            "size": "large",
+            "topping": "butter",
+        }
+        config_migrations: ClassVar = {
+            1: {"flavor": ("plain", "maple"), "size": ("small", "medium")},
+            2: {"flavor": ("maple", "syrup")},
+        }
+        flavor = ""
+        size = ""
+        topping = ""
+
+    monkeypatch.setattr(idleConf, "LoadCfgFiles", lambda: None)
+    monkeypatch.setattr(idleConf, "SaveUserCfgFiles", lambda: None)
+    user = idleConf.userCfg["extensions"]
+    # Written by a version without config_version
+    user.AddSection("pancake")
+    user.SetOption("pancake", "flavor", "plain")
+    user.SetOption("pancake", "size", "tiny")
+    try:
+        pancake.reload(force=True)
+        assert pancake.flavor == "syrup"
+        assert pancake.size == "tiny"
+        assert pancake.topping == "butter"
+        assert user.Get("pancake", "config_version") == "2"
+
+        # Set back by hand after migrating, stays
+        user.SetOption("pancake", "flavor", "plain")
+        pancake.reload(force=True)
+        assert pancake.flavor == "plain"
+    finally:
+        user.remove_section("pancake")
+
+
+def test_migrate_config_new_section(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    class crepe(utils.BaseExtension):  # noqa: N801
+        values: ClassVar = {"enable": "True", "config_version": "1"}
+        config_migrations: ClassVar = {1: {"enable": ("True", "False")}}
+
+    monkeypatch.setattr(idleConf, "SaveUserCfgFiles", lambda: None)
+    assert not crepe.migrate_config()
+
+
+def test_get_config_stamp() -> None:
+    stamp = utils.get_config_stamp()
+    assert stamp == utils.get_config_stamp()
+    assert len(stamp) == len(idleConf.defaultCfg) + len(
+        idleConf.userCfg,
+    )
+
+
+def test_line_buffer_get() -> None:
+    buffer = utils.LineBuffer("ab\ncd")
+    assert buffer.get("1.0", "end") == "ab\ncd\n"
+    assert buffer.get("1.0", "end-1c") == "ab\ncd"
+    assert buffer.get("1.1") == "b"
+    assert buffer.get("1.2") == "\n"
+    assert buffer.get("2.0", "3.0") == "cd\n"
+    assert buffer.get("1.5", "1.end") == ""
+    assert buffer.get("2.0", "1.0") == ""
+    assert buffer.index("9.0") == "3.0"
+    assert buffer.index("1.9") == "1.2"
+
+
+def test_line_buffer_insert_delete() -> None:
+    buffer = utils.LineBuffer("ab\ncd")
+    buffer.insert("2.0", "x\ny")
+    assert buffer.get_chars() == "ab\nx\nycd"
+    buffer.insert("end", "!")
+    assert buffer.get_chars() == "ab\nx\nycd!"
+    buffer.delete("1.2")
+    assert buffer.get_chars() == "abx\nycd!"
+    buffer.delete("1.0", "end")
+    assert buffer.get_chars() == ""
+
+
+def test_line_buffer_comment_engine() -> None:
+    extension, _editwin = make_extension()
+    buffer = utils.LineBuffer(CODE)
+    added, comment_lines = extension.add_comments_to_buffer(
+        buffer,
+        [
+            utils.Comment("/other.py", 1, "missing-docstring"),
+            utils.Comment("/other.py", 2, "unused-variable"),
+        ],
+    )
+    assert added == [2, 1]
+    assert comment_lines == [1, 3]
+    assert buffer.get_chars() == (
+        "# waffle: missing-docstring\n"
+        "def waffle():\n"
+        "    # waffle: unused-variable\n"
+        "    x = 1\n"
+        "    return 2\n"
+    )
+    assert extension.remove_extension_comment_lines(buffer, "1.0", "end-1c")
+    assert buffer.get_chars() == CODE
+
+
+def test_get_file_lines(tmp_path: Path) -> None:
+    editwin = FakeEditorWindow(str(tmp_path / "open.py"), CODE)
+    FakeFileList().add(editwin)
+    extension = utils.BaseExtension(
+        editwin,  # type: ignore[arg-type]
+        comment_prefix="waffle",
+    )
+    assert extension.get_file_lines(str(tmp_path / "open.py")) == [
+        "def waffle():",
+        "    x = 1",
+        "    return 2",
+        "",
+    ]
+    path = tmp_path / "other.py"
+    path.write_bytes(b"a\r\nb")
+    assert extension.get_file_lines(str(path)) == ["a", "b"]
+    assert extension.get_file_lines(str(tmp_path / "missing.py")) == []
+
+
+def test_log_writer_buffers(tmp_path: Path) -> None:
+    path = tmp_path / "logs" / "waffle.log"
+    writer = utils.LogWriter(path, flush_interval=60, buffer_size=100)
+    writer.write("first\nsecond")
+    assert not path.exists()
+    writer.flush()
+    lines = path.read_text(encoding="utf-8").splitlines()
+    assert [line.split("] ", 1)[1] for line in lines] == ["first", "second"]
+    # Enough buffered writes right away
+    writer.write("x" * 100)
+    assert writer.buffer == []
+    assert writer.timer is None
+    assert path.read_text(encoding="utf-8").endswith("x" * 100 + "\n")
+
+
+def test_log_writer_flushes_on_timer(tmp_path: Path) -> None:
+    path = tmp_path / "waffle.log"
+    writer = utils.LogWriter(path, flush_interval=0.01)
+    writer.write("pancake")
+    timer = writer.timer
+    assert timer is not None
+    timer.join(5)
+    assert "pancake" in path.read_text(encoding="utf-8")
+
+
+def test_log_writer_rotates(tmp_path: Path) -> None:
+    path = tmp_path / "waffle.log"
+    writer = utils.LogWriter(path, max_bytes=40, backup_count=2)
+    for index in range(4):
+        writer.write(f"entry {index}")
+        writer.flush()
+    assert sorted(item.name for item in tmp_path.iterdir()) == [
+        "waffle.log",
+        "waffle.log.1",
+        "waffle.log.2",
+    ]
+    assert "entry 3" in path.read_text(encoding="utf-8")
+    assert "entry 2" in (tmp_path / "waffle.log.1").read_text(encoding="utf-8")
+    assert "entry 1" in (tmp_path / "waffle.log.2").read_text(encoding="utf-8")